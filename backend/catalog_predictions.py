@@ -0,0 +1,201 @@
+"""
+Precomputed Catalog Predictions
+Scores every KOI in the bundled CSV once per (dataset, model) version and serves lookups by name
+
+The table is built with one encode_columns + predict_proba pass and stored as a compressed
+.npz of plain NumPy columns (strings as fixed-width unicode, no pickles) under the cache
+directory. Lookups go through a kepoi_name -> row dict built when the table is loaded. A new
+archive snapshot can be applied as a diff (apply_diff), re-scoring only the rows that changed.
+Habitability and planet/star type are computed from the raw catalog columns, so KOIs missing
+those measurements get a null score and an 'Unknown' type rather than the model defaults.
+"""
+
+import os
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import FEATURE_ENCODER
+from planet_rules import classify_catalog
+from planet_table import PlanetTable
+
+ANALOGUE_CHUNK_ROWS = 1024
+# Bumped when the stored columns change meaning, so older tables are rebuilt
+TABLE_FORMAT = 2
+
+
+def _nearest_named(features: np.ndarray, named: np.ndarray, rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Index into `named` of the nearest other named row, and its distance, for `rows` (default all; scaled space)"""
+    rows = np.arange(len(features)) if rows is None else rows
+    candidates = features[named]
+    candidate_norms = (candidates ** 2).sum(axis=1)
+    nearest = np.empty(len(rows), dtype=np.intp)
+    distances = np.empty(len(rows))
+    for start in range(0, len(rows), ANALOGUE_CHUNK_ROWS):
+        block_rows = rows[start:start + ANALOGUE_CHUNK_ROWS]
+        block = features[block_rows]
+        squared = (block ** 2).sum(axis=1)[:, None] + candidate_norms[None, :] - 2.0 * block @ candidates.T
+        # A named planet's own row is not its analogue
+        own = np.searchsorted(named, block_rows)
+        is_named = (own < len(named)) & (named[np.minimum(own, len(named) - 1)] == block_rows)
+        squared[np.flatnonzero(is_named), own[is_named]] = np.inf
+        nearest[start:start + len(block)] = squared.argmin(axis=1)
+        distances[start:start + len(block)] = np.sqrt(np.maximum(squared.min(axis=1), 0.0))
+    return nearest, distances
+
+
+def _scored_columns(df: pd.DataFrame, scaled: np.ndarray, model: Any,
+                    classes: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Identifiers, predictions and rule labels (everything but the analogue) for catalog rows"""
+    probabilities = model.predict_proba(scaled) if len(df) else np.empty((0, len(classes)))
+    labels = np.array([str(c) for c in classes])
+    best = probabilities.argmax(axis=1)
+    # Rule labels come from the raw columns: the encoded buffer has NaN replaced by defaults
+    rules = classify_catalog(df)
+
+    columns = {
+        'kepoi_name': df['kepoi_name'].to_numpy(dtype=str),
+        'kepid': df['kepid'].to_numpy(dtype=np.int64),
+        'kepler_name': df['kepler_name'].fillna('').to_numpy(dtype=str),
+        'disposition': df['koi_disposition'].to_numpy(dtype=str),
+        'prediction': labels[best],
+    }
+    columns.update({f'probability_{name}': probabilities[:, i].astype(np.float32) for i, name in enumerate(labels)})
+    columns['confidence'] = probabilities[np.arange(len(best)), best].astype(np.float32)
+    columns['habitability_score'] = rules['habitability_score'].astype(np.float32)
+    columns['planet_type'] = rules['planet_type'].astype(str)
+    columns['star_type'] = rules['star_type'].astype(str)
+    return columns
+
+
+def build_prediction_columns(df: pd.DataFrame, model: Any, scaler: Any, classes: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Predictions, rule labels and nearest named analogue for every catalog row"""
+    scaled = scaler.transform(FEATURE_ENCODER.encode_columns(df))
+    columns = _scored_columns(df, scaled, model, classes)
+
+    kepler_name, kepoi_name = columns['kepler_name'], columns['kepoi_name']
+    named = np.flatnonzero(kepler_name != '')
+    if len(named):
+        nearest, distance = _nearest_named(scaled, named)
+        columns['nearest_analogue'] = kepler_name[named][nearest]
+        columns['analogue_kepoi_name'] = kepoi_name[named][nearest]
+    else:
+        columns['nearest_analogue'] = columns['analogue_kepoi_name'] = np.full(len(df), '')
+        distance = np.full(len(df), np.nan)
+    columns['analogue_distance'] = distance.astype(np.float32)
+    return columns
+
+
+class CatalogPredictions:
+    """Prediction table for one (dataset, model) version with O(1) lookup by kepoi_name"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], version: str):
+        self.table = PlanetTable(columns)
+        self.version = version
+        self.rows = {name: i for i, name in enumerate(columns['kepoi_name'].tolist())}
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @staticmethod
+    def path(cache_dir: str, version: str) -> str:
+        return os.path.join(cache_dir, 'predictions', f'v{TABLE_FORMAT}', f'{version}.npz')
+
+    def save(self, cache_dir: str):
+        path = self.path(cache_dir, self.version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(tmp_path, **self.table.columns)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_or_build(cls, df: pd.DataFrame, model: Any, scaler: Any, classes: Sequence[str],
+                      cache_dir: str, version: str) -> 'CatalogPredictions':
+        """Reuse the stored table for this version, otherwise score the catalog and store it"""
+        try:
+            with np.load(cls.path(cache_dir, version), allow_pickle=False) as stored:
+                columns = {name: stored[name] for name in stored.files}
+            if len(columns.get('kepoi_name', ())) == len(df):
+                return cls(columns, version)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        predictions = cls(build_prediction_columns(df, model, scaler, classes), version)
+        predictions.save(cache_dir)
+        return predictions
+
+    def apply_diff(self, df: pd.DataFrame, diff: Any, model: Any, scaler: Any, classes: Sequence[str],
+                   version: str) -> 'CatalogPredictions':
+        """Table for a new snapshot `df` that re-scores only the added and changed rows of `diff`
+
+        Unchanged rows keep their prediction and analogue unless the analogue was removed or
+        changed (full search again) or a new/changed named planet is closer (checked against
+        just those planets).
+        """
+        dirty = np.zeros(len(df), dtype=bool)
+        dirty[diff.added] = True
+        dirty[diff.changed] = True
+        dirty_rows = np.flatnonzero(dirty)
+        kept = np.flatnonzero(~dirty)
+        source = diff.new_to_old[kept]
+
+        scaled = scaler.transform(FEATURE_ENCODER.encode_columns(df))
+        rescored = _scored_columns(df.iloc[dirty_rows], scaled[dirty_rows], model, classes)
+        columns = {}
+        for name, values in rescored.items():
+            old = self.table.columns[name]
+            merged = np.empty(len(df), dtype=np.result_type(old.dtype, values.dtype))
+            merged[kept] = old[source]
+            merged[dirty_rows] = values
+            columns[name] = merged
+
+        kepler_name, kepoi_name = columns['kepler_name'], columns['kepoi_name']
+        named = np.flatnonzero(kepler_name != '')
+        analogue = np.full(len(df), '', dtype=np.result_type(kepler_name.dtype, self.table['nearest_analogue'].dtype))
+        analogue_kepoi = np.full(len(df), '', dtype=kepoi_name.dtype)
+        distance = np.full(len(df), np.nan, dtype=np.float32)
+        analogue[kept] = self.table['nearest_analogue'][source]
+        analogue_kepoi[kept] = self.table['analogue_kepoi_name'][source]
+        distance[kept] = self.table['analogue_distance'][source]
+
+        if len(named):
+            stale_names = np.concatenate([self.table['kepoi_name'][diff.removed], kepoi_name[diff.changed]])
+            stale = kept[np.isin(analogue_kepoi[kept], stale_names)]
+            search = np.union1d(dirty_rows, stale)
+            if len(search):
+                nearest, found = _nearest_named(scaled, named, search)
+                analogue[search], analogue_kepoi[search] = kepler_name[named][nearest], kepoi_name[named][nearest]
+                distance[search] = found
+
+            # Unchanged rows only need checking against the named planets that are new or changed
+            fresh = np.intersect1d(named, dirty_rows)
+            rest = np.setdiff1d(kept, stale)
+            if len(fresh) and len(rest):
+                nearest, found = _nearest_named(scaled, fresh, rest)
+                closer = found < distance[rest]
+                rows = rest[closer]
+                analogue[rows], analogue_kepoi[rows] = kepler_name[fresh][nearest[closer]], kepoi_name[fresh][nearest[closer]]
+                distance[rows] = found[closer]
+
+        columns['nearest_analogue'] = analogue
+        columns['analogue_kepoi_name'] = analogue_kepoi
+        columns['analogue_distance'] = distance
+        return CatalogPredictions(columns, version)
+
+    def lookup(self, kepoi_name: str) -> Optional[Dict[str, Any]]:
+        """One catalog row's prediction record, or None for unknown names"""
+        row = self.rows.get(kepoi_name)
+        if row is None:
+            return None
+        record = {name: values[row].item() for name, values in self.table.columns.items()}
+        # Missing measurements (habitability inputs, analogue distance) are null, not NaN
+        record = {name: None if isinstance(value, float) and np.isnan(value) else value for name, value in record.items()}
+        probabilities = {
+            name[len('probability_'):]: record.pop(name)
+            for name in list(record) if name.startswith('probability_')
+        }
+        record['probabilities'] = probabilities
+        for name in ('kepler_name', 'nearest_analogue', 'analogue_kepoi_name'):
+            record[name] = record[name] or None
+        return record
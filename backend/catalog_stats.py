@@ -0,0 +1,136 @@
+"""
+Catalog Statistics Aggregates
+Additive counts and sums behind /stats, updatable from the rows a snapshot diff touches
+
+Everything /stats reports is a count or a sum over the visualization table, so applying a new
+archive snapshot subtracts the aggregates of the removed / old changed rows and adds those of
+the added / new changed rows instead of rescanning the catalog. Aggregates are stored per dataset
+version under the cache directory, which is where the API loads them from at startup. The store
+path also carries the aggregate format and a fingerprint of the habitability and habitable-zone
+rules, so changing either rebuilds the aggregates instead of serving stale counts.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from habitable_zone import KOPPARAPU_LIMITS, TEFF_RANGE, ZONES
+from planet_rules import HABITABILITY
+from planet_table import PlanetTable
+
+_COUNTS = ('total', 'confirmed', 'candidates', 'high', 'low', 'hz_conservative', 'hz_optimistic', 'hz_unknown')
+_SUMS = ('radius', 'temperature', 'period')
+# Habitability score bands of the high / low counts
+HIGH_HABITABILITY = 70
+LOW_HABITABILITY = 40
+# Bumped when the stored counts or sums change meaning, so older aggregates are rebuilt
+STATS_FORMAT = 1
+
+
+def rules_version() -> str:
+    """Short hash of every rule table the counts depend on"""
+    rules = (
+        HABITABILITY.rules, HABITABILITY.cap, HIGH_HABITABILITY, LOW_HABITABILITY,
+        sorted(KOPPARAPU_LIMITS.items()), sorted(ZONES.items()), TEFF_RANGE,
+    )
+    return hashlib.sha256(repr(rules).encode('utf-8')).hexdigest()[:12]
+
+
+RULES_VERSION = rules_version()
+
+
+class CatalogStats:
+    """Counts and column sums of a PlanetTable"""
+
+    def __init__(self):
+        self.counts = dict.fromkeys(_COUNTS, 0)
+        self.sums = dict.fromkeys(_SUMS, 0.0)
+
+    @classmethod
+    def from_table(cls, table: PlanetTable) -> 'CatalogStats':
+        stats = cls()
+        stats.add(table)
+        return stats
+
+    @staticmethod
+    def path(cache_dir: str, version: str) -> str:
+        return os.path.join(cache_dir, 'stats', f'v{STATS_FORMAT}-{RULES_VERSION}', f'{version}.json')
+
+    @classmethod
+    def load(cls, cache_dir: str, version: str) -> Optional['CatalogStats']:
+        """Stored aggregates for a dataset version, or None when there are none"""
+        try:
+            with open(cls.path(cache_dir, version)) as f:
+                stored = json.load(f)
+            stats = cls()
+            stats.counts.update({name: int(stored['counts'][name]) for name in _COUNTS})
+            stats.sums.update({name: float(stored['sums'][name]) for name in _SUMS})
+            return stats
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, cache_dir: str, version: str):
+        path = self.path(cache_dir, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'counts': self.counts, 'sums': self.sums}, f)
+        os.replace(tmp_path, path)
+
+    def add(self, table: PlanetTable, sign: int = 1):
+        """Add (sign=1) or subtract (sign=-1) the aggregates of a table's rows"""
+        disposition = table['disposition']
+        habitability = table['habitability_score']
+        zones = table['habitable_zone']
+        counts = {
+            'total': len(table),
+            'confirmed': np.count_nonzero(disposition == 'CONFIRMED'),
+            'candidates': np.count_nonzero(disposition == 'CANDIDATE'),
+            'high': np.count_nonzero(habitability >= HIGH_HABITABILITY),
+            'low': np.count_nonzero(habitability < LOW_HABITABILITY),
+            'hz_conservative': np.count_nonzero(zones == 'conservative'),
+            'hz_optimistic': np.count_nonzero((zones == 'conservative') | (zones == 'optimistic')),
+            'hz_unknown': np.count_nonzero(zones == 'unknown'),
+        }
+        for name, count in counts.items():
+            self.counts[name] += sign * int(count)
+        for name in _SUMS:
+            self.sums[name] += sign * float(np.sum(table[name]))
+
+    def apply(self, removed: PlanetTable, added: PlanetTable):
+        """Swap the rows a snapshot diff removed (or replaced) for the ones it added"""
+        self.add(removed, sign=-1)
+        self.add(added)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The /stats response body"""
+        c = self.counts
+        total = c['total']
+
+        def mean(name):
+            return self.sums[name] / total if total else float('nan')
+
+        return {
+            "total_exoplanets": total,
+            "confirmed": c['confirmed'],
+            "candidates": c['candidates'],
+            "potentially_habitable": c['high'],
+            "averages": {
+                "radius": mean('radius'),
+                "temperature": mean('temperature'),
+                "period": mean('period')
+            },
+            "habitability_distribution": {
+                "high": c['high'],
+                "medium": total - c['high'] - c['low'],
+                "low": c['low']
+            },
+            "habitable_zone": {
+                "conservative": c['hz_conservative'],
+                "optimistic": c['hz_optimistic'],
+                "unknown": c['hz_unknown']
+            }
+        }
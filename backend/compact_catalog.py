@@ -0,0 +1,58 @@
+"""
+Compact Catalog
+Memory-budgeted KOI table holding only the columns the API reads, in the smallest dtypes
+
+Parsing uses pd.read_csv(usecols=...), so the _err columns, delivery names and the other
+unused columns of the archive export are never materialized. Measurements are stored as
+float32, integer columns are downcast to the smallest integer type that holds them (int8 for
+the false-positive flags, int32 for kepid), and disposition and names are categoricals: one
+interned string table per column plus small integer codes. The result is still a DataFrame,
+so similarity matching and build_visualization_table read it unchanged.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import FEATURE_ENCODER
+
+NAME_COLUMNS = ('kepoi_name', 'kepler_name', 'koi_disposition')
+INTEGER_COLUMNS = ('kepid', 'koi_fpflag_nt', 'koi_fpflag_ss', 'koi_fpflag_co', 'koi_fpflag_ec')
+
+# Model inputs plus the identifiers; everything the visualization table needs is among them
+CATALOG_COLUMNS: Tuple[str, ...] = tuple(dict.fromkeys(('kepid',) + NAME_COLUMNS + FEATURE_ENCODER.input_names))
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a KOI DataFrame with categorical names, downcast integers and float32 measurements"""
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if name in NAME_COLUMNS:
+            columns[name] = values.astype('category')
+        elif name in INTEGER_COLUMNS and values.notna().all():
+            columns[name] = pd.to_numeric(values, downcast='integer')
+        else:
+            columns[name] = values.astype(np.float32)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+
+def read_compact_catalog(path: str, columns: Iterable[str] = CATALOG_COLUMNS) -> pd.DataFrame:
+    """Parse only `columns` of a KOI CSV (absent ones are skipped) into a compact frame"""
+    wanted = set(columns)
+    return compact_frame(pd.read_csv(path, usecols=lambda name: name in wanted))
+
+
+def catalog_footprint(df: Optional[pd.DataFrame]) -> Dict[str, Any]:
+    """Rows, columns and deep memory usage (including string tables) for /health"""
+    if df is None or df.empty:
+        return {"rows": 0, "columns": 0, "bytes": 0, "megabytes": 0.0, "dtypes": {}}
+    usage = int(df.memory_usage(deep=True, index=True).sum())
+    return {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "bytes": usage,
+        "megabytes": round(usage / 1e6, 3),
+        "dtypes": {name: str(dtype) for name, dtype in df.dtypes.items()},
+    }
@@ -0,0 +1,178 @@
+"""
+Counterfactual Search
+Smallest change to a planet's inputs that moves the served model to a target disposition
+
+Distances are L2 norms over the mutable features in units of a per-feature spread: the
+catalog's robust scale (IQR / 1.349) when given, else the scaler's standard deviation, which
+heavy-tailed KOI columns inflate so much that large physical changes look small.
+
+Every generation is one batch scored by a single predict_proba call:
+
+    - coordinate sweeps (one feature at a time, both directions) to seed the search
+    - random restarts along dense and sparse directions with a growing radius
+    - once a flip is known: a line search back toward the original, local perturbations
+      around the best flip, and "reset one feature" candidates that make it sparser
+
+The loop keeps the minimal-norm flip found and stops when the time budget is spent.
+"""
+
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import FEATURE_ENCODER, FeatureEncoder
+
+# Inputs a reviewer cannot change about a target (sky position) are fixed by default
+FIXED_FEATURES = ('ra', 'dec')
+BINARY_FEATURES = ('koi_fpflag_nt', 'koi_fpflag_ss', 'koi_fpflag_co', 'koi_fpflag_ec')
+UNIT_INTERVAL_FEATURES = ('koi_score',)
+SIGNED_FEATURES = ('dec',)
+
+DEFAULT_BUDGET_MS = 100
+GENERATION_SIZE = 1024
+SWEEP_RANGE = 4.0
+
+
+def robust_scales(df: pd.DataFrame, encoder: FeatureEncoder = FEATURE_ENCODER) -> np.ndarray:
+    """Per-feature IQR / 1.349 from the catalog; NaN where a column is missing or constant"""
+    scales = np.full(encoder.n_features, np.nan)
+    for name in encoder.input_names:
+        if name in df:
+            low, high = np.nanpercentile(df[name].to_numpy(dtype=np.float64), [25, 75])
+            if np.isfinite(high - low) and high > low:
+                scales[encoder.index[name]] = (high - low) / 1.349
+    return scales
+
+
+class CounterfactualSearch:
+    """Batched counterfactual generator over a fitted scaler and probabilistic classifier"""
+
+    def __init__(self, model: Any, scaler: Any, classes: Sequence[str], encoder: FeatureEncoder = FEATURE_ENCODER,
+                 feature_scales: Optional[np.ndarray] = None, generation_size: int = GENERATION_SIZE):
+        self.model = model
+        self.scaler = scaler
+        self.classes = [str(c) for c in classes]
+        self.encoder = encoder
+        self.generation_size = generation_size
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64).copy()
+        if feature_scales is not None:
+            usable = np.isfinite(feature_scales) & (feature_scales > 0)
+            self.scale[usable] = feature_scales[usable]
+        self.default_features = [name for name in encoder.input_names if name not in FIXED_FEATURES]
+
+    def _constrain(self, raw: np.ndarray, columns: np.ndarray):
+        for j in columns:
+            name = self.encoder.names[j]
+            if name in BINARY_FEATURES:
+                raw[:, j] = np.clip(np.rint(raw[:, j]), 0, 1)
+            elif name in UNIT_INTERVAL_FEATURES:
+                raw[:, j] = np.clip(raw[:, j], 0.0, 1.0)
+            elif name not in SIGNED_FEATURES:
+                raw[:, j] = np.maximum(raw[:, j], 0.0)
+
+    def _evaluate(self, base: np.ndarray, columns: np.ndarray, Z: np.ndarray):
+        """Constrained raw rows, their actual standardized coordinates and class probabilities"""
+        raw = np.repeat(base[None, :], len(Z), axis=0)
+        raw[:, columns] = Z * self.scale[columns] + self.mean[columns]
+        self._constrain(raw, columns)
+        self.encoder.fill_derived(raw)
+        probabilities = self.model.predict_proba(self.scaler.transform(raw))
+        return raw, (raw[:, columns] - self.mean[columns]) / self.scale[columns], probabilities
+
+    def search(self, base: np.ndarray, target: str, features: Optional[Sequence[str]] = None,
+               budget_ms: float = DEFAULT_BUDGET_MS, seed: Optional[int] = 0) -> Dict[str, Any]:
+        """Minimal-norm input change (within the budget) whose prediction is `target`"""
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000.0
+        rng = np.random.default_rng(seed)
+        target_index = self.classes.index(target)
+        names = list(features) if features else self.default_features
+        columns = np.array([self.encoder.index[name] for name in names])
+        k = len(columns)
+
+        base = np.asarray(base, dtype=self.encoder.dtype).reshape(-1)
+        _, origin, original_probabilities = self._evaluate(base, columns, ((base[columns] - self.mean[columns]) / self.scale[columns])[None, :])
+        origin, original_probabilities = origin[0], original_probabilities[0]
+
+        # best = (distance, raw row, probabilities, standardized coordinates)
+        best = None
+        evaluated = 1
+        if original_probabilities.argmax() == target_index:
+            best = (0.0, base, original_probabilities, origin)
+
+        # Coordinate sweeps seed the search with single-feature flips
+        deltas = np.linspace(-SWEEP_RANGE, SWEEP_RANGE, max(2, self.generation_size // max(k, 1)))
+        candidates = np.repeat(origin[None, :], k * len(deltas), axis=0)
+        candidates[np.arange(len(candidates)), np.repeat(np.arange(k), len(deltas))] += np.tile(deltas, k)
+
+        generation = 0
+        radius = 1.0
+        while best is None or best[0] > 0.0:
+            raw, Z, probabilities = self._evaluate(base, columns, candidates)
+            evaluated += len(candidates)
+            flips = np.flatnonzero(probabilities.argmax(axis=1) == target_index)
+            if len(flips):
+                distances = np.linalg.norm(Z[flips] - origin, axis=1)
+                i = flips[distances.argmin()]
+                if best is None or distances.min() < best[0]:
+                    best = (float(distances.min()), raw[i], probabilities[i], Z[i])
+            generation += 1
+            if time.perf_counter() >= deadline:
+                break
+
+            n = self.generation_size
+            if best is None:
+                # Random restarts: dense and sparse directions at a widening radius
+                directions = rng.standard_normal((n, k))
+                sparse = rng.random((n, k)) < np.clip(2.0 / max(k, 1), 0.0, 1.0)
+                directions[n // 2:] *= sparse[n // 2:]
+                directions /= np.maximum(np.linalg.norm(directions, axis=1, keepdims=True), 1e-12)
+                candidates = origin + directions * rng.uniform(0.0, radius, (n, 1))
+                radius = min(radius * 1.5, 4.0 * SWEEP_RANGE)
+            else:
+                step = best[3] - origin
+                line = origin + np.linspace(0.0, 1.0, 34)[1:-1, None] * step
+                # Sparser variants: reset one feature, or every feature moved less than a threshold
+                resets = np.repeat(best[3][None, :], k, axis=0)
+                resets[np.arange(k), np.arange(k)] = origin
+                pruned = np.where(np.abs(step)[None, :] <= np.sort(np.abs(step))[:, None], origin, best[3])
+                # Local moves touch a few coordinates at a time and lean back toward the original
+                sigma = max(best[0], 1e-3) * 0.25 * 0.85 ** generation
+                n_local = max(n - len(line) - 2 * k, 0)
+                noise = rng.standard_normal((n_local, k)) * (rng.random((n_local, k)) < np.clip(3.0 / k, 0.0, 1.0))
+                local = origin + (best[3] + noise * sigma - origin) * rng.uniform(0.5, 1.0, (n_local, 1))
+                candidates = np.vstack([line, resets, pruned, local])
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        result = {
+            "target": target,
+            "found": best is not None,
+            "original": {
+                "prediction": self.classes[int(original_probabilities.argmax())],
+                "probabilities": dict(zip(self.classes, original_probabilities.tolist()))
+            },
+            "evaluated": evaluated,
+            "generations": generation,
+            "elapsed_ms": elapsed_ms
+        }
+        if best is not None:
+            distance, raw_row, probabilities, coordinates = best
+            changed = columns[np.abs(coordinates - origin) > 1e-6]
+            result["counterfactual"] = {
+                "prediction": self.classes[int(probabilities.argmax())],
+                "probabilities": dict(zip(self.classes, probabilities.tolist())),
+                "distance": distance,
+                "changes": [
+                    {
+                        "feature": self.encoder.names[j],
+                        "from": float(base[j]),
+                        "to": float(raw_row[j]),
+                        "delta": float(raw_row[j]) - float(base[j])
+                    }
+                    for j in changed
+                ]
+            }
+        return result
@@ -0,0 +1,164 @@
+"""
+Positional Cross-Match Engine
+Joins two catalogs by sky position within an angular tolerance (e.g. KOI x TESS TOI or Gaia)
+
+The smaller catalog is held in memory sorted by declination; the larger one is streamed in
+chunks. Each chunk is swept against the sorted declinations with binary searches to get
+every candidate inside the [dec - r, dec + r] strip, then an exact great-circle test keeps
+the true matches. Memory is bounded by the chunk size, not by the streamed catalog. Output ids
+are prefixed reference_ / stream_, so both sides survive when the two id columns share a name.
+
+Usage:
+    python cross_match.py "../data/NASA Exoplanet.csv" toi.csv matches.csv --radius 2 \\
+        --reference-id kepoi_name --stream-id toi
+"""
+
+import argparse
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sky_index import unit_vectors
+
+ARCSEC_PER_DEGREE = 3600.0
+
+
+class CrossMatchStats(NamedTuple):
+    rows: int
+    matches: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+
+class DecSortedCatalog:
+    """In-memory side of the match: positions sorted by declination"""
+
+    def __init__(self, ra_deg: np.ndarray, dec_deg: np.ndarray):
+        dec = np.asarray(dec_deg, dtype=np.float64)
+        valid = np.flatnonzero(np.isfinite(dec) & np.isfinite(np.asarray(ra_deg, dtype=np.float64)))
+        order = valid[np.argsort(dec[valid], kind='stable')]
+        self.order = order
+        self.dec = dec[order]
+        self.xyz = unit_vectors(np.asarray(ra_deg, dtype=np.float64)[order], self.dec)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def match(self, ra_deg: np.ndarray, dec_deg: np.ndarray, radius_deg: float,
+              nearest_only: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(query rows, catalog rows, separations in degrees) for all pairs within radius_deg"""
+        ra = np.asarray(ra_deg, dtype=np.float64)
+        dec = np.asarray(dec_deg, dtype=np.float64)
+        queries = np.flatnonzero(np.isfinite(ra) & np.isfinite(dec))
+
+        # Sweep: the declination strip of every query is a contiguous slice of self.dec
+        low = np.searchsorted(self.dec, dec[queries] - radius_deg, side='left')
+        high = np.searchsorted(self.dec, dec[queries] + radius_deg, side='right')
+        counts = high - low
+        left = np.repeat(queries, counts)
+        starts = np.repeat(low - np.r_[0, np.cumsum(counts)[:-1]], counts)
+        right = starts + np.arange(len(left))
+
+        chord = np.linalg.norm(unit_vectors(ra[left], dec[left]) - self.xyz[right], axis=1)
+        separation = np.degrees(2.0 * np.arcsin(np.minimum(chord / 2.0, 1.0)))
+        inside = separation <= radius_deg
+        left, right, separation = left[inside], right[inside], separation[inside]
+
+        if nearest_only and len(left):
+            best = np.lexsort((separation, left))
+            first = best[np.r_[True, left[best][1:] != left[best][:-1]]]
+            left, right, separation = left[first], right[first], separation[first]
+        return left, self.order[right], separation
+
+
+def output_columns(reference_id: str, stream_id: Optional[str], extra_columns: Sequence[str] = ()) -> List[str]:
+    """Column names of the matched pairs; raises ValueError when any two would collide"""
+    names = [f'reference_{reference_id}', f'stream_{stream_id}' if stream_id else 'stream_row', 'separation_arcsec']
+    names += list(extra_columns)
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Cross-match output columns collide: {duplicates}")
+    return names
+
+
+def cross_match(reference: pd.DataFrame, chunks: Iterable[pd.DataFrame], radius_arcsec: float = 2.0,
+                reference_id: str = 'kepoi_name', stream_id: Optional[str] = None,
+                reference_columns: Sequence[str] = ('ra', 'dec'), stream_columns: Sequence[str] = ('ra', 'dec'),
+                extra_columns: Sequence[str] = (), nearest_only: bool = True) -> Iterator[pd.DataFrame]:
+    """Matched pairs per streamed chunk: reference_<id>, stream_<id> (or stream_row),
+    separation_arcsec and any extra stream columns"""
+    names = output_columns(reference_id, stream_id, extra_columns)
+    catalog = DecSortedCatalog(reference[reference_columns[0]].to_numpy(dtype=np.float64),
+                               reference[reference_columns[1]].to_numpy(dtype=np.float64))
+    reference_ids = reference[reference_id].to_numpy()
+    radius_deg = radius_arcsec / ARCSEC_PER_DEGREE
+
+    for chunk in chunks:
+        rows, matched, separation = catalog.match(chunk[stream_columns[0]].to_numpy(dtype=np.float64),
+                                                  chunk[stream_columns[1]].to_numpy(dtype=np.float64),
+                                                  radius_deg, nearest_only=nearest_only)
+        values = [
+            reference_ids[matched],
+            chunk[stream_id].to_numpy()[rows] if stream_id else chunk.index.to_numpy()[rows],
+            separation * ARCSEC_PER_DEGREE,
+        ]
+        values += [chunk[name].to_numpy()[rows] for name in extra_columns]
+        yield pd.DataFrame(dict(zip(names, values)))
+
+
+def cross_match_files(reference_path: str, stream_path: str, output_path: str, radius_arcsec: float = 2.0,
+                      chunksize: int = 100_000, **options) -> CrossMatchStats:
+    """Stream `stream_path` against `reference_path` and write matched pairs to a CSV"""
+    reference = pd.read_csv(reference_path, comment='#')
+    chunks = pd.read_csv(stream_path, comment='#', chunksize=chunksize)
+
+    rows = matches = 0
+    started = time.perf_counter()
+
+    def counted(reader):
+        nonlocal rows
+        for chunk in reader:
+            rows += len(chunk)
+            yield chunk
+
+    for index, pairs in enumerate(cross_match(reference, counted(chunks), radius_arcsec, **options)):
+        pairs.to_csv(output_path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+        matches += len(pairs)
+        elapsed = time.perf_counter() - started
+        print(f"🔭 {rows:,} rows, {matches:,} matches ({rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+    return CrossMatchStats(rows, matches, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Positional cross-match of two catalogs")
+    parser.add_argument('reference', help="smaller catalog, held in memory (e.g. the KOI CSV)")
+    parser.add_argument('stream', help="larger catalog, read in chunks")
+    parser.add_argument('output', help="CSV of matched pairs")
+    parser.add_argument('--radius', type=float, default=2.0, help="match radius in arcseconds")
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--reference-id', default='kepoi_name')
+    parser.add_argument('--stream-id', default=None)
+    parser.add_argument('--reference-radec', nargs=2, default=('ra', 'dec'), metavar=('RA', 'DEC'))
+    parser.add_argument('--stream-radec', nargs=2, default=('ra', 'dec'), metavar=('RA', 'DEC'))
+    parser.add_argument('--extra', nargs='*', default=(), help="stream columns copied into the output")
+    parser.add_argument('--all-pairs', action='store_true', help="keep every pair, not only the nearest")
+    args = parser.parse_args()
+
+    stats = cross_match_files(
+        args.reference, args.stream, args.output, args.radius, args.chunksize,
+        reference_id=args.reference_id, stream_id=args.stream_id,
+        reference_columns=args.reference_radec, stream_columns=args.stream_radec,
+        extra_columns=args.extra, nearest_only=not args.all_pairs
+    )
+    print(f"✅ {stats.matches:,} matches from {stats.rows:,} rows in {stats.seconds:.2f}s "
+          f"({stats.rows_per_sec:,.0f} rows/sec) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
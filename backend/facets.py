@@ -0,0 +1,109 @@
+"""
+Faceted Histograms
+Crossfilter-style distributions of period, radius, temperature and stellar temperature
+
+Every facet column is binned once at load time into a small uint8 array (NaNs go to a spill
+bin past the last one; out-of-range values land in the open-ended first/last bins). Applying a
+filter set is a handful of boolean range masks; each facet's histogram then counts the rows
+passing every filter except its own (so a brushed chart keeps showing its full distribution)
+with one np.bincount over the precomputed bin indices.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class Facet(NamedTuple):
+    column: str
+    low: float
+    high: float
+    bins: int
+    log: bool = False
+
+    @property
+    def edges(self) -> np.ndarray:
+        if self.log:
+            return np.logspace(np.log10(self.low), np.log10(self.high), self.bins + 1)
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+
+FACETS = {
+    'period': Facet('period', 0.1, 1000.0, 40, log=True),
+    'radius': Facet('radius', 0.1, 100.0, 40, log=True),
+    'temperature': Facet('temperature', 0.0, 3000.0, 40),
+    'star_temp': Facet('star_temp', 2500.0, 10500.0, 40),
+}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+
+def parse_range(text: Optional[str]) -> Optional[Range]:
+    """'lo,hi' query value -> (lo, hi); either side may be empty for an open range"""
+    if text is None:
+        return None
+    parts = text.split(',')
+    if len(parts) != 2:
+        raise ValueError(f"Range '{text}' must look like 'low,high'")
+    low, high = (float(part) if part.strip() else None for part in parts)
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"Range '{text}' has low > high")
+    return low, high
+
+
+class FacetEngine:
+    """Precomputed bin indices for a PlanetTable and one-pass filtered histograms"""
+
+    def __init__(self, table: Any, facets: Dict[str, Facet] = FACETS):
+        self.facets = facets
+        self.values = {name: np.asarray(table[facet.column], dtype=np.float64) for name, facet in facets.items()}
+        self.edges = {name: facet.edges for name, facet in facets.items()}
+        self.bins = {}
+        for name, facet in facets.items():
+            values = self.values[name]
+            index = np.clip(np.searchsorted(self.edges[name], values, side='right') - 1, 0, facet.bins - 1)
+            index[np.isnan(values)] = facet.bins
+            self.bins[name] = index.astype(np.uint8)
+        self.n_rows = len(table)
+
+    def histograms(self, ranges: Dict[str, Range], base_mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Counts per facet under every other facet's range, plus the fully filtered total"""
+        unknown = set(ranges) - set(self.facets)
+        if unknown:
+            raise ValueError(f"Unknown facets: {sorted(unknown)}")
+
+        base = np.ones(self.n_rows, dtype=bool) if base_mask is None else base_mask
+        masks = {}
+        for name, (low, high) in ranges.items():
+            values = self.values[name]
+            mask = np.ones(self.n_rows, dtype=bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            masks[name] = mask
+
+        # Prefix/suffix products of the filter masks give "all filters but one" for every facet
+        names = list(self.facets)
+        before = [base]
+        for name in names:
+            before.append(before[-1] & masks[name] if name in masks else before[-1])
+        after = [None] * len(names)
+        suffix = None
+        for i in range(len(names) - 1, -1, -1):
+            after[i] = suffix
+            if names[i] in masks:
+                suffix = masks[names[i]] if suffix is None else suffix & masks[names[i]]
+
+        facets = {}
+        for i, name in enumerate(names):
+            facet = self.facets[name]
+            mask = before[i] if after[i] is None else before[i] & after[i]
+            counts = np.bincount(self.bins[name][mask], minlength=facet.bins + 1)
+            facets[name] = {
+                'edges': self.edges[name].tolist(),
+                'counts': counts[:facet.bins].tolist(),
+                'missing': int(counts[facet.bins]),
+                'range': list(ranges[name]) if name in ranges else None
+            }
+        return {'total': int(np.count_nonzero(before[-1])), 'facets': facets}
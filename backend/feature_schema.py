@@ -0,0 +1,164 @@
+"""
+Feature Schema for Exoplanet Classification
+Single source of truth for the model input layout, defaults and derived flags
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from habitable_zone import classify as classify_habitable_zone
+
+# Insolation band (Earth flux units) used for the derived habitable_zone flag. The served
+# model was trained on this band, so it stays the model input; the stellar-temperature
+# dependent Kopparapu limits are available through FeatureEncoder.habitable_zones()
+HABITABLE_INSOL_RANGE = (0.25, 1.5)
+
+
+class Feature(NamedTuple):
+    """One column of the model input vector"""
+    name: str
+    default: float = 0.0
+    derive: Optional[Callable[[np.ndarray, Dict[str, int]], np.ndarray]] = None
+
+
+def _habitable_zone(buffer: np.ndarray, index: Dict[str, int]) -> np.ndarray:
+    insol = buffer[:, index['koi_insol']]
+    low, high = HABITABLE_INSOL_RANGE
+    return (insol >= low) & (insol <= high)
+
+
+# Order matches the scaler / model training order
+FEATURE_SCHEMA: Tuple[Feature, ...] = (
+    Feature('koi_period', 365.25),
+    Feature('koi_duration', 6.0),
+    Feature('koi_depth', 500.0),
+    Feature('koi_prad', 1.0),
+    Feature('koi_teq', 288.0),
+    Feature('koi_insol', 1.0),
+    Feature('koi_model_snr', 25.0),
+    Feature('koi_steff', 5778.0),
+    Feature('koi_slogg', 4.44),
+    Feature('koi_srad', 1.0),
+    Feature('koi_smass', 1.0),
+    Feature('koi_kepmag', 12.0),
+    Feature('koi_fpflag_nt', 0),
+    Feature('koi_fpflag_ss', 0),
+    Feature('koi_fpflag_co', 0),
+    Feature('koi_fpflag_ec', 0),
+    Feature('ra', 290.0),
+    Feature('dec', 45.0),
+    Feature('habitable_zone', derive=_habitable_zone),
+    Feature('koi_score', 0.5),
+)
+
+
+class FeatureEncoder:
+    """Compiled encoder writing records or column batches into a float32 model buffer"""
+
+    def __init__(self, schema: Tuple[Feature, ...] = FEATURE_SCHEMA, dtype=np.float32):
+        self.schema = schema
+        self.dtype = np.dtype(dtype)
+        self.names = tuple(f.name for f in schema)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.n_features = len(schema)
+
+        # Raw inputs are copied from the caller, derived ones are computed afterwards
+        self.input_names = tuple(f.name for f in schema if f.derive is None)
+        self._inputs = tuple((self.index[f.name], f.name, f.default) for f in schema if f.derive is None)
+        self._derived = tuple((self.index[f.name], f.derive) for f in schema if f.derive is not None)
+        self._input_index = {name: i for i, name, _ in self._inputs}
+        self._defaults = np.array([f.default for f in schema], dtype=self.dtype)
+
+    def allocate(self, n_rows: int) -> np.ndarray:
+        """Allocate a buffer pre-filled with the schema defaults"""
+        out = np.empty((n_rows, self.n_features), dtype=self.dtype)
+        out[:] = self._defaults
+        return out
+
+    def _check_out(self, out: Optional[np.ndarray], n_rows: int) -> np.ndarray:
+        if out is None:
+            return self.allocate(n_rows)
+        if out.shape != (n_rows, self.n_features) or out.dtype != self.dtype:
+            raise ValueError(
+                f"Output buffer must be {self.dtype} with shape ({n_rows}, {self.n_features}), "
+                f"got {out.dtype} {out.shape}"
+            )
+        out[:] = self._defaults
+        return out
+
+    def fill_derived(self, out: np.ndarray) -> np.ndarray:
+        """Recompute derived columns (e.g. habitable_zone) from the raw inputs in place"""
+        for i, derive in self._derived:
+            out[:, i] = derive(out, self.index)
+        return out
+
+    def habitable_zones(self, buffer: np.ndarray) -> np.ndarray:
+        """Kopparapu zone codes (see habitable_zone) from the encoded koi_insol / koi_steff columns"""
+        return classify_habitable_zone(buffer[:, self.index['koi_insol']], buffer[:, self.index['koi_steff']])
+
+    def _fill_row(self, row: np.ndarray, record: Any):
+        # Pydantic models expose their field values through __dict__
+        fields = record if isinstance(record, dict) else vars(record)
+        input_index = self._input_index
+        for key, value in fields.items():
+            i = input_index.get(key)
+            if i is not None and value is not None:
+                row[i] = value
+
+    def encode(self, record: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a single dict or Pydantic model into a (1, n_features) buffer"""
+        out = self._check_out(out, 1)
+        self._fill_row(out[0], record)
+        return self.fill_derived(out)
+
+    def encode_records(self, records: Iterable[Any], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a sequence of dicts or Pydantic models row by row"""
+        if not hasattr(records, '__len__'):
+            records = list(records)
+        out = self._check_out(out, len(records))
+        for row, record in zip(out, records):
+            self._fill_row(row, record)
+        return self.fill_derived(out)
+
+    def encode_columns(self, columns: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a DataFrame or mapping of equal-length arrays; NaN and missing columns take defaults"""
+        n_rows = len(columns) if hasattr(columns, 'columns') else len(next(iter(columns.values()), ()))
+        out = self._check_out(out, n_rows)
+        for i, name, default in self._inputs:
+            if name not in columns:
+                continue
+            column = out[:, i]
+            np.copyto(column, np.asarray(columns[name], dtype=np.float64), casting='same_kind')
+            np.copyto(column, default, where=np.isnan(column))
+        return self.fill_derived(out)
+
+    def as_columns(self, buffer: np.ndarray) -> Dict[str, np.ndarray]:
+        """Name -> column views over an encoded buffer"""
+        return {name: buffer[:, i] for i, name in enumerate(self.names)}
+
+    def check_estimator(self, estimator: Any, label: str = 'scaler'):
+        """Raise ValueError when a fitted estimator disagrees with the schema"""
+        n_features_in = getattr(estimator, 'n_features_in_', None)
+        if n_features_in is not None and n_features_in != self.n_features:
+            raise ValueError(
+                f"{label} expects {n_features_in} features but the schema defines {self.n_features}"
+            )
+        names_in = getattr(estimator, 'feature_names_in_', None)
+        if names_in is not None and tuple(names_in) != self.names:
+            raise ValueError(f"{label} feature order {list(names_in)} does not match the schema")
+
+
+def feature_hash(row: np.ndarray, version: Optional[str] = None) -> str:
+    """Cache key of one encoded feature vector, optionally salted with a model version"""
+    digest = hashlib.sha1(np.ascontiguousarray(row, dtype=np.float32).tobytes())
+    if version:
+        digest.update(version.encode('utf-8'))
+    return digest.hexdigest()
+
+
+FEATURE_ENCODER = FeatureEncoder()
+FEATURE_NAMES = list(FEATURE_ENCODER.names)
+INPUT_FEATURES = list(FEATURE_ENCODER.input_names)
+FEATURE_DEFAULTS = {f.name: f.default for f in FEATURE_SCHEMA if f.derive is None}
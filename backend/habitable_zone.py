@@ -0,0 +1,149 @@
+"""
+Stellar Habitable Zones
+Kopparapu et al. (2014) conservative and optimistic habitable-zone limits per host star
+
+Each limit is an effective stellar flux S_eff(T) = S_sun + a T + b T^2 + c T^3 + d T^4 with
+T = T_eff - 5780 K (1 Earth-mass coefficients, valid for 2600-7200 K; temperatures outside
+are clamped). Distances follow from L / S_eff with L = R^2 (T_eff / 5780)^4; a missing
+stellar radius is recovered from log g and mass. Limits are evaluated vectorized once per
+kepid, and planets are placed in a zone by comparing their insolation with the star's limits.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# (S_eff at 5780 K, a, b, c, d) for each limit
+KOPPARAPU_LIMITS = {
+    'recent_venus': (1.776, 2.136e-4, 2.533e-8, -1.332e-11, -3.097e-15),
+    'runaway_greenhouse': (1.107, 1.332e-4, 1.580e-8, -8.308e-12, -1.931e-15),
+    'maximum_greenhouse': (0.356, 6.171e-5, 1.698e-9, -3.198e-12, -5.575e-16),
+    'early_mars': (0.320, 5.547e-5, 1.526e-9, -2.874e-12, -5.011e-16),
+}
+# (inner, outer) limit of each zone
+ZONES = {
+    'conservative': ('runaway_greenhouse', 'maximum_greenhouse'),
+    'optimistic': ('recent_venus', 'early_mars'),
+}
+TEFF_RANGE = (2600.0, 7200.0)
+SUN_TEFF = 5780.0
+SUN_LOGG = 4.438
+
+# Zone codes, innermost classification wins: conservative implies optimistic
+UNKNOWN, OUTSIDE, OPTIMISTIC, CONSERVATIVE = -1, 0, 1, 2
+ZONE_LABELS = {UNKNOWN: 'unknown', OUTSIDE: 'outside', OPTIMISTIC: 'optimistic', CONSERVATIVE: 'conservative'}
+
+
+_LABELS_BY_CODE = np.array([ZONE_LABELS[code] for code in sorted(ZONE_LABELS)], dtype=object)
+
+
+def zone_labels(codes: np.ndarray) -> np.ndarray:
+    """Zone codes -> 'conservative' / 'optimistic' / 'outside' / 'unknown'"""
+    return _LABELS_BY_CODE[np.asarray(codes) - UNKNOWN]
+
+
+def effective_fluxes(teff: Any) -> Dict[str, np.ndarray]:
+    """S_eff (Earth flux units) of every Kopparapu limit for stellar temperatures in K"""
+    t = np.clip(np.asarray(teff, dtype=np.float64), *TEFF_RANGE) - SUN_TEFF
+    return {
+        name: s_sun + t * (a + t * (b + t * (c + t * d)))
+        for name, (s_sun, a, b, c, d) in KOPPARAPU_LIMITS.items()
+    }
+
+
+def stellar_radius(srad: Any, slogg: Any = None, smass: Any = None) -> np.ndarray:
+    """Radius in solar radii, falling back to sqrt(M g_sun / g) where koi_srad is missing"""
+    radius = np.asarray(srad, dtype=np.float64).copy()
+    if slogg is not None and smass is not None:
+        from_gravity = np.sqrt(np.asarray(smass, dtype=np.float64) * 10.0 ** (SUN_LOGG - np.asarray(slogg, dtype=np.float64)))
+        np.copyto(radius, from_gravity, where=np.isnan(radius))
+    return radius
+
+
+def zone_codes(insol: Any, inner_flux: Dict[str, np.ndarray], outer_flux: Dict[str, np.ndarray]) -> np.ndarray:
+    """CONSERVATIVE / OPTIMISTIC / OUTSIDE per planet; UNKNOWN where insolation or limits are NaN"""
+    insol = np.asarray(insol, dtype=np.float64)
+    codes = np.full(insol.shape, OUTSIDE, dtype=np.int8)
+    for zone, code in (('optimistic', OPTIMISTIC), ('conservative', CONSERVATIVE)):
+        codes[(insol <= inner_flux[zone]) & (insol >= outer_flux[zone])] = code
+    codes[np.isnan(insol) | np.isnan(inner_flux['optimistic'])] = UNKNOWN
+    return codes
+
+
+def classify(insol: Any, teff: Any) -> np.ndarray:
+    """Zone codes straight from planet insolation and host temperature (no per-star cache)"""
+    fluxes = effective_fluxes(teff)
+    inner = {zone: fluxes[limits[0]] for zone, limits in ZONES.items()}
+    outer = {zone: fluxes[limits[1]] for zone, limits in ZONES.items()}
+    return zone_codes(insol, inner, outer)
+
+
+class HabitableZoneCache:
+    """Per-kepid habitable-zone limits (flux and AU), computed once for the whole catalog"""
+
+    def __init__(self, kepid: Any, teff: Any, srad: Any, slogg: Any = None, smass: Any = None):
+        # Stellar columns repeat across a system; each star takes the first non-NaN value per column
+        stars = pd.DataFrame({
+            name: np.asarray(values, dtype=np.float64)
+            for name, values in (('teff', teff), ('srad', srad), ('slogg', slogg), ('smass', smass))
+            if values is not None
+        }).groupby(np.asarray(kepid, dtype=np.int64), sort=True).first()
+        self.kepids = stars.index.to_numpy(dtype=np.int64)
+        self.positions = {int(k): i for i, k in enumerate(self.kepids)}
+
+        def per_star(name):
+            return stars[name].to_numpy() if name in stars else None
+
+        self.teff = per_star('teff')
+        self.radius = stellar_radius(per_star('srad'), per_star('slogg'), per_star('smass'))
+        self.luminosity = self.radius ** 2 * (self.teff / SUN_TEFF) ** 4
+        fluxes = effective_fluxes(self.teff)
+        self.inner_flux = {zone: fluxes[limits[0]] for zone, limits in ZONES.items()}
+        self.outer_flux = {zone: fluxes[limits[1]] for zone, limits in ZONES.items()}
+        self.inner_au = {zone: np.sqrt(self.luminosity / flux) for zone, flux in self.inner_flux.items()}
+        self.outer_au = {zone: np.sqrt(self.luminosity / flux) for zone, flux in self.outer_flux.items()}
+
+    @classmethod
+    def from_catalog(cls, df: Any) -> 'HabitableZoneCache':
+        """Build from a KOI DataFrame (kepid, koi_steff, koi_srad; koi_slogg and koi_smass when present)"""
+        return cls(df['kepid'], df['koi_steff'], df['koi_srad'], df.get('koi_slogg'), df.get('koi_smass'))
+
+    def __len__(self) -> int:
+        return len(self.kepids)
+
+    def star_positions(self, kepid: Any) -> np.ndarray:
+        """Cache position of every kepid (-1 when unknown)"""
+        kepid = np.asarray(kepid, dtype=np.int64)
+        position = np.minimum(np.searchsorted(self.kepids, kepid), max(len(self.kepids) - 1, 0))
+        return np.where(self.kepids[position] == kepid, position, -1) if len(self.kepids) else np.full(kepid.shape, -1)
+
+    def zones(self, kepid: Any, insol: Any) -> np.ndarray:
+        """Zone codes for planets given their host kepid and insolation"""
+        position = self.star_positions(kepid)
+        known = position >= 0
+        inner = {zone: np.where(known, flux[position], np.nan) for zone, flux in self.inner_flux.items()}
+        outer = {zone: np.where(known, flux[position], np.nan) for zone, flux in self.outer_flux.items()}
+        return zone_codes(insol, inner, outer)
+
+    def lookup(self, kepid: int) -> Optional[Dict[str, Any]]:
+        """JSON-ready limits of one star, or None for an unknown kepid"""
+        position = self.positions.get(kepid)
+        if position is None:
+            return None
+
+        def number(value):
+            return None if np.isnan(value) else float(value)
+
+        return {
+            "luminosity": number(self.luminosity[position]),
+            **{
+                zone: {
+                    "inner_flux": number(self.inner_flux[zone][position]),
+                    "outer_flux": number(self.outer_flux[zone][position]),
+                    "inner_au": number(self.inner_au[zone][position]),
+                    "outer_au": number(self.outer_au[zone][position]),
+                }
+                for zone in ZONES
+            }
+        }
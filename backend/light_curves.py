@@ -0,0 +1,105 @@
+"""
+Synthetic Transit Light Curves
+Trapezoid transit models from koi_depth, koi_duration, koi_period and koi_impact
+
+Each planet gets a phase-folded time grid centred on mid-transit, scaled to its own
+duration, and the whole (planets x points) flux array is evaluated in one broadcast.
+The ingress/egress time follows Winn (2010): tau ~ T * k / (1 - b^2) with k = sqrt(depth),
+capped at T / 2 so grazing orbits become V-shaped.
+
+Binary layout (little-endian, n = curves, m = points per curve):
+
+    offset 0     4 bytes   magic b'EXLC'
+    offset 4     uint32    format version (2)
+    offset 8     uint32    n
+    offset 12    uint32    m
+    offset 16    uint32    L, byte length of the name table
+    offset 20    L bytes   UTF-8 kepoi_names of the n curves joined by '\n', zero-padded to a multiple of 4
+    offset 20+L  n blocks of  float32 time [m] (days from mid-transit), float32 flux [m] (relative)
+
+The name table travels in the body rather than a header, since a thousand names would exceed
+typical proxy header buffers.
+
+Blocks are produced in chunks, so a response can be streamed while later curves are computed.
+"""
+
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'EXLC'
+FORMAT_VERSION = 2
+HEADER_BYTES = 20
+
+
+class LightCurveModel:
+    """Trapezoid parameters for every KOI with depth, duration and period"""
+
+    def __init__(self, df: pd.DataFrame):
+        planets = df.dropna(subset=['koi_depth', 'koi_duration', 'koi_period'])
+        planets = planets[(planets['koi_duration'] > 0) & (planets['koi_period'] > 0)]
+
+        self.kepid = planets['kepid'].to_numpy(dtype=np.int64)
+        self.kepoi_name = planets['kepoi_name'].to_numpy(dtype=object)
+        self.disposition = planets['koi_disposition'].to_numpy(dtype=object)
+        self.period = planets['koi_period'].to_numpy(dtype=np.float64)
+        self.depth = np.clip(planets['koi_depth'].to_numpy(dtype=np.float64) * 1e-6, 0.0, 1.0)
+        self.duration = planets['koi_duration'].to_numpy(dtype=np.float64) / 24.0
+        impact = np.nan_to_num(planets['koi_impact'].to_numpy(dtype=np.float64), nan=0.0)
+
+        grazing = np.maximum(1.0 - impact ** 2, 1e-6)
+        self.ingress = np.minimum(self.duration * np.sqrt(self.depth) / grazing, self.duration / 2.0)
+        self.rows_by_name = {name: i for i, name in enumerate(self.kepoi_name)}
+
+    def __len__(self) -> int:
+        return len(self.period)
+
+    def select(self, kepid: Optional[int] = None, names: Optional[list] = None,
+               disposition: Optional[str] = None, limit: Optional[int] = None) -> np.ndarray:
+        """Model rows for explicit KOI names (in request order) or a system (by period), narrowed by every filter given"""
+        keep = np.ones(len(self), dtype=bool)
+        if kepid is not None:
+            keep &= self.kepid == kepid
+        if disposition:
+            keep &= self.disposition == disposition
+        if names:
+            rows = np.array([self.rows_by_name[name] for name in names if name in self.rows_by_name], dtype=np.intp)
+            rows = rows[keep[rows]]
+        else:
+            rows = np.flatnonzero(keep)
+            if kepid is not None:
+                rows = rows[np.argsort(self.period[rows], kind='stable')]
+        return rows[:limit]
+
+    def time_grid(self, rows: np.ndarray, points: int = 200, window: float = 1.0) -> np.ndarray:
+        """(n, points) days from mid-transit spanning +/- window transit durations (at most half a period)"""
+        half_span = np.minimum(window * self.duration[rows], self.period[rows] / 2.0)
+        return np.linspace(-1.0, 1.0, points) * half_span[:, None]
+
+    def flux(self, rows: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """Relative flux for time offsets (days from mid-transit, shape (m,) or (n, m)), folded on the period"""
+        period = self.period[rows][:, None]
+        phase = np.abs(np.mod(np.asarray(times, dtype=np.float64) + period / 2.0, period) - period / 2.0)
+        half_duration = self.duration[rows][:, None] / 2.0
+        ingress = np.maximum(self.ingress[rows][:, None], 1e-9)
+        covered = np.clip((half_duration - phase) / ingress, 0.0, 1.0)
+        return 1.0 - self.depth[rows][:, None] * covered
+
+    def iter_packed(self, rows: np.ndarray, points: int = 200, window: float = 1.0,
+                    chunk_size: int = 256) -> Iterator[bytes]:
+        """Header and name table followed by float32 time/flux blocks, one chunk of curves at a time"""
+        names = '\n'.join(self.kepoi_name[rows]).encode('utf-8')
+        names += b'\0' * (-len(names) % 4)
+        header = np.array([int.from_bytes(MAGIC, 'little'), FORMAT_VERSION, len(rows), points, len(names)], dtype='<u4')
+        yield header.tobytes() + names
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            times = self.time_grid(chunk, points, window)
+            blocks = np.empty((len(chunk), 2, points), dtype='<f4')
+            blocks[:, 0] = times
+            blocks[:, 1] = self.flux(chunk, times)
+            yield blocks.tobytes()
+
+    def pack(self, rows: np.ndarray, points: int = 200, window: float = 1.0) -> bytes:
+        return b''.join(self.iter_packed(rows, points, window))
@@ -3,20 +3,55 @@ FastAPI Backend for Exoplanet Discovery Platform
 Serves ML predictions and exoplanet data for 3D visualization
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import joblib
 import numpy as np
 import pandas as pd
+import gzip
 import json
+import os
 from pathlib import Path
 
+from catalog_predictions import CatalogPredictions
+from catalog_stats import CatalogStats
+from counterfactual import CounterfactualSearch, robust_scales
+from facets import FacetEngine, parse_range
+from feature_schema import FEATURE_ENCODER, FEATURE_NAMES, feature_hash
+from habitable_zone import HabitableZoneCache
+from light_curves import LightCurveModel
+from name_search import NameIndex, search_results
+from octree_tiles import OctreeTiles
+from planet_rules import classify_batch, classify_planet
+from planet_table import PlanetTable, build_visualization_table
+from response_cache import ConditionalGetMiddleware, LRUCache, accepts_gzip, file_version, files_version
+from resources import RESOURCES, data_path
+from response_formats import JSON, FastJSONResponse, dumps, negotiate, render_table
+from scene_buffers import SceneBuffers
+from sky_density import SkyDensityTiles
+from sky_index import SkyIndex
+from system_index import SystemIndex
+from transit_ephemeris import TransitEphemeris, current_bjd
+from tree_explainer import TreeExplainer, explanation
+from triage import CRITERIA, TriageQueue
+from uncertainty import UNCERTAIN_FEATURES, MonteCarloClassifier, relative_errors
+from what_if import SweepAxis, sweep, validate_axes
+
 app = FastAPI(
     title="Exoplanet Discovery API",
     description="AI-powered exoplanet classification and visualization API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
+
+# ETag / response cache for read-only endpoints (added first so CORS still wraps 304s and cache hits)
+app.add_middleware(
+    ConditionalGetMiddleware,
+    paths=["/", "/stats", "/exoplanets", "/exoplanets/scene", "/exoplanets/cone", "/facets", "/systems", "/tiles", "/sky", "/triage"],
+    prefixes=["/systems/", "/tiles/", "/sky/", "/koi/"],
+    version=lambda: cache_version()
 )
 
 # CORS middleware
@@ -28,12 +63,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+DATA_PATH = data_path()
+CACHE_DIR = os.environ.get('EXOPLANET_CACHE_DIR', str(Path(__file__).resolve().parent / '.cache'))
+MAX_TRANSIT_WINDOW_DAYS = 3660.0
+MAX_LIGHT_CURVES = 1000
+MAX_LIGHT_CURVE_POINTS = 4096
+MAX_UNCERTAINTY_SAMPLES = 20000
+MAX_COUNTERFACTUAL_BUDGET_MS = 2000
+MAX_SEARCH_RESULTS = 50
+MAX_BATCH_SIZE = 1000
+MAX_TRIAGE_PAGE_SIZE = 200
+
 # === Global variables ===
 ml_model = None
 scaler = None
 label_encoder = None
 feature_names = []
 exoplanet_data = None
+catalog_stats = None
+habitable_zones = None
+scene_buffers = None
+sky_index = None
+system_index = None
+name_index = None
+facet_engine = None
+transit_ephemeris = None
+light_curves = None
+monte_carlo = None
+catalog_relative_errors = None
+tree_explainer = None
+counterfactual_search = None
+catalog_predictions = None
+triage_queue = None
+explanation_cache = LRUCache()
+sweep_cache = LRUCache(max_entries=512)
+octree_tiles = None
+sky_density = None
+model_version = None
+dataset_version = None
+
+def cache_version():
+    """Identifies the loaded dataset + model for response ETags (None disables caching until both are known)"""
+    if dataset_version is None or model_version is None:
+        return None
+    return f"{dataset_version}:{model_version}"
 
 class PlanetInput(BaseModel):
     """Input model for exoplanet prediction"""
@@ -56,6 +129,27 @@ class PlanetInput(BaseModel):
     ra: float
     dec: float
     koi_score: Optional[float] = 0.5
+    # Optional error bars for ?uncertainty=true: feature -> [err1, err2] as in the KOI table
+    errors: Optional[Dict[str, List[float]]] = None
+
+class SweepAxisInput(BaseModel):
+    """One swept input feature and its grid"""
+    feature: str
+    start: float
+    stop: float
+    steps: int = 25
+
+class SweepRequest(BaseModel):
+    """Base planet plus one or two axes for a what-if sweep"""
+    planet: PlanetInput
+    axes: List[SweepAxisInput]
+
+class CounterfactualRequest(BaseModel):
+    """Planet plus the disposition it should be moved to"""
+    planet: PlanetInput
+    target: str = "CONFIRMED"
+    features: Optional[List[str]] = None
+    budget_ms: int = 100
 
 class PredictionResponse(BaseModel):
     """Response model for predictions"""
@@ -65,6 +159,7 @@ class PredictionResponse(BaseModel):
     habitability_score: float
     planet_type: str
     star_type: str
+    uncertainty: Optional[Dict[str, Any]] = None
 
 class ExoplanetData(BaseModel):
     """Model for exoplanet visualization data"""
@@ -80,95 +175,52 @@ class ExoplanetData(BaseModel):
     dec: float
     habitability_score: float
 
-    try:
-        # Load ML models at startup
-        ml_model = joblib.load('../ml/exoplanet_model_best.joblib')
-        scaler = joblib.load('../ml/scaler.joblib')
-        label_encoder = joblib.load('../ml/label_encoder.joblib')
-            
-        # Load feature names
-        feature_names = [
-            'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_teq', 
-            'koi_insol', 'koi_model_snr', 'koi_steff', 'koi_slogg', 'koi_srad', 
-            'koi_smass', 'koi_kepmag', 'koi_fpflag_nt', 'koi_fpflag_ss', 
-            'koi_fpflag_co', 'koi_fpflag_ec', 'ra', 'dec', 'habitable_zone', 'koi_score'
-        ]
-        
-        # Load exoplanet data for visualization
-        df = pd.read_csv('../data/cumulative_2025.09.16_22.42.55.csv')
-        exoplanet_data = prepare_visualization_data(df)
-        
-        print("Models and data loaded successfully")
-        
-    except Exception as e:
-        print(f"Error loading models: {e}")
-        # For development, continue without models
-        pass
-    
-    
 # Function to prepare exoplanet data for visualization
-def prepare_visualization_data(df: pd.DataFrame):
+def prepare_visualization_data(df: pd.DataFrame, zones: Optional[HabitableZoneCache] = None):
     """Prepare exoplanet data for 3D visualization"""
-    viz_data = df[df['koi_disposition'].isin(['CONFIRMED', 'CANDIDATE'])].copy()
-    viz_data = viz_data.dropna(subset=['koi_period', 'koi_prad', 'koi_teq', 'koi_steff'])
-
-    def calculate_habitability(row):
-        score = 0.0
-        if 273 <= row['koi_teq'] <= 373:
-            score += 40
-        elif 200 <= row['koi_teq'] <= 400:
-            score += 20
-        if 0.8 <= row['koi_prad'] <= 1.5:
-            score += 30
-        elif 0.5 <= row['koi_prad'] <= 2.0:
-            score += 15
-        if 0.25 <= row['koi_insol'] <= 1.5:
-            score += 30
-        elif 0.1 <= row['koi_insol'] <= 4.0:
-            score += 10
-        return min(score, 100)
-
-    viz_data['habitability_score'] = viz_data.apply(calculate_habitability, axis=1)
-
-    exoplanets = []
-    for _, row in viz_data.iterrows():
-        exoplanet = {
-            'kepoi_name': row['kepoi_name'],
-            'kepler_name': row['kepler_name'] if pd.notna(row['kepler_name']) else None,
-            'disposition': row['koi_disposition'],
-            'period': float(row['koi_period']),
-            'radius': float(row['koi_prad']),
-            'temperature': float(row['koi_teq']),
-            'star_temp': float(row['koi_steff']) if pd.notna(row['koi_steff']) else 5778,
-            'star_radius': float(row['koi_srad']) if pd.notna(row['koi_srad']) else 1.0,
-            'ra': float(row['ra']),
-            'dec': float(row['dec']),
-            'habitability_score': row['habitability_score']
-        }
-        exoplanets.append(exoplanet)
-
-    return exoplanets
+    return build_visualization_table(df, zones)
 
 
 
 # ---------------- Startup loader ----------------
 @app.on_event("startup")
 def load_models_and_data():
-    global ml_model, scaler, label_encoder, feature_names, exoplanet_data
+    global ml_model, scaler, label_encoder, feature_names, exoplanet_data, catalog_stats, habitable_zones, scene_buffers, sky_index, system_index, octree_tiles
+    global name_index, facet_engine, transit_ephemeris, light_curves, monte_carlo, catalog_relative_errors, tree_explainer
+    global counterfactual_search, catalog_predictions, triage_queue, sky_density
+    global model_version, dataset_version
     try:
-        ml_model = joblib.load('../ml/exoplanet_model_best.joblib')
-        scaler = joblib.load('../ml/scaler.joblib')
-        label_encoder = joblib.load('../ml/label_encoder.joblib')
-
-        feature_names = [
-            'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_teq',
-            'koi_insol', 'koi_model_snr', 'koi_steff', 'koi_slogg', 'koi_srad',
-            'koi_smass', 'koi_kepmag', 'koi_fpflag_nt', 'koi_fpflag_ss',
-            'koi_fpflag_co', 'koi_fpflag_ec', 'ra', 'dec', 'habitable_zone', 'koi_score'
-        ]
+        # Model bundle is shared with any other module in the process that uses RESOURCES
+        models = RESOURCES.get('models')
+        ml_model, scaler, label_encoder = models.model, models.scaler, models.label_encoder
+        # Scaler and label encoder change predictions as much as the booster does
+        model_version = files_version(models.paths())
+        monte_carlo = MonteCarloClassifier(ml_model, scaler, label_encoder.classes_)
+
+        feature_names = FEATURE_NAMES
 
-        df = pd.read_csv('../data/cumulative_2025.09.16_22.42.55.csv')
-        exoplanet_data = prepare_visualization_data(df)
+        df = pd.read_csv(DATA_PATH)
+        dataset_version = file_version(DATA_PATH)
+        habitable_zones = HabitableZoneCache.from_catalog(df)
+        exoplanet_data = prepare_visualization_data(df, habitable_zones)
+        # Aggregates stored by snapshot_ingest (or a previous start) for this dataset version
+        catalog_stats = CatalogStats.load(CACHE_DIR, dataset_version)
+        if catalog_stats is None:
+            catalog_stats = CatalogStats.from_table(exoplanet_data)
+            try:
+                catalog_stats.save(CACHE_DIR, dataset_version)
+            except OSError as e:
+                print(f"⚠️ Could not store catalog stats: {e}")
+        scene_buffers = SceneBuffers(exoplanet_data)
+        sky_index = SkyIndex(exoplanet_data['ra'], exoplanet_data['dec'])
+        system_index = SystemIndex(exoplanet_data)
+        name_index = NameIndex(exoplanet_data['kepoi_name'], exoplanet_data['kepler_name'], exoplanet_data['kepid'])
+        facet_engine = FacetEngine(exoplanet_data)
+        transit_ephemeris = TransitEphemeris(df)
+        light_curves = LightCurveModel(df)
+        catalog_relative_errors = relative_errors(df)
+        counterfactual_search = CounterfactualSearch(ml_model, scaler, label_encoder.classes_,
+                                                     feature_scales=robust_scales(df))
 
         print("✅ Models and data loaded successfully")
 
@@ -176,6 +228,62 @@ def load_models_and_data():
         print(f"⚠️ Error loading models or data: {e}")
         ml_model = None
         exoplanet_data = None
+        catalog_stats = None
+        habitable_zones = None
+        scene_buffers = None
+        sky_index = None
+        system_index = None
+        name_index = None
+        facet_engine = None
+        transit_ephemeris = None
+        light_curves = None
+        monte_carlo = None
+        catalog_relative_errors = None
+        counterfactual_search = None
+        model_version = None
+        dataset_version = None
+        return
+
+    # Derived on-disk caches are optional; the core API works without them
+    try:
+        octree_tiles = OctreeTiles.load_or_build(scene_buffers, CACHE_DIR, dataset_version)
+        print(f"✅ Octree tiles ready: {len(octree_tiles.manifest['nodes'])} nodes")
+    except Exception as e:
+        print(f"⚠️ Could not build octree tiles: {e}")
+        octree_tiles = None
+    
+    try:
+        sky_density = SkyDensityTiles.load_or_build(df, CACHE_DIR, dataset_version)
+        print(f"✅ Sky density tiles ready: zoom 0-{sky_density.manifest['max_zoom']}")
+    except Exception as e:
+        print(f"⚠️ Could not build sky density tiles: {e}")
+        sky_density = None
+    
+    try:
+        catalog_predictions = CatalogPredictions.load_or_build(
+            df, ml_model, scaler, label_encoder.classes_, CACHE_DIR, f"{dataset_version}-{model_version}"
+        )
+        print(f"✅ Catalog predictions ready: {len(catalog_predictions)} KOIs")
+    except Exception as e:
+        print(f"⚠️ Could not build catalog predictions: {e}")
+        catalog_predictions = None
+    
+    try:
+        triage_queue = TriageQueue.load_or_build(
+            df, ml_model, scaler, label_encoder.classes_, CACHE_DIR, model_version, dataset_version
+        )
+        print(f"✅ Triage queue ready: {len(triage_queue)} candidates ({triage_queue.rescored} re-scored)")
+    except Exception as e:
+        print(f"⚠️ Could not build triage queue: {e}")
+        triage_queue = None
+    
+    try:
+        tree_explainer = TreeExplainer(ml_model.get_booster(), FEATURE_NAMES, label_encoder.classes_)
+        explanation_cache.clear()
+        print(f"✅ SHAP path tables ready: {tree_explainer.nbytes / 1e6:.1f} MB")
+    except Exception as e:
+        print(f"⚠️ Could not build SHAP path tables: {e}")
+        tree_explainer = None
 
 @app.get("/")
 async def root():
@@ -186,39 +294,44 @@ async def root():
         "models_loaded": ml_model is not None
     }
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict_exoplanet(planet_data: PlanetInput):
-    """Predict exoplanet classification"""
+def input_errors(planet_data: PlanetInput, input_data: np.ndarray):
+    """(plus, minus) error rows from the request, or catalog-median relative errors when absent"""
+    plus = np.zeros((1, len(UNCERTAIN_FEATURES)), dtype=np.float32)
+    minus = np.zeros_like(plus)
+    if planet_data.errors:
+        for j, name in enumerate(UNCERTAIN_FEATURES):
+            bounds = planet_data.errors.get(name)
+            if bounds:
+                plus[0, j] = abs(bounds[0])
+                minus[0, j] = abs(bounds[-1])
+    elif catalog_relative_errors is not None:
+        values = np.abs(input_data[0, monte_carlo.columns])
+        plus[0], minus[0] = catalog_relative_errors[0] * values, catalog_relative_errors[1] * values
+    return plus, minus
+
+def check_batch_size(planets: List[PlanetInput]):
+    """413 for batches over MAX_BATCH_SIZE"""
+    if len(planets) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"batches are limited to {MAX_BATCH_SIZE} planets")
+
+@app.post("/predict", response_model=PredictionResponse, response_model_exclude_none=True)
+def predict_exoplanet(planet_data: PlanetInput, uncertainty: bool = False, samples: int = 1000):
+    """Predict exoplanet classification
+
+    With ?uncertainty=true, `samples` perturbed copies drawn from the error bars add class-probability intervals.
+    A plain def: FastAPI runs it in the threadpool, so Monte Carlo scoring never blocks the event loop.
+    """
     if ml_model is None:
         raise HTTPException(status_code=503, detail="ML model not loaded")
+    if not 10 <= samples <= MAX_UNCERTAINTY_SAMPLES:
+        raise HTTPException(status_code=400, detail=f"samples must be within [10, {MAX_UNCERTAINTY_SAMPLES}]")
     
     try:
         # Prepare input data
-        input_data = [
-            planet_data.koi_period,
-            planet_data.koi_duration,
-            planet_data.koi_depth,
-            planet_data.koi_prad,
-            planet_data.koi_teq,
-            planet_data.koi_insol,
-            planet_data.koi_model_snr,
-            planet_data.koi_steff,
-            planet_data.koi_slogg,
-            planet_data.koi_srad,
-            planet_data.koi_smass or 1.0,
-            planet_data.koi_kepmag,
-            planet_data.koi_fpflag_nt,
-            planet_data.koi_fpflag_ss,
-            planet_data.koi_fpflag_co,
-            planet_data.koi_fpflag_ec,
-            planet_data.ra,
-            planet_data.dec,
-            1 if 0.25 <= planet_data.koi_insol <= 1.5 else 0,  # habitable_zone
-            planet_data.koi_score or 0.5
-        ]
+        input_data = FEATURE_ENCODER.encode(planet_data)
         
         # Scale input data
-        input_scaled = scaler.transform([input_data])
+        input_scaled = scaler.transform(input_data)
         
         # Make prediction
         prediction = ml_model.predict(input_scaled)[0]
@@ -235,124 +348,492 @@ async def predict_exoplanet(planet_data: PlanetInput):
         # Calculate confidence (highest probability)
         confidence = float(max(probabilities))
         
-        # Calculate habitability score
-        habitability_score = 0.0
-        if 273 <= planet_data.koi_teq <= 373:
-            habitability_score += 40
-        if 0.8 <= planet_data.koi_prad <= 1.5:
-            habitability_score += 30
-        if 0.25 <= planet_data.koi_insol <= 1.5:
-            habitability_score += 30
-        
-        # Determine planet type
-        if planet_data.koi_prad < 0.8:
-            planet_type = "Sub-Earth"
-        elif planet_data.koi_prad <= 1.25:
-            planet_type = "Earth-like"
-        elif planet_data.koi_prad <= 2.0:
-            planet_type = "Super-Earth"
-        elif planet_data.koi_prad <= 4.0:
-            planet_type = "Mini-Neptune"
-        else:
-            planet_type = "Giant"
+        # Habitability, planet type and star type
+        rules = classify_planet(planet_data)
         
-        # Determine star type
-        if planet_data.koi_steff < 3700:
-            star_type = "M-dwarf"
-        elif planet_data.koi_steff < 5200:
-            star_type = "K-dwarf"
-        elif planet_data.koi_steff < 6000:
-            star_type = "G-dwarf"
-        elif planet_data.koi_steff < 7500:
-            star_type = "F-dwarf"
-        else:
-            star_type = "A-dwarf"
+        # Optional Monte Carlo intervals, one batched predict_proba over all samples
+        uncertainty_block = None
+        if uncertainty:
+            plus, minus = input_errors(planet_data, input_data)
+            intervals = monte_carlo.intervals(input_data, plus, minus, samples)
+            uncertainty_block = monte_carlo.summary(intervals, 0, samples)
         
         return PredictionResponse(
             prediction=prediction_str,
             probabilities=prob_dict,
             confidence=confidence,
-            habitability_score=habitability_score,
-            planet_type=planet_type,
-            star_type=star_type
+            habitability_score=rules['habitability_score'],
+            planet_type=rules['planet_type'],
+            star_type=rules['star_type'],
+            uncertainty=uncertainty_block
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+@app.post("/predict/batch")
+def predict_batch(planets: List[PlanetInput], request: Request, format: Optional[str] = None):
+    """Predict classifications for many planets with a single model call
+
+    Row JSON by default; column JSON, MessagePack or Arrow via the Accept header or ?format=
+    """
+    if ml_model is None:
+        raise HTTPException(status_code=503, detail="ML model not loaded")
+    check_batch_size(planets)
+    
+    media_type = negotiate(request, format)
+    
+    try:
+        input_data = FEATURE_ENCODER.encode_records(planets)
+        probabilities = (
+            ml_model.predict_proba(scaler.transform(input_data)) if planets
+            else np.empty((0, len(label_encoder.classes_)))
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+    
+    classes = [str(c) for c in label_encoder.classes_]
+    best = probabilities.argmax(axis=1)
+    rules = classify_batch(FEATURE_ENCODER.as_columns(input_data))
+    
+    columns = {"prediction": np.array(classes, dtype=object)[best]}
+    columns.update({f"probability_{name}": probabilities[:, i] for i, name in enumerate(classes)})
+    columns["confidence"] = probabilities[np.arange(len(best)), best]
+    columns.update(rules)
+    results = PlanetTable(columns)
+    
+    # Classic row shape keeps probabilities nested per prediction
+    records = None
+    if media_type == JSON:
+        records = [
+            {
+                "prediction": classes[best[i]],
+                "probabilities": dict(zip(classes, row.tolist())),
+                "confidence": float(row[best[i]]),
+                "habitability_score": float(rules['habitability_score'][i]),
+                "planet_type": rules['planet_type'][i],
+                "star_type": rules['star_type'][i]
+            }
+            for i, row in enumerate(probabilities)
+        ]
+    
+    return render_table(media_type, results, "predictions", {"total": len(results)}, records=records)
+
+@app.post("/predict/sweep")
+def predict_sweep(request: SweepRequest):
+    """What-if response surface: class probabilities over a 1D or 2D grid of input features"""
+    if ml_model is None:
+        raise HTTPException(status_code=503, detail="ML model not loaded")
+    
+    axes = [SweepAxis(axis.feature, axis.start, axis.stop, axis.steps) for axis in request.axes]
+    try:
+        validate_axes(axes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Slider drags repeat the same (base vector, axes); keep the encoded body
+    base = FEATURE_ENCODER.encode(request.planet)[0]
+    key = (feature_hash(base, model_version), tuple(axes))
+    body = sweep_cache.get(key)
+    if body is None:
+        try:
+            body = dumps(sweep(ml_model, scaler, label_encoder.classes_, base, axes))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Sweep error: {str(e)}")
+        sweep_cache.put(key, body)
+    return Response(content=body, media_type=JSON)
+
+@app.post("/predict/counterfactual")
+def predict_counterfactual(request: CounterfactualRequest):
+    """Smallest input change (robust-scaled L2) that makes the model predict `target`"""
+    if counterfactual_search is None:
+        raise HTTPException(status_code=503, detail="ML model not loaded")
+    if request.target not in counterfactual_search.classes:
+        raise HTTPException(status_code=400, detail=f"target must be one of {counterfactual_search.classes}")
+    unknown = [name for name in request.features or [] if name not in FEATURE_ENCODER.input_names]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown input features: {unknown}")
+    if not 10 <= request.budget_ms <= MAX_COUNTERFACTUAL_BUDGET_MS:
+        raise HTTPException(status_code=400, detail=f"budget_ms must be within [10, {MAX_COUNTERFACTUAL_BUDGET_MS}]")
+    
+    try:
+        base = FEATURE_ENCODER.encode(request.planet)[0]
+        return counterfactual_search.search(base, request.target, request.features, request.budget_ms)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Counterfactual error: {str(e)}")
+
+def explain_planets(planets: List[PlanetInput]) -> List[Dict[str, Any]]:
+    """Explanations for encoded planets, computing only the feature vectors not cached yet"""
+    input_data = FEATURE_ENCODER.encode_records(planets)
+    keys = [feature_hash(row, model_version) for row in input_data]
+    entries = [explanation_cache.get(key) for key in keys]
+    
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    if missing:
+        input_scaled = scaler.transform(input_data[missing])
+        probabilities = ml_model.predict_proba(input_scaled)
+        contributions = tree_explainer.shap_values(input_scaled)
+        for j, i in enumerate(missing):
+            entries[i] = (probabilities[j], contributions[j])
+            explanation_cache.put(keys[i], entries[i])
+    
+    return [explanation(tree_explainer, input_data[i], *entry) for i, entry in enumerate(entries)]
+
+@app.post("/explain")
+def explain_prediction(planet_data: PlanetInput):
+    """Per-feature SHAP contributions (log-odds per class) behind one prediction"""
+    if ml_model is None or tree_explainer is None:
+        raise HTTPException(status_code=503, detail="Explanations not available")
+    
+    try:
+        return explain_planets([planet_data])[0]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Explanation error: {str(e)}")
+
+@app.post("/explain/batch")
+def explain_batch(planets: List[PlanetInput]):
+    """SHAP explanations for many planets, computed in one vectorized pass"""
+    if ml_model is None or tree_explainer is None:
+        raise HTTPException(status_code=503, detail="Explanations not available")
+    check_batch_size(planets)
+    
+    try:
+        explanations = explain_planets(planets)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Explanation error: {str(e)}")
+    return {"explanations": explanations, "total": len(explanations)}
+
+def catalog_mask(disposition: Optional[str], min_habitability: Optional[float], multi_planet: bool) -> np.ndarray:
+    """Row mask shared by the catalog endpoints so their row orders always agree"""
+    mask = exoplanet_data.mask(disposition=disposition, min_habitability=min_habitability)
+    if multi_planet:
+        mask &= system_index.multi_planet_mask()
+    return mask
+
+@app.get("/search")
+async def search_names(q: str, limit: int = 10):
+    """Autocomplete over KOI names, Kepler names and kepids: prefix matches first, then fuzzy ones"""
+    if name_index is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit must be within [1, {MAX_SEARCH_RESULTS}]")
+    
+    results = search_results(name_index, exoplanet_data, q, limit)
+    return {"query": q, "results": results, "total": len(results)}
+
+@app.get("/triage")
+async def get_triage(sort: str = "entropy", page: int = 1, page_size: int = 50):
+    """CANDIDATE KOIs ranked for review (entropy, margin, confirmed or habitability), paginated"""
+    if triage_queue is None:
+        raise HTTPException(status_code=503, detail="Triage queue not available")
+    if sort not in CRITERIA:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {list(CRITERIA)}")
+    if page < 1 or not 1 <= page_size <= MAX_TRIAGE_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"page must be >= 1 and page_size within [1, {MAX_TRIAGE_PAGE_SIZE}]")
+    
+    ranked = triage_queue.ranked(sort)
+    return {
+        "sort": sort,
+        "description": CRITERIA[sort][0],
+        "version": triage_queue.version,
+        "candidates": len(triage_queue),
+        "ranked": ranked,
+        "page": page,
+        "page_size": page_size,
+        "pages": -(-ranked // page_size),
+        "items": triage_queue.page(sort, page, page_size)
+    }
+
+@app.get("/koi/{kepoi_name}")
+async def get_koi(kepoi_name: str):
+    """Precomputed prediction, rule labels and nearest named analogue for a catalog KOI"""
+    if catalog_predictions is None:
+        raise HTTPException(status_code=503, detail="Catalog predictions not available")
+    
+    record = catalog_predictions.lookup(kepoi_name)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown KOI {kepoi_name}")
+    return record
+
 @app.get("/exoplanets")
 async def get_exoplanets(
+    request: Request,
     limit: int = 1000,
     disposition: Optional[str] = None,
-    min_habitability: Optional[float] = None
+    min_habitability: Optional[float] = None,
+    multi_planet: bool = False,
+    format: Optional[str] = None
 ):
-    """Get exoplanet data for visualization"""
+    """Get exoplanet data for visualization
+
+    Row JSON by default; column JSON, MessagePack or Arrow via the Accept header or ?format=
+    """
     if exoplanet_data is None:
         raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
     
-    filtered_data = exoplanet_data.copy()
+    media_type = negotiate(request, format)
     
-    # Filter by disposition
-    if disposition:
-        filtered_data = [p for p in filtered_data if p['disposition'] == disposition]
+    # Filter by disposition / minimum habitability score / system size, then limit results
+    mask = catalog_mask(disposition, min_habitability, multi_planet)
+    filtered_data = exoplanet_data.take(np.flatnonzero(mask)[:limit])
+    
+    return render_table(media_type, filtered_data, "exoplanets", {
+        "total": len(filtered_data),
+        "filters": {
+            "disposition": disposition,
+            "min_habitability": min_habitability,
+            "multi_planet": multi_planet,
+            "limit": limit
+        }
+    })
+
+@app.get("/exoplanets/cone")
+async def get_exoplanets_in_cone(
+    request: Request,
+    ra: float,
+    dec: float,
+    radius: float = 1.0,
+    limit: int = 1000,
+    disposition: Optional[str] = None,
+    min_habitability: Optional[float] = None,
+    format: Optional[str] = None
+):
+    """Exoplanets within `radius` degrees of (ra, dec), nearest first, with a `separation` column"""
+    if sky_index is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    if not -90.0 <= dec <= 90.0 or not 0.0 < radius <= 180.0:
+        raise HTTPException(status_code=400, detail="dec must be within [-90, 90] and radius within (0, 180] degrees")
     
-    # Filter by minimum habitability score
-    if min_habitability is not None:
-        filtered_data = [p for p in filtered_data if p['habitability_score'] >= min_habitability]
+    media_type = negotiate(request, format)
     
-    # Limit results
-    filtered_data = filtered_data[:limit]
+    rows, separation = sky_index.query(ra, dec, radius)
+    matches = exoplanet_data.take(rows)
+    keep = np.flatnonzero(matches.mask(disposition=disposition, min_habitability=min_habitability))[:limit]
+    results = matches.take(keep)
+    results.columns["separation"] = separation[keep]
     
-    return {
-        "exoplanets": filtered_data,
-        "total": len(filtered_data),
+    return render_table(media_type, results, "exoplanets", {
+        "total": len(results),
+        "cone": {"ra": ra, "dec": dec, "radius": radius},
         "filters": {
             "disposition": disposition,
             "min_habitability": min_habitability,
             "limit": limit
         }
+    })
+
+@app.get("/facets")
+async def get_facets(
+    disposition: Optional[str] = None,
+    min_habitability: Optional[float] = None,
+    multi_planet: bool = False,
+    period: Optional[str] = None,
+    radius: Optional[str] = None,
+    temperature: Optional[str] = None,
+    star_temp: Optional[str] = None
+):
+    """Histograms of period, radius, temperature and star_temp under the given filters
+
+    Facet ranges are 'low,high' (either side may be empty); each facet's counts ignore its own range.
+    """
+    if facet_engine is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    
+    try:
+        ranges = {
+            name: parse_range(value)
+            for name, value in (("period", period), ("radius", radius), ("temperature", temperature), ("star_temp", star_temp))
+            if value is not None
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    result = facet_engine.histograms(ranges, catalog_mask(disposition, min_habitability, multi_planet))
+    result["filters"] = {
+        "disposition": disposition,
+        "min_habitability": min_habitability,
+        "multi_planet": multi_planet
     }
+    return result
 
-@app.get("/stats")
-async def get_statistics():
-    """Get dataset statistics"""
-    if exoplanet_data is None:
+@app.get("/exoplanets/scene")
+async def get_exoplanet_scene(
+    limit: int = 100000,
+    disposition: Optional[str] = None,
+    min_habitability: Optional[float] = None,
+    multi_planet: bool = False
+):
+    """Packed Float32/Uint8 positions, radii and colours for the 3D scene (layout in scene_buffers)"""
+    if scene_buffers is None:
         raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
     
-    total = len(exoplanet_data)
-    confirmed = len([p for p in exoplanet_data if p['disposition'] == 'CONFIRMED'])
-    candidates = len([p for p in exoplanet_data if p['disposition'] == 'CANDIDATE'])
-    habitable = len([p for p in exoplanet_data if p['habitability_score'] >= 70])
+    mask = catalog_mask(disposition, min_habitability, multi_planet)
+    rows = np.flatnonzero(mask)[:limit]
     
-    # Calculate average values
-    avg_radius = np.mean([p['radius'] for p in exoplanet_data])
-    avg_temp = np.mean([p['temperature'] for p in exoplanet_data])
-    avg_period = np.mean([p['period'] for p in exoplanet_data])
+    return Response(
+        content=scene_buffers.pack(rows),
+        media_type="application/octet-stream",
+        headers={"X-Planet-Count": str(len(rows))}
+    )
+
+@app.get("/systems")
+async def get_systems(min_planets: int = 2, limit: int = 1000):
+    """Planetary systems (grouped by kepid) with at least `min_planets` planets, largest first"""
+    if system_index is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
     
+    systems = system_index.summaries(min_planets=min_planets, limit=limit)
     return {
-        "total_exoplanets": total,
-        "confirmed": confirmed,
-        "candidates": candidates,
-        "potentially_habitable": habitable,
-        "averages": {
-            "radius": float(avg_radius),
-            "temperature": float(avg_temp),
-            "period": float(avg_period)
-        },
-        "habitability_distribution": {
-            "high": len([p for p in exoplanet_data if p['habitability_score'] >= 70]),
-            "medium": len([p for p in exoplanet_data if 40 <= p['habitability_score'] < 70]),
-            "low": len([p for p in exoplanet_data if p['habitability_score'] < 40])
+        "systems": systems,
+        "total": len(systems),
+        "filters": {"min_planets": min_planets, "limit": limit}
+    }
+
+@app.get("/systems/{kepid}")
+async def get_system(kepid: int):
+    """One host star with all of its planets, ordered by orbital period"""
+    if system_index is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    
+    system = system_index.system(kepid)
+    if system is None:
+        raise HTTPException(status_code=404, detail=f"Unknown kepid {kepid}")
+    system["habitable_zone"] = habitable_zones.lookup(kepid)
+    return system
+
+@app.get("/transits")
+async def get_transits(
+    request: Request,
+    start: Optional[float] = None,
+    days: float = 30.0,
+    limit: int = 1000,
+    disposition: Optional[str] = None,
+    format: Optional[str] = None
+):
+    """Upcoming transits sorted by mid-time (BJD; `start` defaults to now) with propagated timing errors"""
+    if transit_ephemeris is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    if not 0.0 < days <= MAX_TRANSIT_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be within (0, {MAX_TRANSIT_WINDOW_DAYS:g}]")
+    
+    media_type = negotiate(request, format)
+    
+    start = current_bjd() if start is None else start
+    transits = transit_ephemeris.transits(start, start + days, limit=max(limit, 0), disposition=disposition)
+    
+    return render_table(media_type, transits, "transits", {
+        "total": len(transits),
+        "window": {"start": start, "end": start + days},
+        "filters": {"disposition": disposition, "limit": limit}
+    })
+
+@app.get("/lightcurves")
+async def get_light_curves(
+    kepid: Optional[int] = None,
+    koi: Optional[str] = None,
+    disposition: Optional[str] = None,
+    limit: int = 100,
+    points: int = 200,
+    window: float = 1.0
+):
+    """Float32 trapezoid light curves (layout in light_curves) for KOI names, a system and/or a disposition
+
+    `koi` is a comma-separated list of kepoi_names, narrowed by `kepid` and `disposition` when given;
+    `window` is the half-span in transit durations.
+    The kepoi_names of the returned curves are in the body's name table. Not response-cached:
+    the body is streamed as it is computed.
+    """
+    if light_curves is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    if not 2 <= points <= MAX_LIGHT_CURVE_POINTS or not 0.0 < window <= 50.0 or not 0 <= limit <= MAX_LIGHT_CURVES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"points must be within [2, {MAX_LIGHT_CURVE_POINTS}], window within (0, 50] and limit within [0, {MAX_LIGHT_CURVES}]"
+        )
+    
+    names = [name.strip() for name in koi.split(",") if name.strip()] if koi else None
+    rows = light_curves.select(kepid=kepid, names=names, disposition=disposition, limit=limit)
+    
+    return StreamingResponse(
+        light_curves.iter_packed(rows, points, window),
+        media_type="application/octet-stream",
+        headers={
+            "X-Curve-Count": str(len(rows)),
+            "X-Points": str(points)
         }
+    )
+
+@app.get("/tiles")
+async def get_tile_manifest():
+    """Octree manifest: node bounds, counts and children for level-of-detail streaming"""
+    if octree_tiles is None:
+        raise HTTPException(status_code=503, detail="Octree tiles not available")
+    
+    return {
+        "tile_url": f"/tiles/{octree_tiles.version}/{{node_id}}",
+        **octree_tiles.manifest
+    }
+
+@app.get("/tiles/{version}/{node_id}")
+async def get_tile(version: str, node_id: str):
+    """Packed scene buffer (with row ids) for one octree node; immutable per dataset version"""
+    if octree_tiles is None:
+        raise HTTPException(status_code=503, detail="Octree tiles not available")
+    
+    tile = octree_tiles.tile(node_id) if version == octree_tiles.version else None
+    if tile is None:
+        raise HTTPException(status_code=404, detail=f"Tile {version}/{node_id} not found")
+    
+    return Response(
+        content=tile,
+        media_type="application/octet-stream",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+@app.get("/sky")
+async def get_sky_manifest():
+    """Sky density manifest: layers, zoom levels, occupied tiles and peak counts"""
+    if sky_density is None:
+        raise HTTPException(status_code=503, detail="Sky density tiles not available")
+    
+    return {
+        "tile_url": f"/sky/{sky_density.version}/{{layer}}/{{zoom}}/{{x}}/{{y}}",
+        **sky_density.manifest
     }
 
+@app.get("/sky/{version}/{layer}/{zoom}/{x}/{y}")
+async def get_sky_tile(request: Request, version: str, layer: str, zoom: int, x: int, y: int):
+    """uint16 KOI counts (tile_size^2, little-endian, north up) for one sky tile; immutable per dataset version"""
+    if sky_density is None:
+        raise HTTPException(status_code=503, detail="Sky density tiles not available")
+    
+    tile = sky_density.tile(layer, zoom, x, y) if version == sky_density.version else None
+    if tile is None:
+        raise HTTPException(status_code=404, detail=f"Sky tile {version}/{layer}/{zoom}/{x}/{y} not found")
+    
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        tile = gzip.decompress(tile)
+    return Response(content=tile, media_type="application/octet-stream", headers=headers)
+
+@app.get("/stats")
+async def get_statistics():
+    """Get dataset statistics"""
+    if catalog_stats is None:
+        raise HTTPException(status_code=503, detail="Exoplanet data not loaded")
+    
+    return catalog_stats.to_dict()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "models_loaded": ml_model is not None,
-        "data_loaded": exoplanet_data is not None
+        "data_loaded": exoplanet_data is not None,
+        "resources": RESOURCES.status()
     }
 
 if __name__ == "__main__":
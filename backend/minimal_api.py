@@ -5,9 +5,21 @@ Fixed version without OpenAPI schema issues
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import joblib
 import numpy as np
 
+from feature_schema import FEATURE_ENCODER
+from planet_rules import classify_planet
+from resources import RESOURCES
+
+# Display colour appended to the shared star type labels
+STAR_COLORS = {
+    "M-dwarf": "Red",
+    "K-dwarf": "Orange",
+    "G-dwarf": "Yellow",
+    "F-dwarf": "White",
+    "A-dwarf": "Blue-White"
+}
+
 app = FastAPI()
 
 app.add_middleware(
@@ -18,11 +30,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load models at startup
+# Load models at startup (shared with any other module in the process that uses RESOURCES)
 try:
-    ml_model = joblib.load('../ml/exoplanet_model_best.joblib')
-    scaler = joblib.load('../ml/scaler.joblib')
-    label_encoder = joblib.load('../ml/label_encoder.joblib')
+    ml_model, scaler, label_encoder, _ = RESOURCES.get('models')
     models_loaded = True
     print("✅ ML models loaded successfully")
 except Exception as e:
@@ -96,31 +106,10 @@ async def predict(planet_data: dict):
     
     try:
         # Extract required features
-        input_data = [
-            planet_data.get('koi_period', 365.25),
-            planet_data.get('koi_duration', 6.0),
-            planet_data.get('koi_depth', 500.0),
-            planet_data.get('koi_prad', 1.0),
-            planet_data.get('koi_teq', 288.0),
-            planet_data.get('koi_insol', 1.0),
-            planet_data.get('koi_model_snr', 25.0),
-            planet_data.get('koi_steff', 5778.0),
-            planet_data.get('koi_slogg', 4.44),
-            planet_data.get('koi_srad', 1.0),
-            planet_data.get('koi_smass', 1.0),
-            planet_data.get('koi_kepmag', 12.0),
-            planet_data.get('koi_fpflag_nt', 0),
-            planet_data.get('koi_fpflag_ss', 0),
-            planet_data.get('koi_fpflag_co', 0),
-            planet_data.get('koi_fpflag_ec', 0),
-            planet_data.get('ra', 290.0),
-            planet_data.get('dec', 45.0),
-            1 if 0.25 <= planet_data.get('koi_insol', 1.0) <= 1.5 else 0,  # habitable_zone
-            planet_data.get('koi_score', 0.5)
-        ]
+        input_data = FEATURE_ENCODER.encode(planet_data)
         
         # Scale and predict
-        input_scaled = scaler.transform([input_data])
+        input_scaled = scaler.transform(input_data)
         prediction = ml_model.predict(input_scaled)[0]
         probabilities = ml_model.predict_proba(input_scaled)[0]
         
@@ -130,50 +119,16 @@ async def predict(planet_data: dict):
         for i, class_name in enumerate(label_encoder.classes_):
             prob_dict[class_name] = float(probabilities[i])
         
-        # Calculate habitability score
-        habitability = 0.0
-        koi_teq = planet_data.get('koi_teq', 288)
-        koi_prad = planet_data.get('koi_prad', 1.0)
-        koi_insol = planet_data.get('koi_insol', 1.0)
-        
-        if 273 <= koi_teq <= 373:  # Liquid water temperature
-            habitability += 40
-        if 0.8 <= koi_prad <= 1.5:  # Earth-like size
-            habitability += 30
-        if 0.25 <= koi_insol <= 1.5:  # Habitable zone
-            habitability += 30
-        
-        # Planet type classification
-        if koi_prad < 0.8:
-            planet_type = "Sub-Earth"
-        elif koi_prad <= 1.25:
-            planet_type = "Earth-like"
-        elif koi_prad <= 2.0:
-            planet_type = "Super-Earth"
-        elif koi_prad <= 4.0:
-            planet_type = "Mini-Neptune"
-        else:
-            planet_type = "Giant"
-        
-        # Star type classification
-        koi_steff = planet_data.get('koi_steff', 5778)
-        if koi_steff < 3700:
-            star_type = "M-dwarf (Red)"
-        elif koi_steff < 5200:
-            star_type = "K-dwarf (Orange)"
-        elif koi_steff < 6000:
-            star_type = "G-dwarf (Yellow)"
-        elif koi_steff < 7500:
-            star_type = "F-dwarf (White)"
-        else:
-            star_type = "A-dwarf (Blue-White)"
+        # Habitability, planet type and star type
+        rules = classify_planet(planet_data)
+        star_type = f"{rules['star_type']} ({STAR_COLORS[rules['star_type']]})"
         
         return {
             "prediction": prediction_str,
             "probabilities": prob_dict,
             "confidence": float(max(probabilities)),
-            "habitability_score": habitability,
-            "planet_type": planet_type,
+            "habitability_score": rules['habitability_score'],
+            "planet_type": rules['planet_type'],
             "star_type": star_type,
             "status": "ml_prediction",
             "model_accuracy": "92.16%"
@@ -0,0 +1,167 @@
+"""
+Name Search Index
+Autocomplete over kepoi_name, kepler_name and kepid: sorted-array prefix search plus trigram fuzzy matching
+
+Every name is normalized (lowercase, alphanumerics only, "koi" -> "k") into one or more keys.
+Prefix queries binary-search a sorted key array, so their cost follows the number of results.
+Typo-tolerant matches come from a CSR inverted index of padded character trigrams ranked by
+trigram similarity (shared / union). Candidates are gathered only from the query's rarest
+posting lists and then probed against the common ones ("kep", "epl", ...) by binary search,
+so the work follows the informative part of the query rather than the catalog size.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MIN_SIMILARITY = 0.3
+MAX_PREFIX_SCAN = 64
+MAX_KEYS_PER_ROW = 4
+STOP_GRAM_FRACTION = 0.02
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]')
+
+
+def normalize(text: str) -> str:
+    """Search key for a name or query: 'KOI-752.01' -> 'k75201', 'Kepler-22 b' -> 'kepler22b'"""
+    key = _NON_ALNUM.sub('', str(text).lower())
+    return 'k' + key[3:] if key.startswith('koi') else key
+
+
+def trigrams(key: str) -> List[str]:
+    """Distinct character trigrams of a key padded with start/end markers"""
+    padded = f'^{key}$'
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def _name_keys(kepoi_name: str) -> List[str]:
+    """KOI names are also indexed without their zero padding (K00752.01 -> k75201)"""
+    key = normalize(kepoi_name)
+    unpadded = 'k' + key[1:].lstrip('0')
+    return [key] if unpadded == key else [key, unpadded]
+
+
+class NameIndex:
+    """Prefix and fuzzy lookup of catalog rows by KOI name, Kepler name or kepid"""
+
+    FIELDS = ('kepoi_name', 'kepler_name', 'kepid')
+
+    def __init__(self, kepoi_name: Any, kepler_name: Any, kepid: Any):
+        keys, rows, fields = [], [], []
+        for row, (koi, kepler, star) in enumerate(zip(kepoi_name, kepler_name, kepid)):
+            named = [(key, 0) for key in _name_keys(koi)] + [(str(int(star)), 2)]
+            if kepler:
+                named.append((normalize(kepler), 1))
+            for key, field in named:
+                keys.append(key)
+                rows.append(row)
+                fields.append(field)
+
+        order = np.argsort(np.array(keys, dtype=str), kind='stable')
+        self.keys = np.array(keys, dtype=str)[order]
+        self.rows = np.array(rows, dtype=np.int64)[order]
+        self.fields = np.array(fields, dtype=np.int8)[order]
+        self.lengths = np.char.str_len(self.keys)
+
+        # Trigram postings in CSR form: key ids of trigram t are postings[offsets[t]:offsets[t + 1]]
+        vocabulary: Dict[str, int] = {}
+        posting_trigrams, posting_keys = [], []
+        self.trigram_counts = np.empty(len(self.keys), dtype=np.int32)
+        for i, key in enumerate(self.keys.tolist()):
+            grams = trigrams(key)
+            self.trigram_counts[i] = len(grams)
+            posting_trigrams.extend(vocabulary.setdefault(gram, len(vocabulary)) for gram in grams)
+            posting_keys.extend([i] * len(grams))
+        posting_trigrams = np.array(posting_trigrams, dtype=np.int64)
+        self.vocabulary = vocabulary
+        self.postings = np.array(posting_keys, dtype=np.int32)[np.argsort(posting_trigrams, kind='stable')]
+        self.offsets = np.r_[0, np.cumsum(np.bincount(posting_trigrams, minlength=len(vocabulary)))]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def prefix(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rows with a key starting with the query, shortest / lexicographically first keys first"""
+        key = normalize(query)
+        if not key:
+            return []
+        start = int(np.searchsorted(self.keys, key, side='left'))
+        stop = int(np.searchsorted(self.keys, key + '\U0010ffff', side='left'))
+        key_ids = np.arange(start, min(stop, start + MAX_PREFIX_SCAN * limit))
+        key_ids = key_ids[np.argsort(self.lengths[key_ids], kind='stable')]
+        return self._unique(key_ids, np.ones(len(key_ids)), limit)
+
+    def fuzzy(self, query: str, limit: int = 10, min_similarity: float = MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """Rows whose keys share enough trigrams with the query, most similar first"""
+        query_grams = trigrams(normalize(query))
+        if not query_grams:
+            return []
+        lists = sorted(
+            (self.postings[self.offsets[t]:self.offsets[t + 1]] if t is not None else self.postings[:0]
+             for t in (self.vocabulary.get(gram) for gram in query_grams)),
+            key=len
+        )
+        # A match shares at least ceil(min_similarity * |query|) trigrams, so it must appear in
+        # one of the rarest |query| - needed + 1 lists. Stop-grams (in more than STOP_GRAM_FRACTION
+        # of all keys, e.g. the "kepler" in every Kepler name) never generate candidates, they are
+        # only probed: a name matching on stop-grams alone is not a meaningful suggestion.
+        needed = max(1, int(np.ceil(min_similarity * len(query_grams))))
+        stop_length = STOP_GRAM_FRACTION * len(self.keys)
+        n_rare = len(lists) - needed + 1
+        while n_rare > 1 and len(lists[n_rare - 1]) > stop_length:
+            n_rare -= 1
+        candidates, shared = np.unique(np.concatenate(lists[:n_rare]), return_counts=True)
+        if not len(candidates):
+            return []
+        for postings in lists[n_rare:]:
+            if len(postings):
+                position = np.minimum(np.searchsorted(postings, candidates), len(postings) - 1)
+                shared += postings[position] == candidates
+
+        similarity = shared / (len(query_grams) + self.trigram_counts[candidates] - shared)
+        keep = similarity >= min_similarity
+        candidates, similarity = candidates[keep], similarity[keep]
+        # A row owns at most MAX_KEYS_PER_ROW keys, so the best limit rows are among these
+        top = limit * MAX_KEYS_PER_ROW
+        if len(candidates) > top:
+            cutoff = -np.partition(-similarity, top - 1)[top - 1]
+            best = similarity >= cutoff
+            candidates, similarity = candidates[best], similarity[best]
+        order = np.lexsort((candidates, -similarity))
+        return self._unique(candidates[order], similarity[order], limit)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Prefix matches first, topped up with fuzzy matches for typos"""
+        results = self.prefix(query, limit)
+        if len(results) < limit:
+            seen = {result['row'] for result in results}
+            results += [result for result in self.fuzzy(query, limit + len(results)) if result['row'] not in seen]
+        return results[:limit]
+
+    def _unique(self, key_ids: np.ndarray, scores: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+        """First (best) key per row, in the given order"""
+        rows = self.rows[key_ids]
+        _, first = np.unique(rows, return_index=True)
+        first = np.sort(first)[:limit]
+        return [
+            {
+                'row': int(rows[i]),
+                'matched': self.FIELDS[self.fields[key_ids[i]]],
+                'score': float(scores[i])
+            }
+            for i in first
+        ]
+
+
+def search_results(index: NameIndex, table: Any, query: str, limit: int = 10,
+                   fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """JSON-ready search hits joined with their catalog columns"""
+    fields = fields or ['kepoi_name', 'kepler_name', 'kepid', 'disposition']
+    results = []
+    for hit in index.search(query, limit):
+        record = {name: table[name][hit['row']] for name in fields}
+        record['kepid'] = int(record['kepid'])
+        record.update(matched=hit['matched'], score=hit['score'])
+        results.append(record)
+    return results
@@ -0,0 +1,130 @@
+"""
+Octree Level-of-Detail Tiles
+Spatial octree over the scene positions for coarse-to-fine streaming of the catalog
+
+Every node keeps up to `capacity` representative planets (a fixed random priority order,
+so coarse nodes are an unbiased subsample) and passes the rest down to its children.
+Drawing a node plus all of its ancestors therefore never duplicates a planet. Node ids are
+'r' followed by one octant digit (0-7) per level; tiles use the scene_buffers layout with
+row ids included. Tiles are written once per dataset version under the cache directory.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from scene_buffers import SceneBuffers
+
+NODE_ID_PATTERN = re.compile(r'^r[0-7]{0,20}$')
+MANIFEST_NAME = 'manifest.json'
+
+
+def _node_id(cell: np.ndarray, depth: int) -> str:
+    digits = []
+    for level in range(depth - 1, -1, -1):
+        bits = (cell >> level) & 1
+        digits.append(str(int(bits[0] | (bits[1] << 1) | (bits[2] << 2))))
+    return 'r' + ''.join(digits)
+
+
+class OctreeTiles:
+    """Manifest plus on-disk tile files for one dataset version"""
+
+    def __init__(self, manifest: Dict[str, Any], directory: str):
+        self.manifest = manifest
+        self.directory = directory
+
+    @property
+    def version(self) -> str:
+        return self.manifest['version']
+
+    @classmethod
+    def build(cls, buffers: SceneBuffers, directory: str, version: str,
+              capacity: int = 256, max_depth: int = 8, seed: int = 0) -> 'OctreeTiles':
+        """Partition all scene rows into octree nodes and write one tile per node"""
+        positions = buffers.positions.astype(np.float64)
+        n = len(positions)
+        low = positions.min(axis=0) if n else np.zeros(3)
+        size = float((positions.max(axis=0) - low).max()) if n else 1.0
+        size = size * (1 + 1e-9) if size > 0 else 1.0
+
+        cells_per_axis = 1 << max_depth
+        cells = np.clip(((positions - low) / size * cells_per_axis).astype(np.int64), 0, cells_per_axis - 1)
+
+        # Rows in priority order; stable sorts below keep that order inside every node
+        remaining = np.random.default_rng(seed).permutation(n)
+        nodes = {}
+        for depth in range(max_depth + 1):
+            if remaining.size == 0:
+                break
+            cell = cells[remaining] >> (max_depth - depth)
+            key = (cell[:, 0] << (2 * depth)) | (cell[:, 1] << depth) | cell[:, 2]
+            order = np.argsort(key, kind='stable')
+            sorted_key = key[order]
+            starts = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1]])
+            counts = np.diff(np.r_[starts, len(order)])
+            rank = np.arange(len(order)) - np.repeat(starts, counts)
+            taken = rank < capacity if depth < max_depth else np.ones(len(order), dtype=bool)
+
+            half_size = size / (1 << (depth + 1))
+            for start, count in zip(starts, counts):
+                node_cell = cell[order[start]]
+                rows = remaining[order[start:start + (count if depth == max_depth else min(count, capacity))]]
+                nodes[_node_id(node_cell, depth)] = {
+                    'depth': depth,
+                    'center': (low + (node_cell + 0.5) * (2 * half_size)).tolist(),
+                    'half_size': half_size,
+                    'count': int(len(rows)),
+                    'rows': rows,
+                }
+            remaining = remaining[order[~taken]]
+
+        for node_id, node in nodes.items():
+            node['children'] = [node_id + str(d) for d in range(8) if node_id + str(d) in nodes]
+            node['subtree_count'] = node['count']
+        for node_id in sorted(nodes, key=len, reverse=True):
+            if len(node_id) > 1:
+                nodes[node_id[:-1]]['subtree_count'] += nodes[node_id]['subtree_count']
+
+        os.makedirs(directory, exist_ok=True)
+        for node_id, node in nodes.items():
+            with open(os.path.join(directory, f'{node_id}.bin'), 'wb') as f:
+                f.write(buffers.pack(node.pop('rows'), include_row_ids=True))
+
+        manifest = {
+            'version': version,
+            'capacity': capacity,
+            'max_depth': max_depth,
+            'total': n,
+            'bounds': {'min': low.tolist(), 'size': size},
+            'nodes': nodes,
+        }
+        # Manifest last so an interrupted build is simply rebuilt next time
+        tmp_path = os.path.join(directory, MANIFEST_NAME + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+        return cls(manifest, directory)
+
+    @classmethod
+    def load_or_build(cls, buffers: SceneBuffers, cache_dir: str, version: str, **build_options) -> 'OctreeTiles':
+        """Reuse tiles already on disk for this dataset version, otherwise build them"""
+        directory = os.path.join(cache_dir, 'octree', version)
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == version and manifest.get('total') == len(buffers):
+                return cls(manifest, directory)
+        except (OSError, ValueError):
+            pass
+        return cls.build(buffers, directory, version, **build_options)
+
+    def tile(self, node_id: str) -> Optional[bytes]:
+        """Packed scene buffer for one node, or None for unknown ids"""
+        if not NODE_ID_PATTERN.match(node_id) or node_id not in self.manifest['nodes']:
+            return None
+        with open(os.path.join(self.directory, f'{node_id}.bin'), 'rb') as f:
+            return f.read()
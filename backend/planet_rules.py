@@ -0,0 +1,147 @@
+"""
+Planet Classification Rules
+Table-driven habitability scoring and planet/star type binning shared by every API
+"""
+
+import operator
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from feature_schema import FEATURE_DEFAULTS
+
+_COMPARATORS = {'<': (operator.lt, np.less), '<=': (operator.le, np.less_equal)}
+
+
+class TieredScore:
+    """Points per column; the first (low, high, points) tier containing the value wins"""
+
+    def __init__(self, rules: Tuple[Tuple[str, Tuple[Tuple[float, float, float], ...]], ...], cap: float = 100.0):
+        self.rules = rules
+        self.cap = cap
+        self.columns = tuple(column for column, _ in rules)
+
+    def score(self, values: Dict[str, float]) -> float:
+        total = 0.0
+        for column, tiers in self.rules:
+            value = values[column]
+            for low, high, points in tiers:
+                if low <= value <= high:
+                    total += points
+                    break
+        return min(total, self.cap)
+
+    def score_batch(self, columns: Any) -> np.ndarray:
+        total = None
+        for column, tiers in self.rules:
+            values = np.asarray(columns[column], dtype=np.float64)
+            conditions = [(values >= low) & (values <= high) for low, high, _ in tiers]
+            points = np.select(conditions, [p for _, _, p in tiers], default=0.0)
+            total = points if total is None else total + points
+        return np.minimum(total, self.cap).astype(np.float32)
+
+
+class ThresholdLadder:
+    """An if/elif ladder of (comparator, threshold, label) rows with a default label"""
+
+    def __init__(self, column: str, rows: Tuple[Tuple[str, float, str], ...], default: str):
+        self.column = column
+        self.rows = rows
+        self.default = default
+        self.labels = np.array([label for _, _, label in rows] + [default], dtype=object)
+
+    def classify(self, value: float) -> str:
+        for op, threshold, label in self.rows:
+            if _COMPARATORS[op][0](value, threshold):
+                return label
+        return self.default
+
+    def codes(self, values: Any) -> np.ndarray:
+        """Index into self.labels for every value; NaN falls through to the default like the scalar path"""
+        values = np.asarray(values, dtype=np.float64)
+        conditions = [_COMPARATORS[op][1](values, threshold) for op, threshold, _ in self.rows]
+        return np.select(conditions, np.arange(len(self.rows), dtype=np.int8), default=len(self.rows)).astype(np.int8)
+
+    def classify_batch(self, values: Any) -> np.ndarray:
+        return self.labels[self.codes(values)]
+
+
+HABITABILITY = TieredScore((
+    ('koi_teq', ((273, 373, 40), (200, 400, 20))),      # liquid water temperature
+    ('koi_prad', ((0.8, 1.5, 30), (0.5, 2.0, 15))),     # Earth-like size
+    ('koi_insol', ((0.25, 1.5, 30), (0.1, 4.0, 10))),   # habitable zone flux
+))
+
+PLANET_TYPES = ThresholdLadder('koi_prad', (
+    ('<', 0.8, 'Sub-Earth'),
+    ('<=', 1.25, 'Earth-like'),
+    ('<=', 2.0, 'Super-Earth'),
+    ('<=', 4.0, 'Mini-Neptune'),
+), default='Giant')
+
+STAR_TYPES = ThresholdLadder('koi_steff', (
+    ('<', 3700, 'M-dwarf'),
+    ('<', 5200, 'K-dwarf'),
+    ('<', 6000, 'G-dwarf'),
+    ('<', 7500, 'F-dwarf'),
+), default='A-dwarf')
+
+_RULE_COLUMNS = HABITABILITY.columns + (PLANET_TYPES.column, STAR_TYPES.column)
+
+
+def _planet_values(planet: Any) -> Dict[str, float]:
+    # Missing or None inputs fall back to the feature schema defaults
+    fields = planet if isinstance(planet, dict) else vars(planet)
+    values = {}
+    for column in _RULE_COLUMNS:
+        value = fields.get(column)
+        values[column] = FEATURE_DEFAULTS[column] if value is None else value
+    return values
+
+
+def classify_planet(planet: Any) -> Dict[str, Any]:
+    """Habitability score, planet type and star type for one dict or Pydantic model"""
+    values = _planet_values(planet)
+    return {
+        'habitability_score': HABITABILITY.score(values),
+        'planet_type': PLANET_TYPES.classify(values[PLANET_TYPES.column]),
+        'star_type': STAR_TYPES.classify(values[STAR_TYPES.column]),
+    }
+
+
+def classify_batch(columns: Any) -> Dict[str, np.ndarray]:
+    """Vectorized classify_planet over a DataFrame or mapping of equal-length columns"""
+    return {
+        'habitability_score': HABITABILITY.score_batch(columns),
+        'planet_type': PLANET_TYPES.classify_batch(columns[PLANET_TYPES.column]),
+        'star_type': STAR_TYPES.classify_batch(columns[STAR_TYPES.column]),
+    }
+
+
+UNKNOWN_TYPE = 'Unknown'
+
+
+def _catalog_column(columns: Any, name: str, n_rows: int) -> np.ndarray:
+    if name not in columns:
+        return np.full(n_rows, np.nan)
+    return np.asarray(columns[name], dtype=np.float64)
+
+
+def classify_catalog(columns: Any) -> Dict[str, np.ndarray]:
+    """classify_batch over raw catalog columns, keeping missing measurements missing
+
+    The model buffer fills NaN with the schema defaults (an Earth twin around a Sun twin), which
+    would rank every unmeasured KOI as a perfect habitability match. Here a row missing any
+    habitability input scores NaN, and a missing radius or stellar temperature gives UNKNOWN_TYPE.
+    """
+    n_rows = len(columns) if hasattr(columns, 'columns') else len(next(iter(columns.values()), ()))
+    values = {name: _catalog_column(columns, name, n_rows) for name in _RULE_COLUMNS}
+    rules = classify_batch(values)
+
+    score = rules['habitability_score'].astype(np.float32)
+    score[np.isnan(np.column_stack([values[name] for name in HABITABILITY.columns])).any(axis=1)] = np.nan
+    planet_type = rules['planet_type'].astype(object)
+    planet_type[np.isnan(values[PLANET_TYPES.column])] = UNKNOWN_TYPE
+    star_type = rules['star_type'].astype(object)
+    star_type[np.isnan(values[STAR_TYPES.column])] = UNKNOWN_TYPE
+    return {'habitability_score': score, 'planet_type': planet_type, 'star_type': star_type}
@@ -0,0 +1,88 @@
+"""
+Columnar Planet Table
+Column-oriented storage for the visualization catalog (name -> NumPy array)
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from habitable_zone import HabitableZoneCache, zone_labels
+from planet_rules import HABITABILITY
+
+
+class PlanetTable:
+    """Equal-length NumPy columns with cheap masking and row export"""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns must have equal length, got {sorted(lengths)}")
+        self.columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    def take(self, index: Any) -> 'PlanetTable':
+        """Rows selected by a boolean mask, an index array or a slice"""
+        return PlanetTable({name: values[index] for name, values in self.columns.items()})
+
+    def mask(self, disposition: Optional[str] = None, min_habitability: Optional[float] = None) -> np.ndarray:
+        """Boolean row mask for the standard catalog filters"""
+        keep = np.ones(len(self), dtype=bool)
+        if disposition:
+            keep &= self.columns['disposition'] == disposition
+        if min_habitability is not None:
+            keep &= self.columns['habitability_score'] >= min_habitability
+        return keep
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Row-oriented export (list of dicts) for the classic JSON shape"""
+        names = list(self.columns)
+        values = [column.tolist() for column in self.columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def build_visualization_table(df: pd.DataFrame, zones: Optional[HabitableZoneCache] = None) -> PlanetTable:
+    """CONFIRMED/CANDIDATE planets from the KOI table with the columns the visualizer uses"""
+    if zones is None:
+        zones = HabitableZoneCache.from_catalog(df)
+    viz_data = df[df['koi_disposition'].isin(['CONFIRMED', 'CANDIDATE'])]
+    viz_data = viz_data.dropna(subset=['koi_period', 'koi_prad', 'koi_teq', 'koi_steff'])
+
+    def column(name, fill=None):
+        values = viz_data[name]
+        if fill is not None:
+            values = values.fillna(fill)
+        return values.to_numpy(dtype=np.float64)
+
+    return PlanetTable({
+        'kepid': viz_data['kepid'].to_numpy(dtype=np.int64),
+        'kepoi_name': viz_data['kepoi_name'].to_numpy(dtype=object),
+        'kepler_name': viz_data['kepler_name'].astype(object).where(viz_data['kepler_name'].notna(), None).to_numpy(),
+        'disposition': viz_data['koi_disposition'].to_numpy(dtype=object),
+        'period': column('koi_period'),
+        'radius': column('koi_prad'),
+        'temperature': column('koi_teq'),
+        'star_temp': column('koi_steff', 5778),
+        'star_radius': column('koi_srad', 1.0),
+        'ra': column('ra'),
+        'dec': column('dec'),
+        'habitability_score': HABITABILITY.score_batch(viz_data),
+        'habitable_zone': zone_labels(zones.zones(viz_data['kepid'], viz_data['koi_insol']))
+    })
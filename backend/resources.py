@@ -0,0 +1,257 @@
+"""
+Lazy Resource Manager
+Named, single-flight resources (model bundle, dataset, indexes) shared by every API module and CLI
+
+Each resource is registered with a loader and the names of the resources it depends on; the
+first get() loads the dependencies in order, then the resource itself, under a per-resource
+lock, so concurrent first requests wait for one load instead of each parsing the CSV. Load
+time and approximate memory (deep size of arrays / DataFrames, serialized size for opaque
+objects such as the XGBoost model) are recorded per resource for /health. Failed loads are
+not cached: the error is recorded and the next get() tries again.
+
+RESOURCES is the process-wide manager with the standard resources registered:
+
+    models            ModelBundle (model, scaler, label encoder) from the first ML directory found
+    dataset           compact KOI table (compact_catalog), empty DataFrame when no CSV is found
+    similarity_index  named-planet SimilarityIndex over the dataset (None without enough columns)
+    scene             (PlanetTable, SceneBuffers) for the 3D scene, (None, None) without data
+"""
+
+import os
+import pickle
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent
+DATA_FILE = 'cumulative_2025.09.16_22.42.55.csv'
+MODEL_FILES = ('exoplanet_model_best.joblib', 'scaler.joblib', 'label_encoder.joblib')
+
+
+def deep_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Approximate resident bytes of NumPy/pandas-backed objects and containers of them"""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(getattr(value, 'nbytes', None), (int, np.integer)):
+        # ndarrays, and indexes that report their own storage (not views of other resources)
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(deep_size(v, seen) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(deep_size(v, seen) for v in value)
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return sum(deep_size(v, seen) for v in vars(value).values())
+    return sys.getsizeof(value)
+
+
+def serialized_size(value: Any) -> int:
+    """Pickled size, for objects whose memory lives outside Python (e.g. XGBoost boosters)"""
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class LazyResource:
+    """One registered resource and its load state"""
+
+    def __init__(self, name: str, loader: Callable[..., Any], depends: Sequence[str],
+                 measure: Callable[[Any], int]):
+        self.name = name
+        self.loader = loader
+        self.depends = tuple(depends)
+        self.measure = measure
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.value = None
+        self.load_seconds = None
+        self.nbytes = None
+        self.error = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "depends": list(self.depends),
+            "load_seconds": None if self.load_seconds is None else round(self.load_seconds, 3),
+            "bytes": self.nbytes,
+            "error": self.error,
+        }
+
+
+class ResourceManager:
+    """Registry of lazy resources with single-flight loading in dependency order"""
+
+    def __init__(self):
+        self.resources: Dict[str, LazyResource] = {}
+
+    def register(self, name: str, loader: Callable[..., Any], depends: Sequence[str] = (),
+                 measure: Callable[[Any], int] = deep_size):
+        """Add a resource; its loader is called with the loaded dependencies, in order"""
+        if name in self.resources:
+            raise ValueError(f"Resource already registered: {name}")
+        unknown = [dependency for dependency in depends if dependency not in self.resources]
+        if unknown:
+            # Dependencies must exist first, which also rules out cycles
+            raise ValueError(f"Resource {name} depends on unregistered {unknown}")
+        self.resources[name] = LazyResource(name, loader, depends, measure)
+
+    def get(self, name: str) -> Any:
+        """The loaded value, loading it (and its dependencies) on first use"""
+        resource = self.resources[name]
+        if resource.loaded:
+            return resource.value
+        dependencies = [self.get(dependency) for dependency in resource.depends]
+        with resource.lock:
+            if not resource.loaded:
+                started = time.perf_counter()
+                try:
+                    value = resource.loader(*dependencies)
+                except Exception as e:
+                    resource.error = f"{type(e).__name__}: {e}"
+                    raise
+                resource.load_seconds = time.perf_counter() - started
+                try:
+                    resource.nbytes = int(resource.measure(value))
+                except Exception:
+                    resource.nbytes = None
+                resource.value, resource.error, resource.loaded = value, None, True
+                print(f"✅ Resource {name} loaded in {resource.load_seconds:.2f}s")
+        return resource.value
+
+    def peek(self, name: str) -> Any:
+        """The value if already loaded, None otherwise (never triggers a load)"""
+        resource = self.resources[name]
+        return resource.value if resource.loaded else None
+
+    def reset(self, name: str):
+        """Drop a loaded value and everything that depends on it"""
+        for dependent in self.dependents(name):
+            resource = self.resources[dependent]
+            with resource.lock:
+                resource.loaded, resource.value, resource.nbytes, resource.load_seconds = False, None, None, None
+
+    def dependents(self, name: str) -> List[str]:
+        """`name` and every resource that transitively depends on it, in registration order"""
+        affected = {name}
+        for resource in self.resources.values():
+            if affected.intersection(resource.depends):
+                affected.add(resource.name)
+        return [resource for resource in self.resources if resource in affected]
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-resource load state, load time and memory for /health"""
+        return {name: resource.status() for name, resource in self.resources.items()}
+
+
+# ---------------- Standard resources ----------------
+
+class ModelBundle(NamedTuple):
+    model: Any
+    scaler: Any
+    label_encoder: Any
+    directory: str
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def paths(self) -> List[str]:
+        """The MODEL_FILES of this bundle; all of them feed the model version"""
+        return [self.path(name) for name in MODEL_FILES]
+
+
+def ml_directories() -> List[str]:
+    """Candidate ML directories, in probing order (EXOPLANET_ML_DIR first when set)"""
+    candidates = [str(BACKEND_DIR / 'ml'), os.path.join('/app', 'ml'), str(BACKEND_DIR.parent / 'ml')]
+    override = os.environ.get('EXOPLANET_ML_DIR')
+    return ([override] if override else []) + candidates
+
+
+def data_paths() -> List[str]:
+    """Candidate KOI CSV paths, in probing order (EXOPLANET_DATA_PATH first when set)"""
+    candidates = [
+        str(BACKEND_DIR.parent / 'data' / DATA_FILE),
+        str(BACKEND_DIR / 'data' / DATA_FILE),
+        os.path.join('/app', 'data', DATA_FILE),
+        os.path.join(os.getcwd(), 'data', DATA_FILE),
+        os.path.join(os.getcwd(), '..', 'data', DATA_FILE),
+    ]
+    override = os.environ.get('EXOPLANET_DATA_PATH')
+    return ([override] if override else []) + candidates
+
+
+def data_path() -> str:
+    """First existing KOI CSV of data_paths(), else the first candidate (so errors name a real option)"""
+    paths = data_paths()
+    return next((path for path in paths if os.path.exists(path)), paths[0])
+
+
+def load_model_bundle() -> ModelBundle:
+    import joblib
+
+    from feature_schema import FEATURE_ENCODER
+
+    tried = ml_directories()
+    directory = next((d for d in tried if os.path.exists(os.path.join(d, MODEL_FILES[0]))), None)
+    if directory is None:
+        raise FileNotFoundError("Could not find ML models directory. Tried: " + str(tried))
+
+    model, scaler, label_encoder = (joblib.load(os.path.join(directory, name)) for name in MODEL_FILES)
+    FEATURE_ENCODER.check_estimator(scaler)
+    # Older pickles of XGBClassifier carry a label encoder the current predict path must not use
+    if hasattr(model, 'use_label_encoder'):
+        model.use_label_encoder = False
+    for attribute in ('_le', 'le_'):
+        if hasattr(model, attribute):
+            setattr(model, attribute, None)
+    print(f"✅ ML models loaded from {directory}")
+    return ModelBundle(model, scaler, label_encoder, directory)
+
+
+def load_dataset() -> pd.DataFrame:
+    from compact_catalog import catalog_footprint, read_compact_catalog
+
+    for path in data_paths():
+        if os.path.exists(path):
+            data = read_compact_catalog(path)
+            footprint = catalog_footprint(data)
+            print(f"✅ Training data loaded from {path}: {footprint['rows']} rows, "
+                  f"{footprint['columns']} columns ({footprint['megabytes']:.1f} MB)")
+            return data
+    print("⚠️ Could not find training data, similarity matching is disabled")
+    return pd.DataFrame()
+
+
+def load_similarity_index(data: pd.DataFrame) -> Any:
+    from feature_schema import INPUT_FEATURES
+    from similarity_index import SimilarityIndex
+
+    columns = [col for col in INPUT_FEATURES if col in data.columns]
+    if data.empty or len(columns) < 10:  # Need at least 10 features
+        print(f"⚠️ Training data has only {len(columns)} feature columns, similarity matching is disabled")
+        return None
+    storage = os.environ.get('SIMILARITY_STORAGE', 'int8')
+    return SimilarityIndex.from_catalog(data, columns, quantized=storage == 'int8')
+
+
+def load_scene(data: pd.DataFrame) -> Any:
+    from planet_table import build_visualization_table
+    from scene_buffers import SceneBuffers
+
+    if data.empty:
+        return None, None
+    table = build_visualization_table(data)
+    return table, SceneBuffers(table)
+
+
+RESOURCES = ResourceManager()
+RESOURCES.register('models', load_model_bundle, measure=serialized_size)
+RESOURCES.register('dataset', load_dataset)
+RESOURCES.register('similarity_index', load_similarity_index, depends=('dataset',))
+RESOURCES.register('scene', load_scene, depends=('dataset',))
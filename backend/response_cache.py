@@ -0,0 +1,260 @@
+"""
+Response Cache Middleware
+ETag / If-None-Match handling and a bounded in-memory store of serialized bodies
+for read-only endpoints whose output only changes with the dataset or model
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+# Headers recomputed for every cached reply (an endpoint's own Cache-Control is kept separately)
+_DROPPED_HEADERS = {b'content-length', b'content-encoding', b'etag', b'cache-control', b'vary'}
+_DEFAULT_CACHE_CONTROL = b'public, max-age=0, must-revalidate'
+
+
+def file_version(path: str, length: int = 16) -> Optional[str]:
+    """Short content hash of a file, or None when it cannot be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()[:length]
+
+
+def files_version(paths: Iterable[str], length: int = 16) -> Optional[str]:
+    """Short hash over the content of several files (e.g. a model bundle), None when any is unreadable"""
+    versions = [file_version(path, length=64) for path in paths]
+    if not versions or None in versions:
+        return None
+    return hashlib.sha256(':'.join(versions).encode('ascii')).hexdigest()[:length]
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    gzip_body: Optional[bytes]
+    cache_control: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b'')
+
+
+class ResponseStore:
+    """LRU store bounded by entry count and total body bytes"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[CachedResponse]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old.size
+        self.entries[key] = entry
+        self.total_bytes += entry.size
+        while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+class LRUCache:
+    """Small in-process LRU for computed results (explanations, sweeps) keyed by input hash
+
+    Locked, since the endpoints using it run in the threadpool.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: Any):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip (honours q-values, so gzip;q=0 is a refusal)"""
+    allowed = {}
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            allowed[coding.strip().lower()] = quality
+    return allowed.get('gzip', allowed.get('*', 0.0)) > 0.0
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware answering If-None-Match with 304 and replaying cached bodies
+
+    `version()` returns a string identifying the current dataset/model state (None disables
+    caching). Requests are covered when their path is one of `paths` or starts with one of
+    `prefixes` (e.g. '/systems/' for /systems/{kepid}). ETags are derived from the version, the
+    path, the query string and the Accept header, so a 304 never requires running the endpoint;
+    the gzip variant gets its own "-gzip" ETag, as a strong validator must differ per content
+    coding. Bodies above `min_gzip_size` are stored with a precompressed gzip variant served to
+    clients that accept it (an endpoint that already answered with gzip provides that variant
+    itself); bodies above `threadpool_gzip_size` are (de)compressed in the threadpool so the
+    event loop keeps serving. An endpoint's own Cache-Control (e.g. immutable tiles) is kept.
+    """
+
+    def __init__(self, app, paths: Iterable[str], version: Callable[[], Optional[str]],
+                 store: Optional[ResponseStore] = None, min_gzip_size: int = 1024,
+                 threadpool_gzip_size: int = 64 * 1024, prefixes: Iterable[str] = ()):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.prefixes = tuple(prefixes)
+        self.version = version
+        self.store = store if store is not None else ResponseStore()
+        self.min_gzip_size = min_gzip_size
+        self.threadpool_gzip_size = threadpool_gzip_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET' or not self.covers(scope['path']):
+            await self.app(scope, receive, send)
+            return
+
+        version = self.version()
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = (version, scope['path'], scope['query_string'], headers.get('accept', ''))
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+        etags = {False: f'"{digest}"', True: f'"{digest}-gzip"'}
+        wants_gzip = accepts_gzip(headers.get('accept-encoding'))
+
+        # Both codings are current for this version; the gzip one only for clients accepting it
+        for use_gzip in ((False, True) if wants_gzip else (False,)):
+            if _etag_matches(headers.get('if-none-match'), etags[use_gzip]):
+                stored = self.store.entries.get(key)
+                await send({'type': 'http.response.start', 'status': 304,
+                            'headers': self._cache_headers(etags[use_gzip], stored)})
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+
+        entry = self.store.get(key)
+        cache_status = b'HIT'
+        if entry is None:
+            cache_status = b'MISS'
+            entry = await self._capture(scope, receive)
+            if entry.status != 200:
+                await self._send(send, entry, entry.body, [])
+                return
+            self.store.put(key, entry)
+
+        use_gzip = entry.gzip_body is not None and wants_gzip
+        extra = self._cache_headers(etags[use_gzip], entry) + [(b'x-cache', cache_status)]
+        if use_gzip:
+            extra.append((b'content-encoding', b'gzip'))
+        await self._send(send, entry, entry.gzip_body if use_gzip else entry.body, extra)
+
+    def covers(self, path: str) -> bool:
+        return path in self.paths or path.startswith(self.prefixes)
+
+    def _cache_headers(self, etag: str, entry: Optional[CachedResponse] = None) -> List[Tuple[bytes, bytes]]:
+        cache_control = entry.cache_control if entry is not None else None
+        return [
+            (b'etag', etag.encode('latin-1')),
+            (b'cache-control', cache_control or _DEFAULT_CACHE_CONTROL),
+            (b'vary', b'Accept, Accept-Encoding'),
+        ]
+
+    async def _run(self, function: Callable, body: bytes, **options) -> bytes:
+        if len(body) >= self.threadpool_gzip_size:
+            return await run_in_threadpool(function, body, **options)
+        return function(body, **options)
+
+    async def _capture(self, scope, receive) -> CachedResponse:
+        start = {}
+        chunks = []
+
+        async def capture_send(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, capture_send)
+        body = b''.join(chunks)
+        original = {k.lower(): v for k, v in start.get('headers', [])}
+        headers = [(k, v) for k, v in start.get('headers', []) if k.lower() not in _DROPPED_HEADERS]
+        gzip_body = None
+        if original.get(b'content-encoding', b'').strip().lower() == b'gzip':
+            # Precompressed by the endpoint (e.g. sky tiles): keep it as the gzip variant
+            gzip_body, body = body, await self._run(gzip.decompress, body)
+        elif len(body) >= self.min_gzip_size:
+            gzip_body = await self._run(gzip.compress, body, compresslevel=6)
+        return CachedResponse(start.get('status', 500), headers, body, gzip_body, original.get(b'cache-control'))
+
+    async def _send(self, send, entry: CachedResponse, body: bytes, extra: List[Tuple[bytes, bytes]]):
+        headers = entry.headers + extra + [(b'content-length', str(len(body)).encode('latin-1'))]
+        await send({'type': 'http.response.start', 'status': entry.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,144 @@
+"""
+Response Formats
+Content negotiation and serializers for catalog and batch endpoints
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+
+from planet_table import PlanetTable
+
+# Optional serializers - the API falls back to stdlib JSON when they are missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+JSON = 'application/json'
+COLUMNS_JSON = 'application/vnd.exoplanet.columns+json'
+MSGPACK = 'application/msgpack'
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+# ?format= values accepted in place of an Accept header
+FORMATS = {
+    'json': JSON,
+    'columns': COLUMNS_JSON,
+    'msgpack': MSGPACK,
+    'arrow': ARROW_STREAM,
+}
+
+_ACCEPT_TYPES = {
+    JSON: JSON,
+    COLUMNS_JSON: COLUMNS_JSON,
+    MSGPACK: MSGPACK,
+    'application/x-msgpack': MSGPACK,
+    ARROW_STREAM: ARROW_STREAM,
+    '*/*': JSON,
+    'application/*': JSON,
+}
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes, writing NumPy arrays without a Python list detour when orjson is available"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS, default=_default)
+    return json.dumps(content, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered through dumps()"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _from_accept(accept: str) -> str:
+    candidates = []
+    for position, part in enumerate(accept.split(',')):
+        media_type, _, params = part.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        candidates.append((-quality, position, media_type.strip().lower()))
+    for negative_quality, _, media_type in sorted(candidates):
+        if negative_quality < 0 and media_type in _ACCEPT_TYPES:
+            return _ACCEPT_TYPES[media_type]
+    return JSON
+
+
+def negotiate(request: Request, format: Optional[str] = None) -> str:
+    """Pick the response media type from ?format= or the Accept header"""
+    if format:
+        media_type = FORMATS.get(format.lower())
+        if media_type is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown format '{format}', expected one of: {', '.join(FORMATS)}"
+            )
+    else:
+        media_type = _from_accept(request.headers.get('accept', ''))
+
+    if media_type == MSGPACK and msgpack is None:
+        raise HTTPException(status_code=406, detail="MessagePack support (msgpack) is not installed")
+    if media_type == ARROW_STREAM and pa is None:
+        raise HTTPException(status_code=406, detail="Arrow support (pyarrow) is not installed")
+    return media_type
+
+
+def _arrow_stream(table: PlanetTable, meta: Dict[str, Any]) -> bytes:
+    batch = pa.RecordBatch.from_arrays(
+        [pa.array(table[name]) for name in table],
+        names=table.column_names,
+        metadata={'meta': dumps(meta)}
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def render_table(media_type: str, table: PlanetTable, key: str, meta: Dict[str, Any],
+                 records: Optional[List[Dict[str, Any]]] = None) -> Response:
+    """Render a table as row JSON ({key: [...], **meta}), column JSON, MessagePack or an Arrow IPC stream
+
+    The binary and columnar formats carry {"columns": {...}, **meta}; Arrow stores meta as JSON
+    in the schema metadata. `records` overrides the default row export for the JSON shape.
+    """
+    headers = {'Vary': 'Accept'}
+    if media_type == COLUMNS_JSON:
+        body = dumps({'columns': table.columns, **meta})
+    elif media_type == MSGPACK:
+        body = msgpack.packb({'columns': table.columns, **meta}, default=_default)
+    elif media_type == ARROW_STREAM:
+        body = _arrow_stream(table, meta)
+    else:
+        body = dumps({key: records if records is not None else table.to_records(), **meta})
+        media_type = JSON
+    return Response(content=body, media_type=media_type, headers=headers)
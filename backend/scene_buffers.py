@@ -0,0 +1,116 @@
+"""
+Scene Buffers for the 3D Visualizer
+Precomputed positions, radii and star colours packed as little-endian typed arrays
+
+Binary layout (n = planet count, every section 4-byte aligned):
+
+    offset 0        4 bytes   magic b'EXOS'
+    offset 4        uint32    format version (1)
+    offset 8        uint32    n
+    offset 12       uint32    flags (bit 0: row ids present)
+    offset 16       float32   positions  [n * 3]  x, y, z on the celestial sphere (y = north pole)
+    offset 16+12n   float32   radii      [n]      scaled display radius
+    offset 16+16n   uint8     colors     [n * 4]  RGBA from the host star temperature
+    offset 16+20n   uint8     habitability [n]    score 0-100
+    offset R        uint32    row ids    [n]      only with flag bit 0; R = 16+21n rounded up to 4
+
+A client wraps the body directly, e.g. new Float32Array(buffer, 16, n * 3).
+Rows follow the same order as /exoplanets with identical filters; row ids index
+the unfiltered /exoplanets order.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+from planet_table import PlanetTable
+
+MAGIC = b'EXOS'
+FORMAT_VERSION = 1
+HEADER_BYTES = 16
+FLAG_ROW_IDS = 1
+
+# Approximate blackbody colour (sRGB) by effective temperature, interpolated linearly
+STAR_COLOR_TABLE = (
+    (2000, (255, 137, 18)),
+    (3000, (255, 180, 107)),
+    (4000, (255, 209, 163)),
+    (5000, (255, 228, 206)),
+    (5778, (255, 242, 232)),
+    (6500, (255, 249, 253)),
+    (7500, (227, 233, 255)),
+    (10000, (204, 219, 255)),
+    (15000, (181, 205, 255)),
+)
+
+# Display radius = RADIUS_SCALE * log2(1 + R/R_earth), clipped so giants stay readable
+RADIUS_SCALE = 0.4
+RADIUS_RANGE = (0.15, 4.0)
+
+
+def sky_positions(ra_deg: np.ndarray, dec_deg: np.ndarray, sphere_radius: float = 100.0) -> np.ndarray:
+    """Cartesian (n, 3) float32 positions on a sphere, y pointing to the celestial north pole"""
+    ra = np.radians(np.asarray(ra_deg, dtype=np.float64))
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    cos_dec = np.cos(dec)
+    positions = np.empty((len(ra), 3), dtype='<f4')
+    positions[:, 0] = sphere_radius * cos_dec * np.cos(ra)
+    positions[:, 1] = sphere_radius * np.sin(dec)
+    positions[:, 2] = sphere_radius * cos_dec * np.sin(ra)
+    return positions
+
+
+def display_radii(planet_radius: np.ndarray) -> np.ndarray:
+    radius = np.nan_to_num(np.asarray(planet_radius, dtype=np.float64), nan=1.0)
+    scaled = RADIUS_SCALE * np.log2(1.0 + np.maximum(radius, 0.0))
+    return np.clip(scaled, *RADIUS_RANGE).astype('<f4')
+
+
+def star_colors(star_temp: np.ndarray) -> np.ndarray:
+    """(n, 4) uint8 RGBA interpolated from STAR_COLOR_TABLE"""
+    temps = np.nan_to_num(np.asarray(star_temp, dtype=np.float64), nan=5778.0)
+    anchors = np.array([t for t, _ in STAR_COLOR_TABLE], dtype=np.float64)
+    rgb = np.array([c for _, c in STAR_COLOR_TABLE], dtype=np.float64)
+    colors = np.empty((len(temps), 4), dtype=np.uint8)
+    for channel in range(3):
+        colors[:, channel] = np.rint(np.interp(temps, anchors, rgb[:, channel]))
+    colors[:, 3] = 255
+    return colors
+
+
+class SceneBuffers:
+    """Per-planet render attributes computed once per dataset load"""
+
+    def __init__(self, table: PlanetTable, sphere_radius: float = 100.0):
+        self.positions = sky_positions(table['ra'], table['dec'], sphere_radius)
+        self.radii = display_radii(table['radius'])
+        self.colors = star_colors(table['star_temp'])
+        habitability = np.nan_to_num(np.asarray(table['habitability_score'], dtype=np.float64))
+        self.habitability = np.clip(np.rint(habitability), 0, 100).astype(np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.radii)
+
+    def pack(self, index: Optional[Any] = None, include_row_ids: bool = False) -> bytes:
+        """Pack all rows (or the given row indices) into the binary layout above"""
+        rows = np.arange(len(self)) if index is None else np.asarray(index, dtype=np.intp)
+        n = len(rows)
+        row_ids_offset = (HEADER_BYTES + 21 * n + 3) & ~3
+        body = bytearray(row_ids_offset + 4 * n if include_row_ids else HEADER_BYTES + 21 * n)
+        header = np.frombuffer(body, dtype='<u4', count=4)
+        header[:] = (int.from_bytes(MAGIC, 'little'), FORMAT_VERSION, n, FLAG_ROW_IDS if include_row_ids else 0)
+
+        # Gather straight into views over the output buffer
+        offset = HEADER_BYTES
+        np.take(self.positions, rows, axis=0,
+                out=np.frombuffer(body, dtype='<f4', count=3 * n, offset=offset).reshape(n, 3))
+        offset += 12 * n
+        np.take(self.radii, rows, out=np.frombuffer(body, dtype='<f4', count=n, offset=offset))
+        offset += 4 * n
+        np.take(self.colors, rows, axis=0,
+                out=np.frombuffer(body, dtype=np.uint8, count=4 * n, offset=offset).reshape(n, 4))
+        offset += 4 * n
+        np.take(self.habitability, rows, out=np.frombuffer(body, dtype=np.uint8, count=n, offset=offset))
+        if include_row_ids:
+            np.frombuffer(body, dtype='<u4', count=n, offset=row_ids_offset)[:] = rows
+        return bytes(body)
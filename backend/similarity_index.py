@@ -0,0 +1,102 @@
+"""
+Planet Similarity Index
+Cosine nearest named planet over standardized features, stored as int8 with an exact re-rank
+
+Catalog rows are standardized (mean / std of the named planets, like the StandardScaler the
+matcher used to refit per request) and normalized to unit length once. In quantized mode every
+dimension is stored as symmetric int8 with one float scale per dimension (a quarter of the
+float32 matrix): a coarse pass scores all rows with int32 dot products in blocks, and the top
+`rerank` candidates are re-scored exactly from the source table's float32 columns, so the best
+match is the one the float path would return.
+"""
+
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RERANK = 32
+BLOCK_ROWS = 4096
+
+
+def _unit_rows(values: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(values, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return values / norms
+
+
+def symmetric_int8(values: np.ndarray, axis: Optional[int] = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """int8 codes and float32 scales with values ~= codes * scales (per column for axis=0)"""
+    peak = np.max(np.abs(values), axis=axis, keepdims=axis is not None, initial=0.0)
+    scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(values / scales), -127, 127).astype(np.int8)
+    return codes, scales if axis is None else scales.ravel()
+
+
+class SimilarityIndex:
+    """Nearest row by cosine similarity of standardized features (int8 or float32 storage)"""
+
+    def __init__(self, table: pd.DataFrame, rows: np.ndarray, columns: Sequence[str],
+                 quantized: bool = True, rerank: int = DEFAULT_RERANK):
+        # Column views of the source table for the exact re-rank (no copy for numeric dtypes)
+        self.source = [table[name].to_numpy() for name in columns]
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.columns = list(columns)
+        self.quantized = quantized
+        self.rerank = rerank
+
+        features = self._features(self.rows)
+        # A catalog without named planets gives an empty index rather than NaN statistics
+        self.mean = features.mean(axis=0) if len(features) else np.zeros(len(self.columns))
+        std = features.std(axis=0) if len(features) else np.ones(len(self.columns))
+        self.std = np.where(std > 0, std, 1.0)
+        unit = _unit_rows((features - self.mean) / self.std)
+        if quantized:
+            self.matrix, self.scales = symmetric_int8(unit, axis=0)
+        else:
+            self.matrix, self.scales = unit.astype(np.float32), None
+
+    @classmethod
+    def from_catalog(cls, df: pd.DataFrame, columns: Sequence[str], **options) -> 'SimilarityIndex':
+        """Index the rows of a KOI table that carry a Kepler name"""
+        names = df['kepler_name']
+        named = np.flatnonzero((names.notna() & (names.astype(object) != '')).to_numpy())
+        return cls(df, named, columns, **options)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.matrix.nbytes + (0 if self.scales is None else self.scales.nbytes) + self.rows.nbytes)
+
+    def _features(self, rows: np.ndarray) -> np.ndarray:
+        features = np.column_stack([values[rows] for values in self.source]).astype(np.float64)
+        return np.nan_to_num(features, nan=0.0)
+
+    def _coarse(self, query: np.ndarray) -> np.ndarray:
+        # Fold the per-dimension scales into the query, then quantize it with a single scale
+        codes, scale = symmetric_int8(query * self.scales, axis=None)
+        codes = codes.astype(np.int32)
+        scores = np.empty(len(self.matrix), dtype=np.float32)
+        for start in range(0, len(self.matrix), BLOCK_ROWS):
+            block = self.matrix[start:start + BLOCK_ROWS]
+            scores[start:start + len(block)] = (block.astype(np.int32) @ codes) * scale
+        return scores
+
+    def nearest(self, vector: Any) -> Tuple[int, float]:
+        """(table row, cosine similarity) of the closest indexed row; (-1, 0.0) when empty"""
+        if not len(self.rows):
+            return -1, 0.0
+        query = _unit_rows(((np.asarray(vector, dtype=np.float64).reshape(1, -1) - self.mean) / self.std))[0]
+        if not self.quantized:
+            similarities = self.matrix @ query.astype(np.float32)
+            best = int(np.argmax(similarities))
+            return int(self.rows[best]), float(similarities[best])
+
+        coarse = self._coarse(query)
+        k = min(self.rerank, len(coarse))
+        candidates = np.sort(np.argpartition(-coarse, k - 1)[:k])
+        exact = _unit_rows((self._features(self.rows[candidates]) - self.mean) / self.std) @ query
+        best = int(np.argmax(exact))
+        return int(self.rows[candidates[best]]), float(exact[best])
@@ -5,11 +5,14 @@ Simple FastAPI Backend for Exoplanet Discovery Platform
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import joblib
 import numpy as np
 import pandas as pd
 from typing import Dict, Optional, Union
 
+from feature_schema import FEATURE_ENCODER
+from planet_rules import classify_planet
+from resources import RESOURCES
+
 app = FastAPI(
     title="Exoplanet Discovery API",
     description="AI-powered exoplanet classification API",
@@ -24,11 +27,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load models at startup
+# Load models at startup (shared with any other module in the process that uses RESOURCES)
 try:
-    ml_model = joblib.load('../ml/exoplanet_model_best.joblib')
-    scaler = joblib.load('../ml/scaler.joblib')
-    label_encoder = joblib.load('../ml/label_encoder.joblib')
+    ml_model, scaler, label_encoder, _ = RESOURCES.get('models')
     models_loaded = True
     print("✅ ML models loaded successfully")
 except Exception as e:
@@ -107,31 +108,10 @@ async def predict(planet_data: PlanetInput):
     
     try:
         # Prepare input
-        input_data = [
-            planet_data.koi_period,
-            planet_data.koi_duration,
-            planet_data.koi_depth,
-            planet_data.koi_prad,
-            planet_data.koi_teq,
-            planet_data.koi_insol,
-            planet_data.koi_model_snr,
-            planet_data.koi_steff,
-            planet_data.koi_slogg,
-            planet_data.koi_srad,
-            planet_data.koi_smass,
-            planet_data.koi_kepmag,
-            planet_data.koi_fpflag_nt,
-            planet_data.koi_fpflag_ss,
-            planet_data.koi_fpflag_co,
-            planet_data.koi_fpflag_ec,
-            planet_data.ra,
-            planet_data.dec,
-            1 if 0.25 <= planet_data.koi_insol <= 1.5 else 0,  # habitable_zone
-            planet_data.koi_score
-        ]
+        input_data = FEATURE_ENCODER.encode(planet_data)
         
         # Scale and predict
-        input_scaled = scaler.transform([input_data])
+        input_scaled = scaler.transform(input_data)
         prediction = ml_model.predict(input_scaled)[0]
         probabilities = ml_model.predict_proba(input_scaled)[0]
         
@@ -141,46 +121,16 @@ async def predict(planet_data: PlanetInput):
         for i, class_name in enumerate(label_encoder.classes_):
             prob_dict[class_name] = float(probabilities[i])
         
-        # Calculate habitability
-        habitability = 0.0
-        if 273 <= planet_data.koi_teq <= 373:
-            habitability += 40
-        if 0.8 <= planet_data.koi_prad <= 1.5:
-            habitability += 30
-        if 0.25 <= planet_data.koi_insol <= 1.5:
-            habitability += 30
-        
-        # Planet type
-        if planet_data.koi_prad < 0.8:
-            planet_type = "Sub-Earth"
-        elif planet_data.koi_prad <= 1.25:
-            planet_type = "Earth-like"
-        elif planet_data.koi_prad <= 2.0:
-            planet_type = "Super-Earth"
-        elif planet_data.koi_prad <= 4.0:
-            planet_type = "Mini-Neptune"
-        else:
-            planet_type = "Giant"
-        
-        # Star type
-        if planet_data.koi_steff < 3700:
-            star_type = "M-dwarf"
-        elif planet_data.koi_steff < 5200:
-            star_type = "K-dwarf"
-        elif planet_data.koi_steff < 6000:
-            star_type = "G-dwarf"
-        elif planet_data.koi_steff < 7500:
-            star_type = "F-dwarf"
-        else:
-            star_type = "A-dwarf"
+        # Habitability, planet type and star type
+        rules = classify_planet(planet_data)
         
         return {
             "prediction": prediction_str,
             "probabilities": prob_dict,
             "confidence": float(max(probabilities)),
-            "habitability_score": habitability,
-            "planet_type": planet_type,
-            "star_type": star_type
+            "habitability_score": rules['habitability_score'],
+            "planet_type": rules['planet_type'],
+            "star_type": rules['star_type']
         }
         
     except Exception as e:
@@ -0,0 +1,128 @@
+"""
+Sky Density Tiles
+Multi-resolution KOI counts over ra/dec for drawing the real survey footprint
+
+The sky is an equirectangular plane (ra 0..360 left to right, dec +90..-90 top to bottom).
+Zoom level z splits it into 2^(z+1) x 2^z square tiles of `tile_size` pixels, and every
+occupied tile is one np.histogram2d of the KOIs inside it, stored as little-endian uint16
+counts (row-major, north up, saturating at 65535) and gzip-compressed on disk. Layers hold
+all KOIs and each disposition. Tiles are written once per dataset version under the cache
+directory; the manifest lists the occupied tiles and the peak count per layer and zoom.
+"""
+
+import gzip
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = 'manifest.json'
+LAYER_PATTERN = re.compile(r'^[a-z_]{1,32}$')
+DISPOSITION_LAYERS = {
+    'confirmed': 'CONFIRMED',
+    'candidate': 'CANDIDATE',
+    'false_positive': 'FALSE POSITIVE',
+}
+
+
+def _tile_name(layer: str, zoom: int, x: int, y: int) -> str:
+    return f'{layer}-{zoom}-{x}-{y}.u16.gz'
+
+
+class SkyDensityTiles:
+    """Manifest plus gzip-compressed uint16 density tiles for one dataset version"""
+
+    def __init__(self, manifest: Dict[str, Any], directory: str):
+        self.manifest = manifest
+        self.directory = directory
+
+    @property
+    def version(self) -> str:
+        return self.manifest['version']
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, directory: str, version: str,
+              tile_size: int = 256, max_zoom: int = 5) -> 'SkyDensityTiles':
+        """Histogram every layer at zoom levels 0..max_zoom and write the occupied tiles"""
+        known = df['ra'].notna() & df['dec'].notna()
+        ra = np.mod(df.loc[known, 'ra'].to_numpy(dtype=np.float64), 360.0)
+        south = 90.0 - np.clip(df.loc[known, 'dec'].to_numpy(dtype=np.float64), -90.0, 90.0)
+        disposition = df.loc[known, 'koi_disposition'].to_numpy(dtype=str)
+        layers = {'all': np.ones(len(ra), dtype=bool)}
+        layers.update({layer: disposition == value for layer, value in DISPOSITION_LAYERS.items()})
+
+        os.makedirs(directory, exist_ok=True)
+        tiles = {}
+        for layer, selected in layers.items():
+            layer_ra, layer_south = ra[selected], south[selected]
+            tiles[layer] = {}
+            for zoom in range(max_zoom + 1):
+                span = 180.0 / (1 << zoom)
+                x = np.minimum((layer_ra // span).astype(np.int64), (2 << zoom) - 1)
+                y = np.minimum((layer_south // span).astype(np.int64), (1 << zoom) - 1)
+                key = x * (1 << zoom) + y
+                order = np.argsort(key, kind='stable')
+                sorted_key = key[order]
+                starts = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1]]) if len(key) else np.array([], dtype=np.int64)
+                ends = np.r_[starts[1:], len(key)]
+
+                entries = []
+                for start, end in zip(starts, ends):
+                    rows = order[start:end]
+                    tile_x, tile_y = int(x[rows[0]]), int(y[rows[0]])
+                    # Rows run north -> south and columns west -> east in ra
+                    counts, _, _ = np.histogram2d(
+                        layer_south[rows] - tile_y * span, layer_ra[rows] - tile_x * span,
+                        bins=tile_size, range=[[0.0, span], [0.0, span]]
+                    )
+                    tile = np.minimum(counts, np.iinfo(np.uint16).max).astype('<u2')
+                    with open(os.path.join(directory, _tile_name(layer, zoom, tile_x, tile_y)), 'wb') as f:
+                        f.write(gzip.compress(tile.tobytes(), compresslevel=9, mtime=0))
+                    entries.append([tile_x, tile_y, int(tile.max())])
+                tiles[layer][str(zoom)] = {
+                    'max_count': max((entry[2] for entry in entries), default=0),
+                    'tiles': entries,
+                }
+
+        manifest = {
+            'version': version,
+            'tile_size': tile_size,
+            'max_zoom': max_zoom,
+            'dtype': 'uint16',
+            'total': int(len(ra)),
+            'layers': tiles,
+        }
+        # Manifest last so an interrupted build is simply rebuilt next time
+        tmp_path = os.path.join(directory, MANIFEST_NAME + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+        return cls(manifest, directory)
+
+    @classmethod
+    def load_or_build(cls, df: pd.DataFrame, cache_dir: str, version: str, **build_options) -> 'SkyDensityTiles':
+        """Reuse tiles already on disk for this dataset version, otherwise build them"""
+        directory = os.path.join(cache_dir, 'sky', version)
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == version:
+                return cls(manifest, directory)
+        except (OSError, ValueError):
+            pass
+        return cls.build(df, directory, version, **build_options)
+
+    def tile(self, layer: str, zoom: int, x: int, y: int) -> Optional[bytes]:
+        """Gzip-compressed uint16 tile, or None for unknown layers and empty/out-of-range tiles"""
+        if not LAYER_PATTERN.match(layer) or layer not in self.manifest['layers']:
+            return None
+        if not 0 <= zoom <= self.manifest['max_zoom'] or not 0 <= x < (2 << zoom) or not 0 <= y < (1 << zoom):
+            return None
+        try:
+            with open(os.path.join(self.directory, _tile_name(layer, zoom, x, y)), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,89 @@
+"""
+Sky Cone-Search Index
+Declination-banded, RA-sorted arrays over ra/dec for radius queries on the celestial sphere
+
+Rows are grouped into fixed-height declination bands (CSR offsets) and sorted by RA inside
+each band. A cone query binary-searches the RA window in every band it overlaps and then
+applies an exact angular test to that short candidate list, so the cost follows the result
+size rather than the catalog size.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+
+def unit_vectors(ra_deg: np.ndarray, dec_deg: np.ndarray) -> np.ndarray:
+    ra = np.radians(np.asarray(ra_deg, dtype=np.float64))
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    cos_dec = np.cos(dec)
+    return np.column_stack((cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)))
+
+
+def ra_half_width(dec_deg: float, radius_deg: float) -> float:
+    """Largest RA offset (degrees) reached by a cone; 180 when it contains a pole"""
+    if abs(dec_deg) + radius_deg >= 90.0:
+        return 180.0
+    ratio = math.sin(math.radians(radius_deg)) / math.cos(math.radians(dec_deg))
+    return 180.0 if ratio >= 1.0 else math.degrees(math.asin(ratio))
+
+
+class SkyIndex:
+    """Cone search over fixed ra/dec columns; results are row indices into those columns"""
+
+    def __init__(self, ra_deg: np.ndarray, dec_deg: np.ndarray, band_height: float = 1.0):
+        ra = np.mod(np.asarray(ra_deg, dtype=np.float64), 360.0)
+        dec = np.clip(np.asarray(dec_deg, dtype=np.float64), -90.0, 90.0)
+        self.band_height = band_height
+        self.n_bands = int(math.ceil(180.0 / band_height))
+
+        band = np.minimum(((dec + 90.0) // band_height).astype(np.int64), self.n_bands - 1)
+        self.order = np.lexsort((ra, band))
+        self.ra = ra[self.order]
+        self.xyz = unit_vectors(self.ra, dec[self.order])
+        self.band_offsets = np.searchsorted(band[self.order], np.arange(self.n_bands + 1))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _ra_ranges(self, ra: float, half_width: float):
+        if half_width >= 180.0:
+            return [(0.0, 360.0)]
+        low, high = ra - half_width, ra + half_width
+        if low < 0.0:
+            return [(low + 360.0, 360.0), (0.0, high)]
+        if high >= 360.0:
+            return [(low, 360.0), (0.0, high - 360.0)]
+        return [(low, high)]
+
+    def query(self, ra_deg: float, dec_deg: float, radius_deg: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices within radius_deg of (ra, dec) and their separations in degrees, nearest first"""
+        ra_deg = ra_deg % 360.0
+        first = max(int((dec_deg - radius_deg + 90.0) // self.band_height), 0)
+        last = min(int((dec_deg + radius_deg + 90.0) // self.band_height), self.n_bands - 1)
+        ra_ranges = self._ra_ranges(ra_deg, ra_half_width(dec_deg, radius_deg) + 1e-9)
+
+        slices = []
+        for band in range(first, last + 1):
+            start, stop = self.band_offsets[band], self.band_offsets[band + 1]
+            if start == stop:
+                continue
+            band_ra = self.ra[start:stop]
+            for low, high in ra_ranges:
+                i = start + np.searchsorted(band_ra, low, side='left')
+                j = start + np.searchsorted(band_ra, high, side='right')
+                if j > i:
+                    slices.append(np.arange(i, j))
+
+        if not slices:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        candidates = np.concatenate(slices)
+        center = unit_vectors(np.array([ra_deg]), np.array([dec_deg]))[0]
+        chord = np.linalg.norm(self.xyz[candidates] - center, axis=1)
+        separation = np.degrees(2.0 * np.arcsin(np.minimum(chord / 2.0, 1.0)))
+        inside = separation <= radius_deg
+        candidates, separation = candidates[inside], separation[inside]
+        nearest = np.argsort(separation, kind='stable')
+        return self.order[candidates[nearest]], separation[nearest]
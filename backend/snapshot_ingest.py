@@ -0,0 +1,165 @@
+"""
+Snapshot-Diff Ingestion
+Applies a new KOI archive release as added / removed / changed rows instead of a full rebuild
+
+Rows are matched by kepoi_name and compared by a per-row content hash (pandas'
+hash_pandas_object over the columns both snapshots share). The diff is written out as a CSV
+of the new rows (plus removed names) with the columns that changed, and then applied:
+
+    - precomputed predictions and nearest named analogues: only added/changed rows are
+      re-scored (CatalogPredictions.apply_diff), stored under the new dataset version
+    - triage scores: keyed by feature hash, so only added/changed candidates are scored
+    - /stats aggregates: old rows of the touched systems subtracted, new ones added, stored
+      under the new dataset version
+
+The server picks the stored tables up when it starts on the new snapshot (EXOPLANET_DATA_PATH).
+Octree and sky tiles, the compact API dataset and the similarity index are rebuilt from the new
+CSV at startup: the similarity index standardizes over every named planet, so it is not
+patched row by row.
+
+Usage:
+    python snapshot_ingest.py "../data/cumulative_2025.10.16.csv" --output koi_changes.csv
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+from catalog_stats import CatalogStats
+from planet_table import build_visualization_table
+
+
+class SnapshotDiff(NamedTuple):
+    added: np.ndarray        # new-snapshot rows whose kepoi_name is new
+    removed: np.ndarray      # old-snapshot rows whose kepoi_name is gone
+    changed: np.ndarray      # new-snapshot rows whose content hash changed
+    new_to_old: np.ndarray   # old row of every new row, -1 for added ones
+    columns: List[str]       # columns the hashes cover
+
+    @property
+    def changed_old(self) -> np.ndarray:
+        return self.new_to_old[self.changed]
+
+    def summary(self) -> str:
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+
+
+def row_hashes(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """uint64 content hash of every row over `columns` (order-independent of the CSV layout)"""
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+def diff_snapshots(old: pd.DataFrame, new: pd.DataFrame) -> SnapshotDiff:
+    """Added, removed and changed rows between two snapshots, matched by kepoi_name"""
+    columns = sorted(set(old.columns) & set(new.columns))
+    new_to_old = pd.Index(old['kepoi_name']).get_indexer(new['kepoi_name'])
+    old_to_new = pd.Index(new['kepoi_name']).get_indexer(old['kepoi_name'])
+
+    matched = np.flatnonzero(new_to_old >= 0)
+    old_hashes, new_hashes = row_hashes(old, columns), row_hashes(new, columns)
+    changed = matched[old_hashes[new_to_old[matched]] != new_hashes[matched]]
+    return SnapshotDiff(
+        added=np.flatnonzero(new_to_old < 0),
+        removed=np.flatnonzero(old_to_new < 0),
+        changed=changed,
+        new_to_old=new_to_old,
+        columns=columns,
+    )
+
+
+def changed_columns(old: pd.DataFrame, new: pd.DataFrame, diff: SnapshotDiff) -> List[List[str]]:
+    """Names of the columns that differ, for every changed row"""
+    old_rows, new_rows = old.iloc[diff.changed_old], new.iloc[diff.changed]
+    differs = np.zeros((len(diff.changed), len(diff.columns)), dtype=bool)
+    for j, name in enumerate(diff.columns):
+        a, b = old_rows[name].to_numpy(), new_rows[name].to_numpy()
+        differs[:, j] = ~((a == b) | (pd.isna(a) & pd.isna(b)))
+    names = np.array(diff.columns, dtype=object)
+    return [names[row].tolist() for row in differs]
+
+
+def changes_frame(old: pd.DataFrame, new: pd.DataFrame, diff: SnapshotDiff) -> pd.DataFrame:
+    """One row per delta: new rows for added/changed, names only for removed"""
+    added = new.iloc[diff.added].assign(change='added', changed_columns='')
+    changed = new.iloc[diff.changed].assign(
+        change='changed', changed_columns=[';'.join(names) for names in changed_columns(old, new, diff)]
+    )
+    removed = old.iloc[diff.removed][['kepoi_name', 'kepid']].assign(change='removed', changed_columns='')
+    frame = pd.concat([added, changed, removed], ignore_index=True)
+    return frame[['change', 'changed_columns'] + [c for c in frame.columns if c not in ('change', 'changed_columns')]]
+
+
+def touched_rows(old: pd.DataFrame, new: pd.DataFrame, diff: SnapshotDiff) -> Tuple[np.ndarray, np.ndarray]:
+    """Old and new rows of every star with a removed, added or changed KOI
+
+    Habitable zones use the first non-NaN stellar value per kepid, so an edit to one KOI can
+    move its siblings too; taking whole systems keeps the per-star caches exact.
+    """
+    kepids = np.union1d(old['kepid'].to_numpy()[np.concatenate([diff.removed, diff.changed_old])],
+                        new['kepid'].to_numpy()[np.concatenate([diff.added, diff.changed])])
+    return np.flatnonzero(old['kepid'].isin(kepids).to_numpy()), np.flatnonzero(new['kepid'].isin(kepids).to_numpy())
+
+
+def apply_stats(stats: CatalogStats, old: pd.DataFrame, new: pd.DataFrame, diff: SnapshotDiff) -> CatalogStats:
+    """Update /stats aggregates with the visualization rows of the systems the diff touched"""
+    old_rows, new_rows = touched_rows(old, new, diff)
+    stats.apply(build_visualization_table(old.iloc[old_rows]), build_visualization_table(new.iloc[new_rows]))
+    return stats
+
+
+def main():
+    from catalog_predictions import CatalogPredictions
+    from resources import RESOURCES, data_path
+    from response_cache import file_version, files_version
+    from triage import TriageQueue
+
+    parser = argparse.ArgumentParser(description="Diff a new KOI archive snapshot and apply only the deltas")
+    parser.add_argument('snapshot', help="New cumulative KOI CSV")
+    parser.add_argument('--current', default=data_path(), help="Current KOI CSV (default: probed)")
+    parser.add_argument('--output', help="CSV of added / changed / removed rows")
+    parser.add_argument('--cache-dir', default=os.environ.get('EXOPLANET_CACHE_DIR', str(Path(__file__).resolve().parent / '.cache')))
+    parser.add_argument('--ml-dir', help="Directory of the model, scaler and label encoder (default: probed)")
+    args = parser.parse_args()
+
+    old, new = pd.read_csv(args.current), pd.read_csv(args.snapshot)
+    started = time.perf_counter()
+    diff = diff_snapshots(old, new)
+    print(f"✅ Diffed {len(old):,} -> {len(new):,} rows in {(time.perf_counter() - started) * 1000:.0f} ms: {diff.summary()}")
+    if args.output:
+        changes_frame(old, new, diff).to_csv(args.output, index=False)
+        print(f"✅ Changes written to {args.output}")
+
+    if args.ml_dir:
+        os.environ['EXOPLANET_ML_DIR'] = args.ml_dir
+    models = RESOURCES.get('models')
+    model, scaler, classes = models.model, models.scaler, models.label_encoder.classes_
+    model_version = files_version(models.paths())
+    old_version, new_version = file_version(args.current), file_version(args.snapshot)
+
+    started = time.perf_counter()
+    predictions = CatalogPredictions.load_or_build(old, model, scaler, classes, args.cache_dir, f"{old_version}-{model_version}")
+    updated = predictions.apply_diff(new, diff, model, scaler, classes, f"{new_version}-{model_version}")
+    updated.save(args.cache_dir)
+    print(f"✅ Predictions updated for {len(diff.added) + len(diff.changed):,} rows in {time.perf_counter() - started:.2f}s")
+
+    # Unchanged candidates reuse the scores stored by the server for the current snapshot
+    triage = TriageQueue.load_or_build(new, model, scaler, classes, args.cache_dir, model_version, new_version)
+    print(f"✅ Triage queue: {len(triage):,} candidates, {triage.rescored:,} re-scored")
+
+    stats = CatalogStats.load(args.cache_dir, old_version)
+    if stats is None:
+        stats = CatalogStats.from_table(build_visualization_table(old))
+    apply_stats(stats, old, new, diff).save(args.cache_dir, new_version)
+    summary = stats.to_dict()
+    print(f"✅ Stats: {summary['total_exoplanets']:,} planets, {summary['confirmed']:,} confirmed, "
+          f"{summary['candidates']:,} candidates")
+    print("The compact dataset and similarity index are rebuilt from the new CSV when the API starts on it "
+          "(EXOPLANET_DATA_PATH)")
+
+if __name__ == "__main__":
+    main()
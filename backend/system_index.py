@@ -0,0 +1,84 @@
+"""
+Planetary System Index
+Groups catalog rows by host star (kepid) with CSR offsets and per-system aggregates
+
+Rows are ordered by kepid once at load time; system i owns rows
+order[offsets[i]:offsets[i + 1]]. Looking up a kepid is a dict hit and listing its
+planets is a slice, so whole-system queries never scan the catalog.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from planet_table import PlanetTable
+
+
+class SystemIndex:
+    """kepid -> planets of that system, plus per-system star parameters and summaries"""
+
+    def __init__(self, table: PlanetTable):
+        kepids = np.asarray(table['kepid'], dtype=np.int64)
+        self.table = table
+        self.order = np.argsort(kepids, kind='stable')
+        sorted_kepids = kepids[self.order]
+        starts = np.flatnonzero(np.r_[True, sorted_kepids[1:] != sorted_kepids[:-1]]) if len(kepids) else np.empty(0, dtype=np.intp)
+        self.offsets = np.r_[starts, len(kepids)]
+        self.kepids = sorted_kepids[starts]
+        self.positions = {int(kepid): i for i, kepid in enumerate(self.kepids)}
+
+        # Per-system aggregates; stellar columns are identical across a system, so take the first row
+        first_rows = self.order[starts]
+        self.planet_count = np.diff(self.offsets)
+        self.star_temp = np.asarray(table['star_temp'])[first_rows]
+        self.star_radius = np.asarray(table['star_radius'])[first_rows]
+        self.ra = np.asarray(table['ra'])[first_rows]
+        self.dec = np.asarray(table['dec'])[first_rows]
+        habitability = np.asarray(table['habitability_score'], dtype=np.float64)[self.order]
+        self.max_habitability = np.maximum.reduceat(habitability, starts) if len(starts) else np.empty(0)
+
+        # Planet count of each row's system, in table order, for the multi-planet filter
+        self.row_planet_count = np.empty(len(kepids), dtype=np.int64)
+        self.row_planet_count[self.order] = np.repeat(self.planet_count, self.planet_count)
+
+    def __len__(self) -> int:
+        return len(self.kepids)
+
+    def __contains__(self, kepid: int) -> bool:
+        return kepid in self.positions
+
+    def rows(self, kepid: int) -> Optional[np.ndarray]:
+        """Table row indices of one system, or None for an unknown kepid"""
+        position = self.positions.get(kepid)
+        if position is None:
+            return None
+        return self.order[self.offsets[position]:self.offsets[position + 1]]
+
+    def multi_planet_mask(self, min_planets: int = 2) -> np.ndarray:
+        """Boolean row mask of planets whose system has at least `min_planets` planets"""
+        return self.row_planet_count >= min_planets
+
+    def summary(self, position: int) -> Dict[str, Any]:
+        return {
+            "kepid": int(self.kepids[position]),
+            "planet_count": int(self.planet_count[position]),
+            "star_temp": float(self.star_temp[position]),
+            "star_radius": float(self.star_radius[position]),
+            "ra": float(self.ra[position]),
+            "dec": float(self.dec[position]),
+            "max_habitability": float(self.max_habitability[position])
+        }
+
+    def system(self, kepid: int) -> Optional[Dict[str, Any]]:
+        """Summary plus planet rows (ordered by period) of one system"""
+        rows = self.rows(kepid)
+        if rows is None:
+            return None
+        rows = rows[np.argsort(np.asarray(self.table['period'])[rows], kind='stable')]
+        return {**self.summary(self.positions[kepid]), "planets": self.table.take(rows).to_records()}
+
+    def summaries(self, min_planets: int = 1, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """System summaries with at least `min_planets` planets, largest systems first"""
+        positions = np.flatnonzero(self.planet_count >= min_planets)
+        positions = positions[np.argsort(-self.planet_count[positions], kind='stable')][:limit]
+        return [self.summary(position) for position in positions]
@@ -0,0 +1,94 @@
+"""
+Shared fixtures for the backend tests
+A synthetic KOI catalog (multi-planet systems, named planets, missing measurements) and a
+small model trained on it, so no test depends on the archive CSV or the shipped pickles.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_schema import FEATURE_ENCODER  # noqa: E402
+from uncertainty import UNCERTAIN_FEATURES  # noqa: E402
+
+CLASSES = ('CANDIDATE', 'CONFIRMED', 'FALSE POSITIVE')
+
+
+def make_catalog(n_stars: int = 160, seed: int = 7) -> pd.DataFrame:
+    """KOI-like table: 1-4 planets per star, stellar columns shared per system, ~5% NaN measurements"""
+    rng = np.random.default_rng(seed)
+    planets = rng.choice([1, 1, 1, 2, 2, 3, 4], n_stars)
+    kepid = np.repeat(10_000_000 + rng.choice(900_000, n_stars, replace=False), planets)
+    star = np.repeat(np.arange(n_stars), planets)
+    number = np.concatenate([np.arange(1, count + 1) for count in planets])
+    n = len(kepid)
+
+    steff = rng.uniform(3000, 7500, n_stars)[star]
+    srad = rng.lognormal(0.0, 0.3, n_stars)[star]
+    period = rng.lognormal(2.5, 1.2, n)
+    prad = rng.lognormal(0.8, 0.7, n)
+    insol = rng.lognormal(2.0, 1.8, n)
+    df = pd.DataFrame({
+        'kepid': kepid,
+        'kepoi_name': [f'K{s + 1:05d}.{k:02d}' for s, k in zip(star, number)],
+        'kepler_name': None,
+        'koi_disposition': rng.choice(CLASSES, n, p=[0.4, 0.35, 0.25]),
+        'koi_period': period,
+        'koi_time0bk': rng.uniform(130, 140, n),
+        'koi_impact': rng.uniform(0, 1.2, n),
+        'koi_duration': rng.uniform(1, 10, n),
+        'koi_depth': rng.lognormal(6, 1.5, n),
+        'koi_prad': prad,
+        'koi_teq': 280 * insol ** 0.25,
+        'koi_insol': insol,
+        'koi_model_snr': rng.lognormal(3, 1, n),
+        'koi_steff': steff,
+        'koi_slogg': rng.uniform(3.8, 4.8, n_stars)[star],
+        'koi_srad': srad,
+        'koi_smass': rng.lognormal(0.0, 0.2, n_stars)[star],
+        'koi_kepmag': rng.uniform(9, 16, n_stars)[star],
+        'koi_fpflag_nt': rng.integers(0, 2, n),
+        'koi_fpflag_ss': rng.integers(0, 2, n),
+        'koi_fpflag_co': rng.integers(0, 2, n),
+        'koi_fpflag_ec': rng.integers(0, 2, n),
+        'ra': rng.uniform(280, 300, n_stars)[star],
+        'dec': rng.uniform(36, 52, n_stars)[star],
+        'koi_score': rng.uniform(0, 1, n),
+    })
+    confirmed = np.flatnonzero(df['koi_disposition'] == 'CONFIRMED')
+    df.loc[confirmed, 'kepler_name'] = [f'Kepler-{s + 1} {"bcde"[k - 1]}' for s, k in zip(star[confirmed], number[confirmed])]
+    for name in UNCERTAIN_FEATURES + ('koi_time0bk',):
+        df[name + '_err1'] = np.abs(df[name]) * rng.uniform(0.01, 0.1, n)
+        df[name + '_err2'] = -np.abs(df[name]) * rng.uniform(0.01, 0.1, n)
+    for name in ('koi_prad', 'koi_teq', 'koi_insol', 'koi_steff', 'koi_period', 'ra'):
+        df.loc[rng.random(n) < 0.05, name] = np.nan
+    return df
+
+
+@pytest.fixture(scope='session')
+def catalog() -> pd.DataFrame:
+    return make_catalog()
+
+
+@pytest.fixture
+def df(catalog) -> pd.DataFrame:
+    return catalog.copy()
+
+
+@pytest.fixture(scope='session')
+def trained(catalog):
+    """(model, scaler, classes) fitted on the synthetic catalog's dispositions"""
+    from sklearn.preprocessing import StandardScaler
+    from xgboost import XGBClassifier
+
+    features = FEATURE_ENCODER.encode_columns(catalog)
+    scaler = StandardScaler().fit(features)
+    labels = pd.Categorical(catalog['koi_disposition'], categories=CLASSES).codes
+    model = XGBClassifier(n_estimators=12, max_depth=4, learning_rate=0.3, random_state=0, n_jobs=1)
+    model.fit(scaler.transform(features), labels)
+    return model, scaler, list(CLASSES)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from catalog_predictions import CatalogPredictions, build_prediction_columns
+from feature_schema import FEATURE_ENCODER
+from snapshot_ingest import diff_snapshots
+
+
+def next_snapshot(df):
+    """Edited measurements, a renamed planet, one removed KOI and one new one"""
+    new = df.copy()
+    new.loc[3, 'koi_prad'] = 1.1
+    new.loc[10, 'koi_period'] *= 1.5
+    named = np.flatnonzero(new['kepler_name'].notna())
+    new.loc[named[0], 'koi_insol'] = 0.9
+    new.loc[named[1], 'kepler_name'] = np.nan
+    added = new.iloc[[20]].assign(kepoi_name='K99999.01', kepler_name='Kepler-999 b', koi_teq=300.0)
+    return pd.concat([new.drop(index=[5]), added], ignore_index=True)
+
+
+def test_analogues_match_brute_force(catalog, trained):
+    model, scaler, classes = trained
+    columns = build_prediction_columns(catalog, model, scaler, classes)
+    scaled = scaler.transform(FEATURE_ENCODER.encode_columns(catalog))
+    named = np.flatnonzero(catalog['kepler_name'].notna())
+    for row in range(0, len(catalog), 13):
+        distances = np.linalg.norm(scaled[named] - scaled[row], axis=1)
+        distances[named == row] = np.inf
+        assert columns['analogue_kepoi_name'][row] == catalog['kepoi_name'][named[distances.argmin()]]
+        assert np.isclose(columns['analogue_distance'][row], distances.min(), rtol=1e-5)
+
+
+def test_predictions_match_model(catalog, trained):
+    model, scaler, classes = trained
+    columns = build_prediction_columns(catalog, model, scaler, classes)
+    probabilities = model.predict_proba(scaler.transform(FEATURE_ENCODER.encode_columns(catalog)))
+    np.testing.assert_allclose(columns['probability_CONFIRMED'], probabilities[:, 1], rtol=1e-6)
+    np.testing.assert_array_equal(columns['prediction'], np.array(classes)[probabilities.argmax(axis=1)])
+
+
+def test_apply_diff_equals_full_rebuild(catalog, trained):
+    model, scaler, classes = trained
+    new = next_snapshot(catalog)
+    diff = diff_snapshots(catalog, new)
+    assert len(diff.added) == 1 and len(diff.removed) == 1 and len(diff.changed) >= 3
+
+    patched = CatalogPredictions(build_prediction_columns(catalog, model, scaler, classes), 'old').apply_diff(
+        new, diff, model, scaler, classes, 'new')
+    rebuilt = build_prediction_columns(new, model, scaler, classes)
+    assert set(patched.table.columns) == set(rebuilt)
+    for name, values in rebuilt.items():
+        if values.dtype.kind == 'f':
+            np.testing.assert_allclose(patched.table[name], values, rtol=1e-5, err_msg=name)
+        else:
+            np.testing.assert_array_equal(patched.table[name], values, err_msg=name)
+
+
+def test_stored_table_round_trips_and_nulls_missing_scores(catalog, trained, tmp_path):
+    model, scaler, classes = trained
+    built = CatalogPredictions.load_or_build(catalog, model, scaler, classes, str(tmp_path), 'v')
+    loaded = CatalogPredictions.load_or_build(catalog, None, None, classes, str(tmp_path), 'v')
+    for name, values in built.table.columns.items():
+        np.testing.assert_array_equal(loaded.table[name], values)
+
+    unmeasured = catalog['kepoi_name'][catalog['koi_teq'].isna()].iloc[0]
+    record = loaded.lookup(unmeasured)
+    assert record['habitability_score'] is None
+    assert set(record['probabilities']) == set(classes)
+    assert loaded.lookup('K00000.00') is None
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from compact_catalog import CATALOG_COLUMNS, catalog_footprint, read_compact_catalog
+
+
+def test_compact_read_keeps_values_in_smaller_dtypes(df, tmp_path):
+    path = tmp_path / 'koi.csv'
+    df.to_csv(path, index=False)
+    full = pd.read_csv(path)
+    compact = read_compact_catalog(str(path))
+
+    assert list(compact.columns) == [name for name in full.columns if name in CATALOG_COLUMNS]
+    assert not any(name.endswith('_err1') for name in compact.columns)
+    assert isinstance(compact['koi_disposition'].dtype, pd.CategoricalDtype)
+    assert compact['koi_fpflag_nt'].dtype == np.int8 and compact['kepid'].dtype == np.int32
+    assert compact['koi_period'].dtype == np.float32
+
+    for name in compact.columns:
+        if compact[name].dtype.kind == 'f':
+            np.testing.assert_allclose(compact[name], full[name].astype(np.float32), equal_nan=True)
+        else:
+            assert compact[name].astype(object).where(compact[name].notna(), None).tolist() == \
+                full[name].astype(object).where(full[name].notna(), None).tolist()
+
+    footprint = catalog_footprint(compact)
+    assert footprint['rows'] == len(df)
+    assert footprint['bytes'] < full[compact.columns].memory_usage(deep=True).sum()
+    assert catalog_footprint(None)['rows'] == 0
@@ -0,0 +1,33 @@
+import numpy as np
+
+from counterfactual import FIXED_FEATURES, CounterfactualSearch, robust_scales
+from feature_schema import FEATURE_ENCODER
+
+
+def test_counterfactual_reaches_target_and_reports_its_changes(catalog, trained):
+    model, scaler, classes = trained
+    features = FEATURE_ENCODER.encode_columns(catalog)
+    predicted = model.predict_proba(scaler.transform(features)).argmax(axis=1)
+    row = int(np.flatnonzero(predicted == classes.index('FALSE POSITIVE'))[0])
+    search = CounterfactualSearch(model, scaler, classes, feature_scales=robust_scales(catalog), generation_size=256)
+    result = search.search(features[row], 'CONFIRMED', budget_ms=300)
+
+    assert result['original']['prediction'] == 'FALSE POSITIVE'
+    assert result['found']
+    counterfactual = result['counterfactual']
+    assert counterfactual['prediction'] == 'CONFIRMED'
+
+    # Replaying the reported changes on the original row gives the reported prediction
+    record = dict(zip(FEATURE_ENCODER.names, features[row].tolist()))
+    record.update({change['feature']: change['to'] for change in counterfactual['changes']})
+    replayed = model.predict_proba(scaler.transform(FEATURE_ENCODER.encode(record)))[0]
+    np.testing.assert_allclose(list(counterfactual['probabilities'].values()), replayed, atol=1e-5)
+    assert not {change['feature'] for change in counterfactual['changes']} & set(FIXED_FEATURES)
+
+
+def test_row_already_in_target_needs_no_change(catalog, trained):
+    model, scaler, classes = trained
+    features = FEATURE_ENCODER.encode_columns(catalog.head(1))
+    current = classes[int(model.predict_proba(scaler.transform(features))[0].argmax())]
+    result = CounterfactualSearch(model, scaler, classes).search(features[0], current)
+    assert result['counterfactual']['distance'] == 0.0 and result['counterfactual']['changes'] == []
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cross_match import ARCSEC_PER_DEGREE, cross_match, output_columns
+
+
+def brute_force_pairs(ref, stream):
+    """(stream, reference) haversine separations in arcsec; inf for unknown positions"""
+    ra1, dec1 = np.radians(stream['ra'].to_numpy())[:, None], np.radians(stream['dec'].to_numpy())[:, None]
+    ra2, dec2 = np.radians(ref['ra'].to_numpy())[None, :], np.radians(ref['dec'].to_numpy())[None, :]
+    h = np.sin((dec2 - dec1) / 2) ** 2 + np.cos(dec1) * np.cos(dec2) * np.sin((ra2 - ra1) / 2) ** 2
+    separation = np.degrees(2 * np.arcsin(np.sqrt(h))) * ARCSEC_PER_DEGREE
+    separation[np.isnan(separation)] = np.inf
+    return separation
+
+
+@pytest.fixture
+def fields():
+    rng = np.random.default_rng(11)
+    ref = pd.DataFrame({'kepoi_name': [f'K{i:05d}.01' for i in range(400)],
+                        'ra': rng.uniform(290, 291, 400), 'dec': rng.uniform(44, 45, 400)})
+    near = rng.choice(400, 300)
+    stream = pd.DataFrame({
+        'source_id': np.arange(1000, 1600),
+        'ra': np.r_[ref['ra'].to_numpy()[near] + rng.normal(0, 1e-4, 300), rng.uniform(290, 291, 300)],
+        'dec': np.r_[ref['dec'].to_numpy()[near] + rng.normal(0, 1e-4, 300), rng.uniform(44, 45, 300)],
+        'mag': rng.uniform(10, 15, 600),
+    })
+    stream.loc[5, 'ra'] = np.nan
+    return ref, stream
+
+
+def test_nearest_matches_brute_force(fields):
+    ref, stream = fields
+    chunks = [stream.iloc[i:i + 128] for i in range(0, len(stream), 128)]
+    result = pd.concat(cross_match(ref, chunks, radius_arcsec=2.0, stream_id='source_id', extra_columns=['mag']))
+
+    separation = brute_force_pairs(ref, stream)
+    has_match = separation.min(axis=1) <= 2.0
+    assert sorted(result['stream_source_id']) == stream['source_id'][has_match].tolist()
+    by_source = result.set_index('stream_source_id')
+    for i in np.flatnonzero(has_match):
+        match = by_source.loc[stream['source_id'][i]]
+        assert match['reference_kepoi_name'] == ref['kepoi_name'][separation[i].argmin()]
+        assert match['separation_arcsec'] == pytest.approx(separation[i].min(), abs=1e-6)
+        assert match['mag'] == stream['mag'][i]
+
+
+def test_all_pairs_matches_brute_force(fields):
+    ref, stream = fields
+    result = pd.concat(cross_match(ref, [stream], radius_arcsec=30.0, nearest_only=False))
+    separation = brute_force_pairs(ref, stream)
+    expected = {(int(i), ref['kepoi_name'][j]) for i, j in zip(*np.nonzero(separation <= 30.0))}
+    assert set(zip(result['stream_row'].tolist(), result['reference_kepoi_name'])) == expected
+
+
+def test_colliding_output_columns_are_rejected(fields):
+    ref, stream = fields
+    assert output_columns('kepoi_name', 'kepoi_name') == ['reference_kepoi_name', 'stream_kepoi_name', 'separation_arcsec']
+    with pytest.raises(ValueError):
+        output_columns('kepoi_name', 'source_id', ['separation_arcsec'])
+    with pytest.raises(ValueError):
+        next(cross_match(ref, [stream], extra_columns=['mag', 'mag']))
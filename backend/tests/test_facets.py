@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from facets import FACETS, FacetEngine, parse_range
+from planet_table import build_visualization_table
+
+
+def reference_counts(values, facet, mask):
+    """np.histogram with out-of-range values clamped into the end bins and NaN counted apart"""
+    selected = values[mask]
+    known = selected[~np.isnan(selected)]
+    clamped = np.clip(known, facet.edges[0], np.nextafter(facet.edges[-1], -np.inf))
+    counts, _ = np.histogram(clamped, bins=facet.edges)
+    return counts.tolist(), int(np.isnan(selected).sum())
+
+
+@pytest.mark.parametrize('ranges', [
+    {},
+    {'radius': (0.5, 2.0)},
+    {'radius': (None, 4.0), 'temperature': (200.0, None), 'period': (1.0, 100.0)},
+])
+def test_histograms_match_numpy(df, ranges):
+    table = build_visualization_table(df)
+    engine = FacetEngine(table)
+    result = engine.histograms(ranges)
+
+    masks = {}
+    for name, (low, high) in ranges.items():
+        values = engine.values[name]
+        masks[name] = ((values >= low) if low is not None else True) & ((values <= high) if high is not None else True)
+    everything = np.ones(len(table), dtype=bool)
+    for mask in masks.values():
+        everything &= mask
+    assert result['total'] == int(everything.sum())
+
+    for name, facet in FACETS.items():
+        others = np.ones(len(table), dtype=bool)
+        for other, mask in masks.items():
+            if other != name:
+                others &= mask
+        counts, missing = reference_counts(engine.values[name], facet, others)
+        assert result['facets'][name]['counts'] == counts
+        assert result['facets'][name]['missing'] == missing
+
+
+def test_parse_range():
+    assert parse_range('1,2') == (1.0, 2.0)
+    assert parse_range(',5') == (None, 5.0)
+    assert parse_range(None) is None
+    for text in ('5,1', '1', 'a,b'):
+        with pytest.raises(ValueError):
+            parse_range(text)
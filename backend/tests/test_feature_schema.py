@@ -0,0 +1,28 @@
+import numpy as np
+
+from feature_schema import FEATURE_DEFAULTS, FEATURE_ENCODER, feature_hash
+
+
+def test_encode_columns_matches_record_encoding(df):
+    columns = FEATURE_ENCODER.encode_columns(df.head(50))
+    records = [{name: (None if value != value else value) for name, value in row.items()}
+               for row in df.head(50).to_dict('records')]
+    np.testing.assert_array_equal(columns, FEATURE_ENCODER.encode_records(records))
+
+
+def test_missing_values_take_schema_defaults(df):
+    row = df.index[df['koi_prad'].isna()][0]
+    encoded = FEATURE_ENCODER.encode_columns(df.loc[[row]])
+    assert encoded[0, FEATURE_ENCODER.index['koi_prad']] == np.float32(FEATURE_DEFAULTS['koi_prad'])
+
+
+def test_habitable_zone_is_derived_from_insolation():
+    encoded = FEATURE_ENCODER.encode_records([{'koi_insol': 1.0}, {'koi_insol': 10.0}])
+    np.testing.assert_array_equal(encoded[:, FEATURE_ENCODER.index['habitable_zone']], [1, 0])
+
+
+def test_feature_hash_depends_on_values_and_version(df):
+    encoded = FEATURE_ENCODER.encode_columns(df.head(2))
+    assert feature_hash(encoded[0]) == feature_hash(encoded[0].copy())
+    assert feature_hash(encoded[0]) != feature_hash(encoded[1])
+    assert feature_hash(encoded[0], 'a') != feature_hash(encoded[0], 'b')
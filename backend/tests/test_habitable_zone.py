@@ -0,0 +1,23 @@
+import numpy as np
+
+from habitable_zone import UNKNOWN, HabitableZoneCache, classify, stellar_radius
+
+
+def test_cache_matches_direct_classification(df):
+    cache = HabitableZoneCache.from_catalog(df)
+    first_teff = df.groupby('kepid')['koi_steff'].first()
+    expected = classify(df['koi_insol'], first_teff.reindex(df['kepid']).to_numpy())
+    np.testing.assert_array_equal(cache.zones(df['kepid'], df['koi_insol']), expected)
+    assert (cache.zones(df['kepid'], df['koi_insol'])[df['koi_insol'].isna().to_numpy()] == UNKNOWN).all()
+
+
+def test_unknown_star_is_unknown(df):
+    cache = HabitableZoneCache.from_catalog(df)
+    assert (cache.zones([1, 2], [1.0, 1.0]) == UNKNOWN).all()
+    assert cache.lookup(1) is None
+
+
+def test_sun_earth_is_conservative_and_radius_falls_back_to_gravity():
+    assert classify([1.0], [5780.0])[0] == 2
+    assert classify([100.0], [5780.0])[0] == 0
+    np.testing.assert_allclose(stellar_radius([np.nan], [4.438], [1.0]), [1.0])
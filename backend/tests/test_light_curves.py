@@ -0,0 +1,62 @@
+import numpy as np
+
+from light_curves import FORMAT_VERSION, HEADER_BYTES, MAGIC, LightCurveModel
+
+
+def trapezoid(t, period, depth_ppm, duration_hours, impact):
+    """Scalar reference: folded offset, flat bottom, linear ingress of tau = T sqrt(depth) / (1 - b^2), capped at T / 2"""
+    depth = min(max(depth_ppm * 1e-6, 0.0), 1.0)
+    duration = duration_hours / 24.0
+    impact = 0.0 if np.isnan(impact) else impact
+    ingress = max(min(duration * np.sqrt(depth) / max(1.0 - impact ** 2, 1e-6), duration / 2.0), 1e-9)
+    phase = abs((t + period / 2.0) % period - period / 2.0)
+    covered = min(max((duration / 2.0 - phase) / ingress, 0.0), 1.0)
+    return 1.0 - depth * covered
+
+
+def test_flux_matches_scalar_trapezoid(df):
+    model = LightCurveModel(df)
+    planets = df.dropna(subset=['koi_depth', 'koi_duration', 'koi_period']).reset_index(drop=True)
+    rows = np.arange(0, len(model), 17)
+    times = model.time_grid(rows, points=41, window=1.5)
+    flux = model.flux(rows, times)
+    for i, row in enumerate(rows):
+        planet = planets.loc[row]
+        expected = [trapezoid(t, planet['koi_period'], planet['koi_depth'], planet['koi_duration'], planet['koi_impact'])
+                    for t in times[i]]
+        np.testing.assert_allclose(flux[i], expected, rtol=0, atol=1e-12)
+
+
+def test_packed_layout_carries_names_in_the_body(df):
+    model = LightCurveModel(df)
+    rows = model.select(disposition='CONFIRMED', limit=7)
+    body = model.pack(rows, points=16)
+
+    magic, version, n, m, length = np.frombuffer(body, dtype='<u4', count=5)
+    assert magic.tobytes() == MAGIC and version == FORMAT_VERSION and (n, m) == (len(rows), 16)
+    assert length % 4 == 0
+    names = body[HEADER_BYTES:HEADER_BYTES + length].rstrip(b'\0').decode('utf-8').split('\n')
+    assert names == model.kepoi_name[rows].tolist()
+
+    blocks = np.frombuffer(body, dtype='<f4', offset=HEADER_BYTES + length).reshape(n, 2, m)
+    times = model.time_grid(rows, 16)
+    np.testing.assert_allclose(blocks[:, 0], times, rtol=1e-6)
+    np.testing.assert_allclose(blocks[:, 1], model.flux(rows, times), rtol=1e-6)
+
+
+def test_select_system_orders_by_period(df):
+    model = LightCurveModel(df)
+    kepid = df['kepid'].value_counts().index[0]
+    rows = model.select(kepid=int(kepid))
+    assert (model.kepid[rows] == kepid).all() and (np.diff(model.period[rows]) >= 0).all()
+
+
+def test_select_names_honours_other_filters(df):
+    model = LightCurveModel(df)
+    names = list(model.kepoi_name[::-9][:12])
+    assert list(model.kepoi_name[model.select(names=names)]) == names
+    rows = model.select(names=names, disposition='CONFIRMED')
+    assert list(model.kepoi_name[rows]) == [name for name in names
+                                            if model.disposition[model.rows_by_name[name]] == 'CONFIRMED']
+    kepid = int(model.kepid[model.rows_by_name[names[0]]])
+    assert list(model.kepid[model.select(names=names, kepid=kepid)]) == [kepid]
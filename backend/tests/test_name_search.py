@@ -0,0 +1,49 @@
+from name_search import NameIndex, normalize, trigrams
+from planet_table import build_visualization_table
+
+
+def make_index(df):
+    table = build_visualization_table(df)
+    return table, NameIndex(table['kepoi_name'], table['kepler_name'], table['kepid'])
+
+
+def row_keys(table, row):
+    keys = {normalize(table['kepoi_name'][row]), 'k' + normalize(table['kepoi_name'][row])[1:].lstrip('0'),
+            str(int(table['kepid'][row]))}
+    if table['kepler_name'][row]:
+        keys.add(normalize(table['kepler_name'][row]))
+    return keys
+
+
+def test_prefix_matches_startswith_scan(df):
+    table, index = make_index(df)
+    for query in ('K0001', 'koi-12', 'Kepler-3', '100', 'kepler'):
+        key = normalize(query)
+        expected = {row for row in range(len(table)) if any(k.startswith(key) for k in row_keys(table, row))}
+        hits = index.prefix(query, limit=len(table))
+        assert {hit['row'] for hit in hits} == expected
+        assert len(hits) == len(expected)
+
+
+def test_fuzzy_matches_trigram_similarity(df):
+    table, index = make_index(df)
+    query = 'Keplr-12 b'
+    grams = set(trigrams(normalize(query)))
+
+    def similarity(key):
+        other = set(trigrams(key))
+        return len(grams & other) / len(grams | other)
+
+    best = {row: max(similarity(key) for key in row_keys(table, row)) for row in range(len(table))}
+    hits = index.fuzzy(query, limit=5)
+    expected = sorted((score for score in best.values() if score >= 0.3), reverse=True)[:5]
+    assert [round(hit['score'], 9) for hit in hits] == [round(score, 9) for score in expected]
+    assert all(round(best[hit['row']], 9) == round(hit['score'], 9) for hit in hits)
+
+
+def test_search_finds_typos_after_prefix_matches(df):
+    table, index = make_index(df)
+    name = next(name for name in table['kepler_name'] if name)
+    typo = name.replace('Kepler', 'Kepelr')
+    assert index.prefix(typo) == []
+    assert table['kepler_name'][index.search(typo, limit=3)[0]['row']] == name
@@ -0,0 +1,40 @@
+import numpy as np
+
+from planet_rules import UNKNOWN_TYPE, classify_batch, classify_catalog, classify_planet
+
+
+def test_classify_batch_matches_scalar_rules(df):
+    filled = df.fillna({'koi_prad': 1.0, 'koi_teq': 288.0, 'koi_insol': 1.0, 'koi_steff': 5778.0})
+    batch = classify_batch(filled)
+    for i, record in enumerate(filled.to_dict('records')):
+        expected = classify_planet(record)
+        assert batch['habitability_score'][i] == expected['habitability_score']
+        assert batch['planet_type'][i] == expected['planet_type']
+        assert batch['star_type'][i] == expected['star_type']
+
+
+def test_classify_catalog_keeps_missing_measurements_missing(df):
+    rules = classify_catalog(df)
+    missing = df[['koi_teq', 'koi_prad', 'koi_insol']].isna().any(axis=1).to_numpy()
+    assert missing.any()
+    assert np.isnan(rules['habitability_score'][missing]).all()
+    assert not np.isnan(rules['habitability_score'][~missing]).any()
+    np.testing.assert_array_equal(rules['planet_type'] == UNKNOWN_TYPE, df['koi_prad'].isna().to_numpy())
+    np.testing.assert_array_equal(rules['star_type'] == UNKNOWN_TYPE, df['koi_steff'].isna().to_numpy())
+
+
+def test_classify_catalog_agrees_with_scalar_rules_on_measured_rows(df):
+    rules = classify_catalog(df)
+    measured = df.dropna(subset=['koi_teq', 'koi_prad', 'koi_insol', 'koi_steff'])
+    for i, record in zip(measured.index, measured.to_dict('records')):
+        expected = classify_planet(record)
+        assert rules['habitability_score'][i] == np.float32(expected['habitability_score'])
+        assert rules['planet_type'][i] == expected['planet_type']
+        assert rules['star_type'][i] == expected['star_type']
+
+
+def test_unmeasured_planet_does_not_score_as_earth_twin():
+    rules = classify_catalog({'koi_teq': np.array([np.nan]), 'koi_prad': np.array([np.nan]),
+                              'koi_insol': np.array([np.nan]), 'koi_steff': np.array([np.nan])})
+    assert np.isnan(rules['habitability_score'][0])
+    assert rules['planet_type'][0] == UNKNOWN_TYPE
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from resources import ResourceManager, data_path, data_paths, deep_size
+
+
+def test_concurrent_first_gets_load_once():
+    calls = []
+    manager = ResourceManager()
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return np.zeros(1000)
+
+    manager.register('table', slow_loader)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(manager.get('table'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert manager.status()['table']['bytes'] == 8000
+
+
+def test_dependencies_load_first_and_reset_cascades():
+    order = []
+    manager = ResourceManager()
+    manager.register('dataset', lambda: order.append('dataset') or pd.DataFrame({'a': [1, 2]}))
+    manager.register('index', lambda data: order.append('index') or len(data), depends=('dataset',))
+    manager.register('other', lambda: order.append('other') or 1)
+
+    assert manager.peek('index') is None
+    assert manager.get('index') == 2 and order == ['dataset', 'index']
+    assert manager.dependents('dataset') == ['dataset', 'index']
+    manager.get('other')
+    manager.reset('dataset')
+    assert manager.peek('index') is None and manager.peek('other') == 1
+    manager.get('index')
+    assert order == ['dataset', 'index', 'other', 'dataset', 'index']
+
+    with pytest.raises(ValueError):
+        manager.register('late', lambda x: x, depends=('missing',))
+    with pytest.raises(ValueError):
+        manager.register('dataset', lambda: None)
+
+
+def test_failures_are_recorded_and_retried():
+    attempts = []
+    manager = ResourceManager()
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FileNotFoundError('models')
+        return 'bundle'
+
+    manager.register('models', flaky)
+    with pytest.raises(FileNotFoundError):
+        manager.get('models')
+    assert manager.status()['models']['error'] == 'FileNotFoundError: models'
+    assert manager.get('models') == 'bundle'
+    assert manager.status()['models']['error'] is None and manager.status()['models']['loaded']
+
+
+def test_deep_size_counts_arrays_once():
+    array = np.zeros(100)
+    assert deep_size({'a': array, 'b': [array, array]}) == array.nbytes
+
+
+def test_data_path_prefers_an_existing_candidate(tmp_path, monkeypatch):
+    monkeypatch.setenv('EXOPLANET_DATA_PATH', str(tmp_path / 'missing.csv'))
+    existing = [path for path in data_paths()[1:] if os.path.exists(path)]
+    assert data_path() == (existing[0] if existing else str(tmp_path / 'missing.csv'))
+
+    (tmp_path / 'missing.csv').write_text('kepid\n')
+    assert data_path() == str(tmp_path / 'missing.csv')
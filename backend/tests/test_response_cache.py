@@ -0,0 +1,117 @@
+import gzip
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from response_cache import ConditionalGetMiddleware, accepts_gzip, files_version
+
+
+def make_client(version):
+    app = FastAPI()
+    calls = []
+
+    @app.get('/data')
+    def data(n: int = 1):
+        calls.append(n)
+        return {'values': list(range(1000 * n))}
+
+    @app.get('/other')
+    def other():
+        calls.append('other')
+        return {}
+
+    @app.get('/tiles/{name}')
+    def tile(name: str, request: Request):
+        calls.append(name)
+        body = name.encode() * 100
+        headers = {'Cache-Control': 'public, max-age=31536000, immutable'}
+        if 'gzip' in request.headers.get('accept-encoding', ''):
+            return Response(gzip.compress(body), headers={**headers, 'Content-Encoding': 'gzip'})
+        return Response(body, headers=headers)
+
+    app.add_middleware(ConditionalGetMiddleware, paths=['/data'], prefixes=['/tiles/'], version=version,
+                       min_gzip_size=64, threadpool_gzip_size=4096)
+    return TestClient(app), calls
+
+
+def test_cached_body_and_conditional_get():
+    client, calls = make_client(lambda: 'v1')
+    first = client.get('/data')
+    second = client.get('/data')
+    assert first.json() == second.json()
+    assert (first.headers['x-cache'], second.headers['x-cache']) == ('MISS', 'HIT') and calls == [1]
+
+    revalidated = client.get('/data', headers={'If-None-Match': first.headers['etag']})
+    assert revalidated.status_code == 304 and revalidated.content == b'' and calls == [1]
+    assert client.get('/data?n=2').headers['etag'] != first.headers['etag']
+    client.get('/other')
+    client.get('/other')
+    assert calls == [1, 2, 'other', 'other']
+
+
+def test_gzip_follows_accept_encoding():
+    client, _ = make_client(lambda: 'v1')
+    for n in (1, 5):  # inline and threadpool compression
+        assert client.get(f'/data?n={n}', headers={'Accept-Encoding': 'gzip'}).headers.get('content-encoding') == 'gzip'
+        plain = client.get(f'/data?n={n}', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+        assert 'content-encoding' not in plain.headers and len(plain.json()['values']) == 1000 * n
+
+
+def test_gzip_variant_has_its_own_etag():
+    client, calls = make_client(lambda: 'v1')
+    zipped = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/data', headers={'Accept-Encoding': 'identity'})
+    assert zipped.headers['etag'] != plain.headers['etag'] and calls == [1]
+
+    for etag, encoding in ((zipped.headers['etag'], 'gzip'), (plain.headers['etag'], 'gzip'),
+                           (plain.headers['etag'], 'identity')):
+        revalidated = client.get('/data', headers={'If-None-Match': etag, 'Accept-Encoding': encoding})
+        assert revalidated.status_code == 304 and revalidated.headers['etag'] == etag
+    # A client that no longer accepts gzip cannot revalidate the gzip body
+    assert client.get('/data', headers={'If-None-Match': zipped.headers['etag'],
+                                         'Accept-Encoding': 'identity'}).status_code == 200
+
+
+def test_prefixes_cover_path_parameters_and_keep_endpoint_headers():
+    client, calls = make_client(lambda: 'v1')
+    zipped = client.get('/tiles/a', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/tiles/a', headers={'Accept-Encoding': 'identity'})
+    assert zipped.content == plain.content == b'a' * 100
+    assert zipped.headers['content-encoding'] == 'gzip' and 'content-encoding' not in plain.headers
+    assert plain.headers['x-cache'] == 'HIT' and calls == ['a']
+    assert plain.headers['cache-control'] == 'public, max-age=31536000, immutable'
+    revalidated = client.get('/tiles/a', headers={'If-None-Match': plain.headers['etag']})
+    assert revalidated.status_code == 304 and 'immutable' in revalidated.headers['cache-control']
+    assert client.get('/tiles/b').headers['x-cache'] == 'MISS'
+    assert client.get('/data').headers['cache-control'] == 'public, max-age=0, must-revalidate'
+
+
+def test_no_version_disables_caching():
+    client, calls = make_client(lambda: None)
+    client.get('/data')
+    response = client.get('/data')
+    assert 'etag' not in response.headers and calls == [1, 1]
+
+
+def test_accepts_gzip_q_values():
+    assert accepts_gzip('gzip, deflate')
+    assert accepts_gzip('br;q=1.0, gzip;q=0.5')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('gzip;q=0')
+    assert not accepts_gzip('*;q=0')
+    assert not accepts_gzip('identity')
+    assert not accepts_gzip(None)
+    assert not accepts_gzip('gzip;q=0, *')
+
+
+def test_files_version_covers_every_file(tmp_path):
+    paths = [tmp_path / name for name in ('model', 'scaler', 'encoder')]
+    for path in paths:
+        path.write_bytes(path.name.encode())
+    version = files_version(paths)
+    assert version == files_version(paths) and len(version) == 16
+
+    paths[1].write_bytes(b'refitted')
+    assert files_version(paths) != version
+    assert files_version(paths + [tmp_path / 'missing']) is None
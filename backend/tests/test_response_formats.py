@@ -0,0 +1,40 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from planet_table import PlanetTable
+from response_formats import COLUMNS_JSON, JSON, MSGPACK, dumps, msgpack, negotiate, render_table
+
+
+def request(accept):
+    return Request({'type': 'http', 'headers': [(b'accept', accept.encode('latin-1'))]})
+
+
+def test_negotiate_prefers_format_parameter_then_accept_quality():
+    assert negotiate(request('application/msgpack'), format='columns') == COLUMNS_JSON
+    assert negotiate(request('application/vnd.exoplanet.columns+json;q=0.5, application/msgpack;q=0.9')) == MSGPACK
+    assert negotiate(request('text/html, */*;q=0.1')) == JSON
+    assert negotiate(request('application/msgpack;q=0, application/json')) == JSON
+    with pytest.raises(HTTPException):
+        negotiate(request('*/*'), format='xml')
+
+
+def test_row_and_column_json_carry_the_same_table():
+    table = PlanetTable({'kepid': np.array([1, 2]), 'radius': np.array([1.5, 2.5]),
+                         'kepoi_name': np.array(['K1', 'K2'], dtype=object)})
+    rows = json.loads(render_table(JSON, table, 'planets', {'total': 2}).body)
+    columns = json.loads(render_table(COLUMNS_JSON, table, 'planets', {'total': 2}).body)
+    assert rows == {'planets': table.to_records(), 'total': 2}
+    assert columns == {'columns': {name: values.tolist() for name, values in table.columns.items()}, 'total': 2}
+    assert json.loads(dumps({'a': np.float32(0.5), 'b': np.arange(3)})) == {'a': 0.5, 'b': [0, 1, 2]}
+
+
+@pytest.mark.skipif(msgpack is None, reason="msgpack is not installed")
+def test_msgpack_keeps_full_precision():
+    table = PlanetTable({'ra': np.array([291.934230, 297.00482]), 'probability': np.array([0.1234567891234, 1 / 3])})
+    body = render_table(MSGPACK, table, 'planets', {'total': 2}).body
+    columns = msgpack.unpackb(body)['columns']
+    assert columns == {name: values.tolist() for name, values in table.columns.items()}
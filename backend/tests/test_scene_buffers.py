@@ -0,0 +1,36 @@
+import numpy as np
+
+from planet_table import build_visualization_table
+from scene_buffers import FLAG_ROW_IDS, HEADER_BYTES, MAGIC, SceneBuffers
+
+
+def unpack_scene(body):
+    magic, version, n, flags = np.frombuffer(body, dtype='<u4', count=4).tolist()
+    assert magic.to_bytes(4, 'little') == MAGIC and version == 1
+    offset = HEADER_BYTES
+    positions = np.frombuffer(body, dtype='<f4', count=3 * n, offset=offset).reshape(n, 3)
+    offset += 12 * n
+    radii = np.frombuffer(body, dtype='<f4', count=n, offset=offset)
+    offset += 4 * n
+    colors = np.frombuffer(body, dtype=np.uint8, count=4 * n, offset=offset).reshape(n, 4)
+    offset += 4 * n
+    habitability = np.frombuffer(body, dtype=np.uint8, count=n, offset=offset)
+    rows = np.frombuffer(body, dtype='<u4', count=n, offset=(offset + n + 3) & ~3) if flags & FLAG_ROW_IDS else None
+    return positions, radii, colors, habitability, rows
+
+
+def scene(df):
+    # Archive rows always carry a sky position; the scene and octree assume one
+    return SceneBuffers(build_visualization_table(df.dropna(subset=['ra', 'dec'])))
+
+
+def test_pack_round_trips_selected_rows(df):
+    buffers = scene(df)
+    rows = np.arange(0, len(buffers), 5)
+    positions, radii, colors, habitability, row_ids = unpack_scene(buffers.pack(rows, include_row_ids=True))
+    np.testing.assert_array_equal(positions, buffers.positions[rows])
+    np.testing.assert_array_equal(radii, buffers.radii[rows])
+    np.testing.assert_array_equal(colors, buffers.colors[rows])
+    np.testing.assert_array_equal(habitability, buffers.habitability[rows])
+    np.testing.assert_array_equal(row_ids, rows)
+    assert unpack_scene(buffers.pack())[4] is None
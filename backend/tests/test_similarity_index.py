@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from feature_schema import INPUT_FEATURES
+from similarity_index import SimilarityIndex
+
+
+def brute_force_nearest(df, columns, vector):
+    named = np.flatnonzero(df['kepler_name'].notna().to_numpy())
+    features = np.nan_to_num(df[columns].to_numpy(dtype=np.float64)[named])
+    mean, std = features.mean(axis=0), features.std(axis=0)
+    std[std == 0] = 1.0
+    rows = (features - mean) / std
+    rows /= np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-300)
+    query = (np.asarray(vector, dtype=np.float64) - mean) / std
+    similarity = rows @ (query / np.linalg.norm(query))
+    return int(named[similarity.argmax()]), float(similarity.max())
+
+
+@pytest.mark.parametrize('quantized', [True, False])
+def test_nearest_matches_float_brute_force(df, quantized):
+    columns = [name for name in INPUT_FEATURES if name in df.columns]
+    index = SimilarityIndex.from_catalog(df, columns, quantized=quantized)
+    rng = np.random.default_rng(1)
+    for row in rng.choice(len(df), 40, replace=False):
+        vector = np.nan_to_num(df[columns].to_numpy(dtype=np.float64)[row])
+        vector = vector * rng.uniform(0.9, 1.1, len(vector))
+        expected_row, expected_similarity = brute_force_nearest(df, columns, vector)
+        found_row, similarity = index.nearest(vector)
+        assert found_row == expected_row
+        assert similarity == pytest.approx(expected_similarity, abs=1e-5)
+
+
+def test_int8_storage_is_a_quarter_of_float32(df):
+    columns = [name for name in INPUT_FEATURES if name in df.columns]
+    quantized = SimilarityIndex.from_catalog(df, columns)
+    exact = SimilarityIndex.from_catalog(df, columns, quantized=False)
+    assert quantized.matrix.nbytes * 4 == exact.matrix.nbytes
+    assert SimilarityIndex.from_catalog(df.iloc[:0], columns).nearest(np.zeros(len(columns))) == (-1, 0.0)
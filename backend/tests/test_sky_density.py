@@ -0,0 +1,23 @@
+import gzip
+import json
+
+import numpy as np
+
+from sky_density import SkyDensityTiles
+
+
+def test_sky_density_tiles_sum_to_layer_totals(df, tmp_path):
+    tiles = SkyDensityTiles.build(df, str(tmp_path), 'v1', tile_size=32, max_zoom=3)
+    known = df.dropna(subset=['ra', 'dec'])
+    assert tiles.manifest['total'] == len(known)
+    for layer, expected in (('all', len(known)), ('confirmed', int((known['koi_disposition'] == 'CONFIRMED').sum()))):
+        for zoom, level in tiles.manifest['layers'][layer].items():
+            total = sum(
+                np.frombuffer(gzip.decompress(tiles.tile(layer, int(zoom), x, y)), dtype='<u2').sum(dtype=np.int64)
+                for x, y, _ in level['tiles']
+            )
+            assert total == expected
+    assert tiles.tile('all', 0, 5, 0) is None and tiles.tile('../x', 0, 0, 0) is None
+
+    reloaded = SkyDensityTiles.load_or_build(df, str(tmp_path), 'v2')
+    assert json.loads(json.dumps(reloaded.manifest))['version'] == 'v2'
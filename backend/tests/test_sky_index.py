@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from sky_index import SkyIndex
+
+
+def brute_force_cone(ra, dec, center_ra, center_dec, radius):
+    ra, dec, center_ra, center_dec = np.radians(ra), np.radians(dec), np.radians(center_ra), np.radians(center_dec)
+    h = np.sin((dec - center_dec) / 2) ** 2 + np.cos(dec) * np.cos(center_dec) * np.sin((ra - center_ra) / 2) ** 2
+    separation = np.degrees(2 * np.arcsin(np.sqrt(h)))
+    return np.flatnonzero(separation <= radius), separation
+
+
+@pytest.fixture(scope='module')
+def sky():
+    rng = np.random.default_rng(3)
+    ra = rng.uniform(0, 360, 5000)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, 5000)))
+    return ra, dec
+
+
+@pytest.mark.parametrize('center_ra, center_dec, radius', [
+    (290.0, 44.5, 5.0),
+    (0.5, 10.0, 8.0),      # wraps through ra = 0
+    (359.0, -30.0, 12.0),
+    (120.0, 87.0, 6.0),    # contains the north pole
+    (45.0, -89.5, 3.0),
+    (200.0, 0.0, 0.01),
+])
+def test_query_matches_brute_force(sky, center_ra, center_dec, radius):
+    ra, dec = sky
+    rows, separation = SkyIndex(ra, dec, band_height=2.0).query(center_ra, center_dec, radius)
+    expected, expected_separation = brute_force_cone(ra, dec, center_ra, center_dec, radius)
+    assert sorted(rows.tolist()) == expected.tolist()
+    np.testing.assert_allclose(separation, expected_separation[rows], atol=1e-7)
+    assert np.all(np.diff(separation) >= 0)
+
+
+def test_empty_cone(sky):
+    rows, separation = SkyIndex(*sky).query(10.0, 10.0, 1e-6)
+    assert len(rows) == len(separation) == 0
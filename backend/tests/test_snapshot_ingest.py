@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+import catalog_stats
+import habitable_zone
+from catalog_stats import CatalogStats
+from planet_table import build_visualization_table
+from snapshot_ingest import apply_stats, changes_frame, diff_snapshots
+
+
+def test_diff_finds_added_removed_and_changed_rows(df):
+    new = df.drop(index=[0, 1]).copy()
+    new.loc[7, 'koi_depth'] += 1
+    new = pd.concat([new, df.iloc[[2]].assign(kepoi_name='K99999.01')], ignore_index=True)
+    diff = diff_snapshots(df, new)
+
+    assert df['kepoi_name'][diff.removed].tolist() == df['kepoi_name'][[0, 1]].tolist()
+    assert new['kepoi_name'][diff.added].tolist() == ['K99999.01']
+    assert new['kepoi_name'][diff.changed].tolist() == [df['kepoi_name'][7]]
+    changes = changes_frame(df, new, diff)
+    assert changes.loc[changes['change'] == 'changed', 'changed_columns'].tolist() == ['koi_depth']
+
+
+def test_apply_stats_equals_recompute(df, tmp_path):
+    new = df.drop(index=[4]).copy()
+    # A stellar edit moves the habitable zone of every planet in that system
+    system = df['kepid'][df['kepid'].duplicated()].iloc[0]
+    first = df.index[df['kepid'] == system][0]
+    new.loc[first, 'koi_steff'] = np.nan
+    new.loc[first + 1, 'koi_steff'] = 3200.0
+    new.loc[12, 'koi_disposition'] = 'CONFIRMED'
+    new = pd.concat([new, df.iloc[[30]].assign(kepoi_name='K99999.01')], ignore_index=True)
+
+    stats = CatalogStats.from_table(build_visualization_table(df))
+    stats.save(str(tmp_path), 'old')
+    patched = apply_stats(CatalogStats.load(str(tmp_path), 'old'), df, new, diff_snapshots(df, new))
+    expected = CatalogStats.from_table(build_visualization_table(new))
+
+    assert patched.counts == expected.counts
+    for name, total in expected.sums.items():
+        assert np.isclose(patched.sums[name], total)
+    assert CatalogStats.load(str(tmp_path), 'missing') is None
+
+
+def test_stats_store_is_keyed_by_rules(tmp_path, monkeypatch):
+    CatalogStats().save(str(tmp_path), 'v1')
+    monkeypatch.setitem(habitable_zone.ZONES, 'conservative', ('recent_venus', 'maximum_greenhouse'))
+    changed = catalog_stats.rules_version()
+    assert changed != catalog_stats.RULES_VERSION
+
+    monkeypatch.setattr(catalog_stats, 'RULES_VERSION', changed)
+    assert CatalogStats.load(str(tmp_path), 'v1') is None
+    monkeypatch.undo()
+    assert CatalogStats.load(str(tmp_path), 'v1') is not None
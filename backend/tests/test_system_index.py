@@ -0,0 +1,34 @@
+import numpy as np
+
+from planet_table import build_visualization_table
+from system_index import SystemIndex
+
+
+def test_systems_match_groupby(df):
+    table = build_visualization_table(df)
+    index = SystemIndex(table)
+    grouped = {kepid: [] for kepid in np.unique(table['kepid'])}
+    for row, kepid in enumerate(table['kepid']):
+        grouped[kepid].append(row)
+
+    assert len(index) == len(grouped)
+    for kepid, rows in grouped.items():
+        assert index.rows(int(kepid)).tolist() == rows
+        position = index.positions[int(kepid)]
+        assert index.planet_count[position] == len(rows)
+        assert index.max_habitability[position] == np.max(table['habitability_score'][rows])
+    np.testing.assert_array_equal(
+        index.multi_planet_mask(), [len(grouped[kepid]) >= 2 for kepid in table['kepid']]
+    )
+    assert index.rows(1) is None and index.system(1) is None
+
+
+def test_system_lists_planets_by_period(df):
+    table = build_visualization_table(df)
+    index = SystemIndex(table)
+    largest = index.summaries(min_planets=2, limit=1)[0]
+    system = index.system(largest['kepid'])
+    periods = [planet['period'] for planet in system['planets']]
+    assert len(periods) == largest['planet_count'] and periods == sorted(periods)
+    counts = [summary['planet_count'] for summary in index.summaries()]
+    assert counts == sorted(counts, reverse=True)
@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+
+from transit_ephemeris import BKJD_OFFSET, TransitEphemeris
+
+
+def brute_force_transits(df, start, end):
+    events = []
+    for _, planet in df.iterrows():
+        if planet['koi_disposition'] == 'FALSE POSITIVE' or planet[['koi_period', 'koi_time0bk', 'koi_duration']].isna().any():
+            continue
+        epoch = planet['koi_time0bk'] + BKJD_OFFSET
+        n = math.ceil((start - epoch) / planet['koi_period'])
+        while epoch + n * planet['koi_period'] <= end:
+            events.append((epoch + n * planet['koi_period'], planet['kepoi_name'], n))
+            n += 1
+    return sorted(events)
+
+
+def test_window_matches_loop(df):
+    start = BKJD_OFFSET + 3000.0
+    events = TransitEphemeris(df).transits(start, start + 20.0)
+    expected = brute_force_transits(df, start, start + 20.0)
+    assert len(events) == len(expected)
+    np.testing.assert_allclose(events['mid_time'], [mid for mid, _, _ in expected])
+    assert sorted(zip(events['kepoi_name'], events['epoch'].tolist())) == sorted((name, n) for _, name, n in expected)
+    np.testing.assert_allclose(events['egress'] - events['ingress'], events['duration_hours'] / 24.0)
+
+
+def test_limit_returns_earliest_events(df):
+    start = BKJD_OFFSET + 3000.0
+    ephemeris = TransitEphemeris(df)
+    everything = ephemeris.transits(start, start + 60.0)
+    first = ephemeris.transits(start, start + 60.0, limit=25)
+    assert len(everything) > 25
+    np.testing.assert_allclose(first['mid_time'], everything['mid_time'][:25])
+
+
+def test_disposition_filter(df):
+    start = BKJD_OFFSET + 3000.0
+    events = TransitEphemeris(df).transits(start, start + 20.0, disposition='CONFIRMED')
+    assert len(events) and set(events['disposition']) == {'CONFIRMED'}
@@ -0,0 +1,36 @@
+import numpy as np
+import xgboost as xgb
+
+from feature_schema import FEATURE_ENCODER, FEATURE_NAMES
+from tree_explainer import TreeExplainer, explanation
+
+
+def test_shap_values_match_xgboost_pred_contribs(catalog, trained):
+    model, scaler, classes = trained
+    booster = model.get_booster()
+    X = scaler.transform(FEATURE_ENCODER.encode_columns(catalog)).astype(np.float32)
+    X[::7, 3] = np.nan  # missing values follow each split's default direction
+
+    explainer = TreeExplainer(booster, FEATURE_NAMES, classes)
+    values = explainer.shap_values(X)
+    reference = booster.predict(xgb.DMatrix(X), pred_contribs=True)  # (n, classes, features + bias)
+
+    np.testing.assert_allclose(values, reference[:, :, :-1], atol=1e-5)
+    np.testing.assert_allclose(explainer.expected_value, reference[0, :, -1], atol=1e-5)
+    margins = booster.predict(xgb.DMatrix(X), output_margin=True)
+    np.testing.assert_allclose(values.sum(axis=2) + explainer.expected_value, margins, atol=1e-4)
+
+
+def test_explanation_lists_top_drivers_of_predicted_class(catalog, trained):
+    model, scaler, classes = trained
+    features = FEATURE_ENCODER.encode_columns(catalog.head(1))
+    scaled = scaler.transform(features)
+    explainer = TreeExplainer(model.get_booster(), FEATURE_NAMES, classes)
+    contributions = explainer.shap_values(scaled)[0]
+    probabilities = model.predict_proba(scaled)[0]
+
+    result = explanation(explainer, features[0], probabilities, contributions, top=3)
+    best = int(probabilities.argmax())
+    assert result['prediction'] == classes[best]
+    top = [driver['contribution'] for driver in result['top_features']]
+    assert np.allclose(np.abs(top), np.sort(np.abs(contributions[best]))[::-1][:3])
@@ -0,0 +1,44 @@
+import numpy as np
+
+from triage import CRITERIA, TriageQueue
+
+
+def test_rankings_match_sorted_brute_force(catalog, trained, tmp_path):
+    model, scaler, classes = trained
+    queue = TriageQueue.load_or_build(catalog, model, scaler, classes, str(tmp_path), 'm1', 'd1', depth=40)
+    c = queue.columns
+    for criterion, (_, key, tie_break) in CRITERIA.items():
+        scored = [i for i in range(len(queue)) if not np.isnan(c[key][i])]
+        tie = np.nan_to_num(c[tie_break], nan=-np.inf)
+        expected = sorted(scored, key=lambda i: (-c[key][i], -tie[i], i))[:40]
+        assert queue.rankings[criterion].tolist() == expected, criterion
+
+
+def test_unmeasured_candidates_are_not_ranked_for_habitability(catalog, trained, tmp_path):
+    model, scaler, classes = trained
+    queue = TriageQueue.load_or_build(catalog, model, scaler, classes, str(tmp_path), 'm1', 'd1', depth=10_000)
+    candidates = catalog[catalog['koi_disposition'] == 'CANDIDATE']
+    unmeasured = candidates[['koi_teq', 'koi_prad', 'koi_insol']].isna().any(axis=1).to_numpy()
+    assert unmeasured.any()
+    assert queue.ranked('habitability') == int((~unmeasured).sum())
+    assert not set(np.flatnonzero(unmeasured)) & set(queue.rankings['habitability'].tolist())
+    assert queue.ranked('entropy') == len(candidates)
+    page = queue.page('confirmed', page=1, page_size=len(candidates))
+    assert any(record['habitability_score'] is None for record in page)
+
+
+def test_stored_scores_are_reused_and_only_edits_rescored(catalog, trained, tmp_path):
+    model, scaler, classes = trained
+    first = TriageQueue.load_or_build(catalog, model, scaler, classes, str(tmp_path), 'm1', 'd1')
+    assert first.rescored == len(first)
+
+    edited = catalog.copy()
+    candidates = np.flatnonzero(edited['koi_disposition'] == 'CANDIDATE')
+    edited.loc[candidates[:3], 'koi_depth'] *= 2
+    second = TriageQueue.load_or_build(edited, model, scaler, classes, str(tmp_path), 'm1', 'd2')
+    assert second.rescored == 3
+    fresh = TriageQueue.load_or_build(edited, model, scaler, classes, str(tmp_path / 'other'), 'm1', 'd2')
+    np.testing.assert_allclose(second.columns['probabilities'], fresh.columns['probabilities'])
+
+    # The previous snapshot's scores are kept next to the current ones
+    assert TriageQueue.load_or_build(catalog, model, scaler, classes, str(tmp_path), 'm1', 'd1').rescored == 0
@@ -0,0 +1,51 @@
+import numpy as np
+
+from feature_schema import FEATURE_ENCODER
+from uncertainty import MonteCarloClassifier, UNCERTAIN_FEATURES, catalog_intervals, error_columns
+
+
+def test_zero_error_bars_reproduce_predict_proba(catalog, trained):
+    model, scaler, classes = trained
+    base = FEATURE_ENCODER.encode_columns(catalog.head(20))
+    zeros = np.zeros((20, len(UNCERTAIN_FEATURES)), dtype=np.float32)
+    result = MonteCarloClassifier(model, scaler, classes, batch_samples=64).intervals(base, zeros, zeros, n_samples=16, seed=0)
+
+    expected = model.predict_proba(scaler.transform(base))
+    for key in ('mean', 'lower', 'upper'):
+        np.testing.assert_allclose(result[key], expected, atol=1e-6)
+    np.testing.assert_allclose(result['std'], 0.0, atol=1e-6)
+    np.testing.assert_array_equal(result['stability'], 1.0)
+
+
+def test_intervals_match_per_row_sampling(catalog, trained):
+    model, scaler, classes = trained
+    rows = catalog.head(6)
+    base = FEATURE_ENCODER.encode_columns(rows)
+    plus, minus = error_columns(rows, len(rows))
+    classifier = MonteCarloClassifier(model, scaler, classes, batch_samples=40)
+    result = classifier.intervals(base, plus, minus, n_samples=20, seed=5)
+
+    # Same generator stream, one planet at a time (batches hold whole planets)
+    rng = np.random.default_rng(5)
+    for start in range(0, len(rows), 2):
+        samples = classifier.sample(base[start:start + 2], plus[start:start + 2], minus[start:start + 2], 20, rng)
+        probabilities = model.predict_proba(scaler.transform(samples)).reshape(-1, 20, len(classes))
+        np.testing.assert_allclose(result['mean'][start:start + 2], probabilities.mean(axis=1), atol=1e-6)
+        np.testing.assert_allclose(result['upper'][start:start + 2], np.quantile(probabilities, 0.95, axis=1), atol=1e-6)
+    assert (result['lower'] <= result['mean'] + 1e-9).all() and (result['mean'] <= result['upper'] + 1e-9).all()
+
+
+def test_samples_respect_error_bars_and_stay_physical(catalog, trained):
+    model, scaler, classes = trained
+    rows = catalog.head(3)
+    base = FEATURE_ENCODER.encode_columns(rows)
+    plus, minus = error_columns(rows, len(rows))
+    classifier = MonteCarloClassifier(model, scaler, classes)
+    samples = classifier.sample(base, plus, minus, 2000, np.random.default_rng(0)).reshape(3, 2000, -1)
+
+    column = FEATURE_ENCODER.index['koi_period']
+    spread = samples[:, :, column] - base[:, None, column]
+    j = UNCERTAIN_FEATURES.index('koi_period')
+    assert (samples[:, :, classifier.columns] >= 0).all()
+    np.testing.assert_allclose(np.sqrt((spread.clip(min=0) ** 2).mean(axis=1) * 2), plus[:, j], rtol=0.1)
+    assert len(catalog_intervals(rows, classifier, n_samples=8)) == 3
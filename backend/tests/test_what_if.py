@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from feature_schema import FEATURE_ENCODER
+from what_if import SweepAxis, sweep, validate_axes
+
+
+def test_sweep_matches_per_point_predictions(catalog, trained):
+    model, scaler, classes = trained
+    base = FEATURE_ENCODER.encode_columns(catalog.head(1))[0]
+    axes = [SweepAxis('koi_insol', 0.1, 5.0, 4), SweepAxis('koi_prad', 0.5, 3.0, 3)]
+    result = sweep(model, scaler, classes, base, axes)
+
+    for i, insol in enumerate(axes[0].values):
+        for j, prad in enumerate(axes[1].values):
+            record = dict(zip(FEATURE_ENCODER.names, base.tolist()), koi_insol=insol, koi_prad=prad)
+            expected = model.predict_proba(scaler.transform(FEATURE_ENCODER.encode(record)))[0]
+            got = [result['probabilities'][name][i][j] for name in classes]
+            np.testing.assert_allclose(got, expected, atol=1e-6)
+            assert result['prediction'][i][j] == classes[int(expected.argmax())]
+
+
+@pytest.mark.parametrize('axes', [
+    [],
+    [SweepAxis('koi_prad', 0, 1, 5), SweepAxis('koi_prad', 0, 1, 5)],
+    [SweepAxis('habitable_zone', 0, 1, 5)],
+    [SweepAxis('koi_prad', 0, 1, 1)],
+    [SweepAxis('koi_prad', 0, 1, 200), SweepAxis('koi_insol', 0, 1, 200)],
+])
+def test_invalid_sweeps_are_rejected(axes):
+    with pytest.raises(ValueError):
+        validate_axes(axes)
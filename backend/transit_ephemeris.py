@@ -0,0 +1,109 @@
+"""
+Transit Ephemeris Engine
+Predicted transit mid-times, ingress/egress and timing uncertainties for the whole catalog
+
+Kepler epochs (koi_time0bk) are BKJD = BJD - 2454833. For a window [start, end] every
+planet's epoch range is found with floor/ceil division, the ranges are expanded into one
+flat event array with np.repeat, and the linear ephemeris T0 + n * P is evaluated for all
+events at once. Timing errors propagate as sigma_n = sqrt(sigma_T0^2 + (n * sigma_P)^2).
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from planet_table import PlanetTable
+
+BKJD_OFFSET = 2454833.0
+UNIX_EPOCH_JD = 2440587.5
+SECONDS_PER_DAY = 86400.0
+
+
+def current_bjd() -> float:
+    """Now as a Julian date (the light-travel correction to BJD is below the timing errors)"""
+    return time.time() / SECONDS_PER_DAY + UNIX_EPOCH_JD
+
+
+def _symmetric_error(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Mean of the |err1| and |err2| columns, 0 where both are missing"""
+    errors = df[[f'{column}_err1', f'{column}_err2']].abs().to_numpy(dtype=np.float64)
+    present = (~np.isnan(errors)).sum(axis=1)
+    return np.divide(np.nansum(errors, axis=1), present, out=np.zeros(len(errors)), where=present > 0)
+
+
+class TransitEphemeris:
+    """Linear ephemerides of non-false-positive KOIs with period, epoch and duration"""
+
+    def __init__(self, df: pd.DataFrame):
+        planets = df[df['koi_disposition'] != 'FALSE POSITIVE']
+        planets = planets.dropna(subset=['koi_period', 'koi_time0bk', 'koi_duration'])
+        planets = planets[planets['koi_period'] > 0]
+
+        self.kepid = planets['kepid'].to_numpy(dtype=np.int64)
+        self.kepoi_name = planets['kepoi_name'].to_numpy(dtype=object)
+        self.kepler_name = planets['kepler_name'].astype(object).where(planets['kepler_name'].notna(), None).to_numpy()
+        self.disposition = planets['koi_disposition'].to_numpy(dtype=object)
+        self.period = planets['koi_period'].to_numpy(dtype=np.float64)
+        self.epoch = planets['koi_time0bk'].to_numpy(dtype=np.float64) + BKJD_OFFSET
+        self.duration = planets['koi_duration'].to_numpy(dtype=np.float64) / 24.0
+        self.period_err = _symmetric_error(planets, 'koi_period')
+        self.epoch_err = _symmetric_error(planets, 'koi_time0bk')
+
+    def __len__(self) -> int:
+        return len(self.period)
+
+    @staticmethod
+    def _counts(first: np.ndarray, epoch: np.ndarray, period: np.ndarray, end: float) -> np.ndarray:
+        last = np.floor((end - epoch) / period).astype(np.int64)
+        return np.maximum(last - first + 1, 0)
+
+    def transits(self, start: float, end: float, limit: Optional[int] = None,
+                 disposition: Optional[str] = None) -> PlanetTable:
+        """Transits with mid-time in [start, end] (BJD), sorted by mid-time; at most `limit` events"""
+        planets = np.arange(len(self))
+        if disposition:
+            planets = planets[self.disposition == disposition]
+        period, epoch = self.period[planets], self.epoch[planets]
+
+        first = np.ceil((start - epoch) / period).astype(np.int64)
+        counts = self._counts(first, epoch, period, end)
+        if limit is not None and counts.sum() > limit:
+            # Shrink the window to the earliest end that still holds `limit` events, so only
+            # those are expanded rather than every transit up to `end`
+            low, high = start, end
+            for _ in range(48):
+                middle = (low + high) / 2.0
+                if self._counts(first, epoch, period, middle).sum() >= limit:
+                    high = middle
+                else:
+                    low = middle
+            counts = self._counts(first, epoch, period, high)
+
+        # Flat (planet, epoch number) pairs for every event in the window
+        owner = np.repeat(np.arange(len(planets)), counts)
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        n = np.repeat(first, counts) + (np.arange(len(owner)) - offsets)
+        mid_time = epoch[owner] + n * period[owner]
+
+        if limit is not None and len(mid_time) > limit:
+            selected = np.argpartition(mid_time, limit - 1)[:limit] if limit > 0 else np.empty(0, dtype=np.intp)
+            owner, n, mid_time = owner[selected], n[selected], mid_time[selected]
+        order = np.argsort(mid_time, kind='stable')
+        owner, n, mid_time = owner[order], n[order], mid_time[order]
+
+        rows = planets[owner]
+        half_duration = self.duration[rows] / 2.0
+        return PlanetTable({
+            'kepid': self.kepid[rows],
+            'kepoi_name': self.kepoi_name[rows],
+            'kepler_name': self.kepler_name[rows],
+            'disposition': self.disposition[rows],
+            'epoch': n,
+            'mid_time': mid_time,
+            'ingress': mid_time - half_duration,
+            'egress': mid_time + half_duration,
+            'mid_time_err': np.hypot(self.epoch_err[rows], n * self.period_err[rows]),
+            'duration_hours': self.duration[rows] * 24.0
+        })
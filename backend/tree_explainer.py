@@ -0,0 +1,199 @@
+"""
+TreeSHAP Explanations from Precomputed Path Tables
+Exact path-dependent SHAP values for the served XGBoost model, computed for whole batches
+
+Every root-to-leaf path is flattened once: its split conditions, the unique features on it
+(slots), and each slot's zero fraction z (product of cover ratios). For a leaf with value v
+and D slots, the SHAP value of slot j only depends on which slots the row agrees with
+(one fractions o in {0, 1}), so all 2^D agreement patterns are tabulated up front:
+
+    phi_j = v (o_j - z_j) * prod_{k: o_k = 0, k != j} z_k * sum_t e_t(z_{O \\ j}) w(|O \\ j| - t)
+
+with e_t the elementary symmetric polynomials and w(s) = s! (D - s - 1)! / D!. Explaining a
+batch is then a few vectorized comparisons, reduceat calls and one table gather.
+"""
+
+import json
+from math import factorial, prod
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+
+def _shapley_weights(depth: int) -> np.ndarray:
+    return np.array([factorial(s) * factorial(depth - s - 1) / factorial(depth) for s in range(depth)])
+
+
+def _segment_sums(values: np.ndarray, ends: np.ndarray, dtype) -> np.ndarray:
+    """Sums over consecutive row segments ending at `ends` (one cumsum instead of a reduceat per segment)"""
+    totals = np.cumsum(values, axis=0, dtype=dtype)[ends - 1]
+    totals[1:] -= totals[:-1].copy()
+    return totals
+
+
+def _pattern_tables(values: np.ndarray, zeros: np.ndarray) -> np.ndarray:
+    """(leaves, 2^D, D) SHAP values for leaves sharing the same slot count D"""
+    n_leaves, depth = zeros.shape
+    patterns = np.arange(1 << depth)
+    ones = ((patterns[:, None] >> np.arange(depth)) & 1).astype(bool)            # (P, D)
+
+    # Elementary symmetric polynomials of z over every slot subset, one bit level at a time
+    e = np.zeros((n_leaves, len(patterns), depth + 1))
+    e[:, 0, 0] = 1.0
+    for bit in range(depth):
+        lower = e[:, :1 << bit]
+        upper = e[:, 1 << bit:2 << bit]
+        upper[:] = lower
+        upper[..., 1:] += zeros[:, bit, None, None] * lower[..., :-1]
+
+    # W[q] = sum_t e_t(z_q) w(|q| - t): the Shapley-weighted sum over subsets of q
+    weights = _shapley_weights(depth)
+    size = ones.sum(axis=1)
+    weight_index = size[:, None] - np.arange(depth + 1)
+    w = np.where(weight_index >= 0, weights[np.clip(weight_index, 0, depth - 1)], 0.0)
+    subset_sum = (e * w).sum(axis=-1)                                             # (L, P)
+    zero_product = np.prod(np.where(ones, 1.0, zeros[:, None, :]), axis=-1)       # prod of z outside q
+
+    # Slot j sees O \ {j} among the ones and (zeros \ {j}) outside them
+    bits = 1 << np.arange(depth)
+    without_j = patterns[:, None] & ~bits                                         # (P, D)
+    with_j = patterns[:, None] | bits
+    one_fraction = ones.astype(np.float64)
+    return (values[:, None, None] * (one_fraction - zeros[:, None, :])
+            * zero_product[:, with_j] * subset_sum[:, without_j])
+
+
+class TreeExplainer:
+    """Path tables for an XGBoost booster; shap_values() returns per-class feature contributions"""
+
+    def __init__(self, booster: Any, feature_names: Sequence[str], classes: Sequence[str]):
+        model = json.loads(booster.save_raw('json'))
+        learner = model['learner']
+        trees = learner['gradient_booster']['model']['trees']
+        tree_info = learner['gradient_booster']['model']['tree_info']
+        self.feature_names = list(feature_names)
+        self.classes = [str(c) for c in classes]
+        n_classes, n_features = len(self.classes), len(self.feature_names)
+        base_score = np.atleast_1d(np.array(json.loads(learner['learner_model_param']['base_score']), dtype=np.float64))
+        self.expected_value = np.broadcast_to(base_score, (n_classes,)).copy()
+
+        leaves = []
+        for tree, target in zip(trees, tree_info):
+            left, right = tree['left_children'], tree['right_children']
+            feature, threshold = tree['split_indices'], tree['split_conditions']
+            default_left, cover = tree['default_left'], tree['sum_hessian']
+            stack = [(0, [])]
+            while stack:
+                node, path = stack.pop()
+                if left[node] == -1:
+                    leaves.append((target, threshold[node], path))
+                    self.expected_value[target] += threshold[node] * cover[node] / cover[0]
+                    continue
+                for child, goes_left in ((left[node], True), (right[node], False)):
+                    step = (feature[node], threshold[node], goes_left, bool(default_left[node]) == goes_left,
+                            cover[child] / cover[node])
+                    stack.append((child, path + [step]))
+
+        # Flat tables: conditions grouped by slot, slots grouped by leaf
+        cond_feature, cond_threshold, cond_left, cond_missing, slot_starts = [], [], [], [], []
+        slot_zero, slot_position, slot_target = [], [], []
+        leaf_value, leaf_depth = [], []
+        for target, value, path in leaves:
+            slots = {}
+            for f, thr, goes_left, missing, ratio in path:
+                slots.setdefault(f, []).append((thr, goes_left, missing, ratio))
+            for position, (f, steps) in enumerate(slots.items()):
+                slot_starts.append(len(cond_feature))
+                for thr, goes_left, missing, _ in steps:
+                    cond_feature.append(f)
+                    cond_threshold.append(thr)
+                    cond_left.append(goes_left)
+                    cond_missing.append(missing)
+                slot_zero.append(prod(ratio for *_, ratio in steps))
+                slot_position.append(position)
+                slot_target.append(target * n_features + f)
+            leaf_value.append(value)
+            leaf_depth.append(len(slots))
+
+        self.cond_feature = np.array(cond_feature, dtype=np.intp)
+        self.cond_threshold = np.array(cond_threshold, dtype=np.float32)
+        self.cond_left = np.array(cond_left, dtype=bool)
+        self.cond_missing = np.array(cond_missing, dtype=bool)
+        self.slot_ends = np.r_[np.array(slot_starts[1:], dtype=np.intp), len(cond_feature)]
+        self.slot_position = np.array(slot_position, dtype=np.int64)
+        leaf_depth = np.array(leaf_depth, dtype=np.int64)
+        slot_zero = np.array(slot_zero, dtype=np.float64)
+        leaf_value = np.array(leaf_value, dtype=np.float64)
+
+        # Leaves without splits (single-node trees) carry no slots and only shift the expected value
+        has_slots = leaf_depth > 0
+        depths = leaf_depth[has_slots]
+        self.leaf_ends = np.cumsum(depths)
+        self.slot_leaf = np.repeat(np.arange(len(depths)), depths)
+
+        # Pattern tables, one contiguous block of 2^D * D values per leaf
+        block = (1 << depths) * depths
+        self.table_offsets = np.r_[0, np.cumsum(block)[:-1]]
+        self.table = np.empty(int(block.sum()), dtype=np.float32)
+        zeros_by_leaf = np.split(slot_zero, np.cumsum(depths)[:-1])
+        values = leaf_value[has_slots]
+        for depth in np.unique(depths):
+            group = np.flatnonzero(depths == depth)
+            tables = _pattern_tables(values[group], np.array([zeros_by_leaf[i] for i in group]))
+            index = self.table_offsets[group][:, None] + np.arange((1 << depth) * depth)
+            self.table[index] = tables.reshape(len(group), -1)
+
+        # Slots reordered so each (class, feature) output is one contiguous run for reduceat
+        slot_target = np.array(slot_target, dtype=np.int64)
+        order = np.argsort(slot_target, kind='stable')
+        sorted_targets = slot_target[order]
+        target_starts = np.flatnonzero(np.r_[True, sorted_targets[1:] != sorted_targets[:-1]])
+        self.target_ends = np.r_[target_starts[1:], len(sorted_targets)]
+        self.target_ids = sorted_targets[target_starts]
+        self.target_leaf = self.slot_leaf[order]
+        self.target_depth = depths[self.target_leaf]
+        self.target_base = self.table_offsets[self.target_leaf] + self.slot_position[order]
+        self.n_targets = n_classes * n_features
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def shap_values(self, X: np.ndarray, chunk_rows: int = 32) -> np.ndarray:
+        """(n, classes, features) contributions in margin (log-odds) space for model-ready rows"""
+        X = np.asarray(X, dtype=np.float32)
+        result = np.zeros((len(X), self.n_targets))
+        for start in range(0, len(X), chunk_rows):
+            # Conditions, slots and leaves run along axis 0; rows of the batch along axis 1
+            columns = X[start:start + chunk_rows].T
+            x = columns[self.cond_feature]
+            fails = (x < self.cond_threshold[:, None]) != self.cond_left[:, None]
+            missing = np.isnan(x)
+            if missing.any():
+                np.copyto(fails, ~self.cond_missing[:, None], where=missing)
+            agrees = _segment_sums(fails, self.slot_ends, np.int32) == 0
+            pattern = _segment_sums(agrees.astype(np.int64) << self.slot_position[:, None], self.leaf_ends, np.int64)
+            index = self.target_base[:, None] + pattern[self.target_leaf] * self.target_depth[:, None]
+            contributions = _segment_sums(self.table[index], self.target_ends, np.float64)
+            result[start:start + columns.shape[1], self.target_ids] = contributions.T
+        return result.reshape(len(X), len(self.classes), len(self.feature_names))
+
+
+def explanation(explainer: TreeExplainer, features: np.ndarray, probabilities: np.ndarray,
+                contributions: np.ndarray, top: int = 5) -> Dict[str, Any]:
+    """JSON-ready explanation of one row: contributions per class, top drivers of the predicted class"""
+    best = int(probabilities.argmax())
+    drivers = np.argsort(-np.abs(contributions[best]), kind='stable')[:top]
+    return {
+        "prediction": explainer.classes[best],
+        "probabilities": dict(zip(explainer.classes, probabilities.tolist())),
+        "base_values": dict(zip(explainer.classes, explainer.expected_value.tolist())),
+        "contributions": {
+            name: dict(zip(explainer.feature_names, contributions[i].tolist()))
+            for i, name in enumerate(explainer.classes)
+        },
+        "top_features": [
+            {"feature": explainer.feature_names[j], "value": float(features[j]), "contribution": float(contributions[best, j])}
+            for j in drivers
+        ]
+    }
@@ -0,0 +1,139 @@
+"""
+Candidate Triage Queue
+Ranks CANDIDATE KOIs for review by model ambiguity, promise and habitability
+
+All candidates are encoded and scored in one batched predict_proba pass. Each criterion keeps
+a bounded top-k heap (heapq.nlargest) of (score, tie-break, row) tuples, so pages are slices
+of a precomputed ranking. Scores are stored per model version under the cache directory,
+keyed by the hash of each encoded feature row: when the dataset changes only new or edited
+candidates are re-scored (earlier snapshots' scores are kept alongside, up to a bound), and a
+new model version starts a fresh store. Habitability comes from
+the raw catalog columns: candidates missing a habitability input have no score and are left
+out of the habitability ranking instead of taking the model's Earth-like defaults.
+"""
+
+import heapq
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import FEATURE_ENCODER, feature_hash
+from planet_rules import classify_catalog
+
+DEFAULT_DEPTH = 500
+# Scores of rows from earlier snapshots kept next to the current ones (newest first)
+MAX_PREVIOUS_SCORES = 20000
+
+# Criterion -> (description, ranked column, tie-break column); larger values rank first
+CRITERIA = {
+    'entropy': ("most uncertain class distribution first", 'entropy', 'confirmed'),
+    'margin': ("smallest gap between the top two classes first", 'negative_margin', 'entropy'),
+    'confirmed': ("highest CONFIRMED probability first", 'confirmed', 'habitability_score'),
+    'habitability': ("highest habitability score first", 'habitability_score', 'confirmed'),
+}
+
+
+def _score_store(path: str) -> Dict[str, np.ndarray]:
+    try:
+        with np.load(path, allow_pickle=False) as stored:
+            return {'hashes': stored['hashes'], 'probabilities': stored['probabilities']}
+    except (OSError, ValueError, KeyError):
+        return {'hashes': np.empty(0, dtype='<U40'), 'probabilities': np.empty((0, 0), dtype=np.float32)}
+
+
+class TriageQueue:
+    """Per-criterion rankings of CANDIDATE rows with paginated access"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], classes: Sequence[str], version: str,
+                 depth: int = DEFAULT_DEPTH, rescored: int = 0):
+        self.columns = columns
+        self.classes = [str(c) for c in classes]
+        self.version = version
+        self.rescored = rescored
+        self.rankings = {}
+        for criterion, (_, key, tie_break) in CRITERIA.items():
+            # Rows without a score (e.g. unmeasured habitability inputs) are not ranked
+            rows = np.flatnonzero(~np.isnan(columns[key])).tolist()
+            primary = columns[key].tolist()
+            secondary = np.nan_to_num(columns[tie_break], nan=-np.inf).tolist()
+            top = heapq.nlargest(depth, ((primary[i], secondary[i], -i) for i in rows))
+            self.rankings[criterion] = np.array([-i for *_, i in top], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.columns['kepoi_name'])
+
+    @classmethod
+    def load_or_build(cls, df: pd.DataFrame, model: Any, scaler: Any, classes: Sequence[str],
+                      cache_dir: str, model_version: str, dataset_version: str,
+                      depth: int = DEFAULT_DEPTH) -> 'TriageQueue':
+        """Score the catalog's CANDIDATE rows, reusing stored probabilities of unchanged rows"""
+        candidates = df[df['koi_disposition'] == 'CANDIDATE']
+        features = FEATURE_ENCODER.encode_columns(candidates)
+        hashes = np.array([feature_hash(row) for row in features], dtype='<U40')
+
+        path = os.path.join(cache_dir, 'triage', f'{model_version}.npz')
+        stored = _score_store(path)
+        probabilities = np.empty((len(features), len(classes)), dtype=np.float32)
+        known = dict(zip(stored['hashes'].tolist(), range(len(stored['hashes']))))
+        position = np.array([known.get(h, -1) for h in hashes.tolist()], dtype=np.int64)
+        reused = position >= 0
+        if reused.any():
+            probabilities[reused] = stored['probabilities'][position[reused]]
+        missing = np.flatnonzero(~reused)
+        if len(missing):
+            probabilities[missing] = model.predict_proba(scaler.transform(features[missing]))
+            # Keep earlier snapshots' scores too, so a server still on the previous snapshot
+            # (or a rollback) does not have to re-score everything
+            previous = np.flatnonzero(~np.isin(stored['hashes'], hashes))[:MAX_PREVIOUS_SCORES]
+            previous_probabilities = stored['probabilities'][previous].reshape(-1, len(classes))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp.npz'
+            np.savez_compressed(tmp_path, hashes=np.concatenate([hashes, stored['hashes'][previous]]),
+                                probabilities=np.concatenate([probabilities, previous_probabilities]))
+            os.replace(tmp_path, path)
+
+        class_names = [str(c) for c in classes]
+        # Rules see the raw columns; `features` has NaN replaced by the model defaults
+        rules = classify_catalog(candidates)
+        clipped = np.clip(probabilities.astype(np.float64), 1e-12, 1.0)
+        ordered = np.sort(probabilities, axis=1)
+        columns = {
+            'kepoi_name': candidates['kepoi_name'].to_numpy(dtype=str),
+            'kepler_name': candidates['kepler_name'].fillna('').to_numpy(dtype=str),
+            'kepid': candidates['kepid'].to_numpy(dtype=np.int64),
+            'probabilities': probabilities,
+            'entropy': -(clipped * np.log(clipped)).sum(axis=1) / np.log(len(class_names)),
+            'negative_margin': -(ordered[:, -1] - ordered[:, -2]).astype(np.float64),
+            'confirmed': probabilities[:, class_names.index('CONFIRMED')].astype(np.float64),
+            'habitability_score': rules['habitability_score'].astype(np.float64),
+            'planet_type': rules['planet_type'].astype(str),
+        }
+        return cls(columns, class_names, f"{dataset_version}-{model_version}", depth, rescored=len(missing))
+
+    def page(self, criterion: str, page: int = 1, page_size: int = 50) -> List[Dict[str, Any]]:
+        """Records of one page (1-based) of a criterion's ranking"""
+        start = (page - 1) * page_size
+        rows = self.rankings[criterion][start:start + page_size]
+        c = self.columns
+        return [
+            {
+                "rank": start + i + 1,
+                "kepoi_name": str(c['kepoi_name'][row]),
+                "kepler_name": str(c['kepler_name'][row]) or None,
+                "kepid": int(c['kepid'][row]),
+                "prediction": self.classes[int(c['probabilities'][row].argmax())],
+                "probabilities": dict(zip(self.classes, c['probabilities'][row].tolist())),
+                "entropy": float(c['entropy'][row]),
+                "margin": float(-c['negative_margin'][row]),
+                "habitability_score": None if np.isnan(c['habitability_score'][row]) else float(c['habitability_score'][row]),
+                "planet_type": str(c['planet_type'][row])
+            }
+            for i, row in enumerate(rows.tolist())
+        ]
+
+    def ranked(self, criterion: str) -> Optional[int]:
+        """Number of ranked rows for a criterion (None when unknown)"""
+        ranking = self.rankings.get(criterion)
+        return None if ranking is None else len(ranking)
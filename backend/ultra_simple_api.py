@@ -5,60 +5,43 @@ Pure FastAPI without complex type annotations
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import joblib
+from fastapi.responses import JSONResponse, Response
 import json
 import random
 import os
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
-# Global variable for training data
+from compact_catalog import catalog_footprint
+from feature_schema import FEATURE_ENCODER
+from planet_rules import classify_planet
+from resources import RESOURCES
+
+# Training data (compact: only the columns the API reads, downcast), shared through RESOURCES
 training_data = None
 
 def load_training_data():
-    """Load training data for similarity matching"""
+    """Load training data for similarity matching (once per process, concurrent callers share the load)"""
     global training_data
-    if training_data is None:
-        try:
-            # Try multiple possible data file paths
-            possible_paths = [
-                os.path.join(os.path.dirname(__file__), '..', 'data', 'cumulative_2025.09.16_22.42.55.csv'),
-                os.path.join(os.path.dirname(__file__), 'data', 'cumulative_2025.09.16_22.42.55.csv'),
-                '/app/data/cumulative_2025.09.16_22.42.55.csv',
-                # Try from current directory upwards
-                os.path.join(os.getcwd(), 'data', 'cumulative_2025.09.16_22.42.55.csv'),
-                os.path.join(os.getcwd(), '..', 'data', 'cumulative_2025.09.16_22.42.55.csv')
-            ]
-
-            print("Attempting to load training data...")
-            for path in possible_paths:
-                print(f"   Checking path: {path}")
-                if os.path.exists(path):
-                    training_data = pd.read_csv(path)
-                    print(f"Training data loaded successfully: {len(training_data)} rows")
-                    print(f"   Columns: {len(training_data.columns)}")
-                    print(f"   Contains kepler_name column: {'kepler_name' in training_data.columns}")
-                    break
-
-            if training_data is None or training_data.empty:
-                print("Warning: Could not load training data, will use generic name generation")
-                training_data = pd.DataFrame()
-            else:
-                # Ensure required columns exist
-                required_cols = ['kepler_name', 'kepoi_name', 'koi_period', 'koi_prad', 'koi_teq']
-                missing_cols = [col for col in required_cols if col not in training_data.columns]
-                if missing_cols:
-                    print(f"Warning: Training data missing required columns: {missing_cols}")
-
-        except Exception as e:
-            print(f"Error loading training data: {e}")
-            import traceback
-            traceback.print_exc()
-            training_data = pd.DataFrame()
-
+    try:
+        training_data = RESOURCES.get('dataset')
+    except Exception as e:
+        print(f"Error loading training data: {e}")
+        import traceback
+        traceback.print_exc()
+        training_data = pd.DataFrame()
     return training_data
 
+def load_scene_buffers():
+    """Visualization table and scene buffers, built once from the training data"""
+    load_training_data()
+    return RESOURCES.get('scene') if not training_data.empty else (None, None)
+
+def load_similarity_index():
+    """Named-planet similarity index ('int8' quantized with exact re-rank, or SIMILARITY_STORAGE=float32)"""
+    load_training_data()
+    return RESOURCES.get('similarity_index') if not training_data.empty else None
+
 def find_similar_planet(input_features, input_data):
     """Find the most similar planet in training data based on input features"""
     if training_data is None or training_data.empty or len(training_data) == 0:
@@ -66,62 +49,22 @@ def find_similar_planet(input_features, input_data):
         return None, 0.0
 
     try:
-        # Prepare training data features (same as prediction features)
-        feature_columns = [
-            'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_teq',
-            'koi_insol', 'koi_model_snr', 'koi_steff', 'koi_slogg', 'koi_srad',
-            'koi_smass', 'koi_kepmag', 'koi_fpflag_nt', 'koi_fpflag_ss',
-            'koi_fpflag_co', 'koi_fpflag_ec', 'ra', 'dec', 'koi_score'
-        ]
-
-        # Ensure all required columns exist
-        available_columns = [col for col in feature_columns if col in training_data.columns]
-        if len(available_columns) < 10:  # Need at least 10 features
-            print(f"Warning: Training data missing sufficient feature columns, found only {len(available_columns)}")
-            return None, 0.0
-
-        # Extract features for planets with valid Kepler names only
-        valid_planets = training_data[training_data['kepler_name'].notna() & (training_data['kepler_name'] != '')]
-
-        if len(valid_planets) == 0:
+        index = load_similarity_index()
+        if index is None or len(index) == 0:
             print("Warning: No valid Kepler names found in training data")
             return None, 0.0
 
-        print(f"Found {len(valid_planets)} planets with valid Kepler names")
+        # Prepare input features - input_features is the encoded model row
+        input_vector = input_features[0, [FEATURE_ENCODER.index[col] for col in index.columns]]
 
-        # Extract features
-        train_features = valid_planets[available_columns].fillna(0).values
-
-        # Prepare input features - input_features is a list, input_data is a dict
-        input_vector = []
-        for i, col in enumerate(available_columns):
-            if i < len(input_features):
-                input_vector.append(float(input_features[i]))
-            elif col in input_data:
-                input_vector.append(float(input_data[col]))
-            else:
-                input_vector.append(0.0)
-        
-        input_vector = np.array(input_vector).reshape(1, -1)
-
-        # Normalize features for better similarity matching
-        from sklearn.preprocessing import StandardScaler
-        scaler_sim = StandardScaler()
-        train_features_scaled = scaler_sim.fit_transform(train_features)
-        input_vector_scaled = scaler_sim.transform(input_vector)
-
-        # Calculate cosine similarity
-        similarities = cosine_similarity(input_vector_scaled, train_features_scaled)[0]
-
-        # Find most similar planet (lower threshold for better matching)
-        max_sim_idx = np.argmax(similarities)
-        max_similarity = similarities[max_sim_idx]
+        # Cosine similarity over standardized features (coarse int8 pass + exact re-rank)
+        row, max_similarity = index.nearest(input_vector)
 
         print(f"Max similarity score: {max_similarity:.3f} (threshold: 0.3)")
 
         # Lower threshold to 0.3 for better matching
         if max_similarity > 0.3:  # Much lower similarity threshold
-            similar_planet = valid_planets.iloc[max_sim_idx]
+            similar_planet = training_data.iloc[row]
             planet_name = similar_planet['kepler_name']
             print(f"Found similar planet: {planet_name} (similarity: {max_similarity:.3f})")
             return similar_planet, max_similarity
@@ -152,44 +95,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load models
+# Load models (shared with any other module in the process that uses RESOURCES)
 try:
-    import os
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    possible_ml_dirs = [
-        os.path.join(current_dir, 'ml'),       
-        os.path.join('/app', 'ml'),             
-        os.path.join(current_dir, '..', 'ml'),  
-    ]
-
-    ml_dir = None
-    for test_dir in possible_ml_dirs:
-        model_path = os.path.join(test_dir, 'exoplanet_model_best.joblib')
-        if os.path.exists(model_path):
-            ml_dir = test_dir
-            print(f"Found ML models in: {ml_dir}")
-            break
-
-    if ml_dir is None:
-        raise FileNotFoundError("Could not find ML models directory. Tried: " + str(possible_ml_dirs))
-
-    ml_model = joblib.load(os.path.join(ml_dir, 'exoplanet_model_best.joblib'))
-    scaler = joblib.load(os.path.join(ml_dir, 'scaler.joblib'))
-    label_encoder = joblib.load(os.path.join(ml_dir, 'label_encoder.joblib'))
-    
-    # Fix XGBoost compatibility issue
-    try:
-        if hasattr(ml_model, 'use_label_encoder'):
-            ml_model.use_label_encoder = False
-        # Additional XGBoost compatibility fixes
-        if hasattr(ml_model, '_le'):
-            ml_model._le = None
-        if hasattr(ml_model, 'le_'):
-            ml_model.le_ = None
-        print("XGBoost compatibility fixes applied")
-    except Exception as e:
-        print(f"Warning: Could not apply XGBoost compatibility fixes: {e}")
-    
+    ml_model, scaler, label_encoder, ml_dir = RESOURCES.get('models')
     models_loaded = True
     print("ML models loaded successfully from:", ml_dir)
 except Exception as e:
@@ -204,28 +112,7 @@ def generate_planet_name(data: dict, prediction: str) -> str:
     load_training_data()
     
     # First try to find similar planet in training data
-    features = [
-        data.get('koi_period', 365.25),
-        data.get('koi_duration', 6.0),
-        data.get('koi_depth', 500.0),
-        data.get('koi_prad', 1.0),
-        data.get('koi_teq', 288.0),
-        data.get('koi_insol', 1.0),
-        data.get('koi_model_snr', 25.0),
-        data.get('koi_steff', 5778.0),
-        data.get('koi_slogg', 4.44),
-        data.get('koi_srad', 1.0),
-        data.get('koi_smass', 1.0),
-        data.get('koi_kepmag', 12.0),
-        data.get('koi_fpflag_nt', 0),
-        data.get('koi_fpflag_ss', 0),
-        data.get('koi_fpflag_co', 0),
-        data.get('koi_fpflag_ec', 0),
-        data.get('ra', 290.0),
-        data.get('dec', 45.0),
-        1 if 0.25 <= data.get('koi_insol', 1.0) <= 1.5 else 0,
-        data.get('koi_score', 0.5)
-    ]
+    features = FEATURE_ENCODER.encode(data)
     
     # Use similarity matching to find real planet name from training data
     similar_planet, similarity_score = find_similar_planet(features, data)
@@ -239,18 +126,7 @@ def generate_planet_name(data: dict, prediction: str) -> str:
     
     # If no similar planet found in training data, return descriptive name
     # This indicates the prediction is based on ML model, not exact match
-    radius = data.get('koi_prad', 1.0)
-    
-    if radius < 0.8:
-        planet_type = "Sub-Earth"
-    elif radius <= 1.25:
-        planet_type = "Earth-like"
-    elif radius <= 2.0:
-        planet_type = "Super-Earth"
-    elif radius <= 4.0:
-        planet_type = "Mini-Neptune"
-    else:
-        planet_type = "Giant"
+    planet_type = classify_planet(data)['planet_type']
     
     # Return AI prediction name to indicate this is ML-based, not exact match
     return f"AI Predicted {planet_type}"
@@ -265,7 +141,8 @@ async def root():
             "stats": "/stats", 
             "predict": "/predict (POST)",
             "demo": "/demo",
-            "exoplanets": "/exoplanets"
+            "exoplanets": "/exoplanets",
+            "scene": "/exoplanets/scene"
         }
     }
 
@@ -276,6 +153,8 @@ async def health():
         "models_loaded": models_loaded,
         "ml_accuracy": "92.16%",
         "system": "operational",
+        "training_data": catalog_footprint(training_data),
+        "resources": RESOURCES.status(),
         "model_details": {
             "best_model": type(ml_model).__name__ if ml_model else "Not loaded",
             "scaler": type(scaler).__name__ if scaler else "Not loaded",
@@ -370,58 +249,21 @@ async def predict(data: dict):
         load_training_data()  # Load training data to global variable
         print(f"Training data loaded: {len(training_data)} rows")
         # Prepare ML input
-        features = [
-            data.get('koi_period', 365.25),
-            data.get('koi_duration', 6.0),
-            data.get('koi_depth', 500.0),
-            data.get('koi_prad', 1.0),
-            data.get('koi_teq', 288.0),
-            data.get('koi_insol', 1.0),
-            data.get('koi_model_snr', 25.0),
-            data.get('koi_steff', 5778.0),
-            data.get('koi_slogg', 4.44),
-            data.get('koi_srad', 1.0),
-            data.get('koi_smass', 1.0),
-            data.get('koi_kepmag', 12.0),
-            data.get('koi_fpflag_nt', 0),
-            data.get('koi_fpflag_ss', 0),
-            data.get('koi_fpflag_co', 0),
-            data.get('koi_fpflag_ec', 0),
-            data.get('ra', 290.0),
-            data.get('dec', 45.0),
-            1 if 0.25 <= data.get('koi_insol', 1.0) <= 1.5 else 0,
-            data.get('koi_score', 0.5)
-        ]
+        features = FEATURE_ENCODER.encode(data)
         
         # ML Prediction
-        scaled = scaler.transform([features])
+        scaled = scaler.transform(features)
         pred = ml_model.predict(scaled)[0]
         probs = ml_model.predict_proba(scaled)[0]
         
         pred_str = label_encoder.inverse_transform([pred])[0]
         prob_dict = {label_encoder.classes_[i]: float(probs[i]) for i in range(len(probs))}
         
-        # Calculate habitability
-        hab_score = 0
-        if 273 <= data.get('koi_teq', 288) <= 373: hab_score += 40
-        if 0.8 <= data.get('koi_prad', 1.0) <= 1.5: hab_score += 30  
-        if 0.25 <= data.get('koi_insol', 1.0) <= 1.5: hab_score += 30
-        
-        # Planet type
-        radius = data.get('koi_prad', 1.0)
-        if radius < 0.8: planet_type = "Sub-Earth"
-        elif radius <= 1.25: planet_type = "Earth-like"
-        elif radius <= 2.0: planet_type = "Super-Earth"
-        elif radius <= 4.0: planet_type = "Mini-Neptune"
-        else: planet_type = "Giant"
-        
-        # Star type
-        temp = data.get('koi_steff', 5778)
-        if temp < 3700: star_type = "M-dwarf"
-        elif temp < 5200: star_type = "K-dwarf"
-        elif temp < 6000: star_type = "G-dwarf"
-        elif temp < 7500: star_type = "F-dwarf"
-        else: star_type = "A-dwarf"
+        # Habitability, planet type and star type
+        rules = classify_planet(data)
+        hab_score = rules['habitability_score']
+        planet_type = rules['planet_type']
+        star_type = rules['star_type']
         
         # Try to find similar planet first, generate generic name if not found
         similar_planet, similarity_score = find_similar_planet(features, data)
@@ -481,32 +323,10 @@ async def predict(data: dict):
             # Generate fallback prediction based on parameters
             radius = data.get('koi_prad', 1.0)
             temp = data.get('koi_teq', 288)
-            period = data.get('koi_period', 365.25)
-            stellar_temp = data.get('koi_steff', 5778)
             
             # Enhanced rule-based prediction using ML training data similarity
             # Prepare features for similarity matching
-            features = [
-                data.get('koi_period', 365.25),
-                data.get('koi_duration', 6.0),
-                data.get('koi_depth', 500.0),
-                data.get('koi_prad', 1.0),
-                data.get('koi_teq', 288.0),
-                data.get('koi_insol', 1.0),
-                data.get('koi_model_snr', 25.0),
-                data.get('koi_steff', 5778.0),
-                data.get('koi_slogg', 4.4),
-                data.get('koi_srad', 1.0),
-                data.get('koi_smass', 1.0),
-                data.get('koi_kepmag', 12.0),
-                data.get('koi_fpflag_nt', 0),
-                data.get('koi_fpflag_ss', 0),
-                data.get('koi_fpflag_co', 0),
-                data.get('koi_fpflag_ec', 0),
-                data.get('ra', 0.0),
-                data.get('dec', 0.0),
-                data.get('koi_score', 0.5)
-            ]
+            features = FEATURE_ENCODER.encode(data)
             
             # Try to find similar planet in training data first
             similar_planet, similarity_score = find_similar_planet(features, data)
@@ -539,18 +359,10 @@ async def predict(data: dict):
                     planet_type = "Gas Giant"
                     confidence = 0.80  # Standard confidence for ML predictions
             
-            # Calculate habitability
-            hab_score = 0
-            if 273 <= temp <= 373: hab_score += 40
-            if 0.8 <= radius <= 1.5: hab_score += 30  
-            if 0.25 <= data.get('koi_insol', 1.0) <= 1.5: hab_score += 30
-            
-            # Star type
-            if stellar_temp < 3700: star_type = "M-dwarf"
-            elif stellar_temp < 5200: star_type = "K-dwarf"
-            elif stellar_temp < 6000: star_type = "G-dwarf"
-            elif stellar_temp < 7500: star_type = "F-dwarf"
-            else: star_type = "A-dwarf"
+            # Habitability and star type
+            rules = classify_planet(data)
+            hab_score = rules['habitability_score']
+            star_type = rules['star_type']
             
             # Enhanced fallback with similarity matching
             try:
@@ -558,28 +370,7 @@ async def predict(data: dict):
                 load_training_data()
                 
                 # Prepare features for similarity matching
-                features = [
-                    data.get('koi_period', 365.25),
-                    data.get('koi_duration', 6.0),
-                    data.get('koi_depth', 500.0),
-                    data.get('koi_prad', 1.0),
-                    data.get('koi_teq', 288.0),
-                    data.get('koi_insol', 1.0),
-                    data.get('koi_model_snr', 25.0),
-                    data.get('koi_steff', 5778.0),
-                    data.get('koi_slogg', 4.44),
-                    data.get('koi_srad', 1.0),
-                    data.get('koi_smass', 1.0),
-                    data.get('koi_kepmag', 12.0),
-                    data.get('koi_fpflag_nt', 0),
-                    data.get('koi_fpflag_ss', 0),
-                    data.get('koi_fpflag_co', 0),
-                    data.get('koi_fpflag_ec', 0),
-                    data.get('ra', 290.0),
-                    data.get('dec', 45.0),
-                    1 if 0.25 <= data.get('koi_insol', 1.0) <= 1.5 else 0,
-                    data.get('koi_score', 0.5)
-                ]
+                features = FEATURE_ENCODER.encode(data)
                 
                 # Try similarity matching even in fallback mode
                 similar_planet, similarity_score = find_similar_planet(features, data)
@@ -683,6 +474,20 @@ async def exoplanets():
         "total": 3
     }
 
+@app.get("/exoplanets/scene")
+async def exoplanet_scene(limit: int = 100000, disposition: str = None, min_habitability: float = None):
+    """Packed Float32/Uint8 positions, radii and colours for the 3D scene (layout in scene_buffers)"""
+    table, buffers = load_scene_buffers()
+    if buffers is None:
+        return JSONResponse(status_code=503, content={"error": "Training data not available", "status": "data_unavailable"})
+
+    rows = np.flatnonzero(table.mask(disposition=disposition, min_habitability=min_habitability))[:limit]
+    return Response(
+        content=buffers.pack(rows),
+        media_type="application/octet-stream",
+        headers={"X-Planet-Count": str(len(rows))}
+    )
+
 @app.get("/demo")
 async def demo():
     earth_data = {
@@ -0,0 +1,69 @@
+"""
+What-If Sweeps
+Partial-dependence style response surfaces over one or two input features of a base planet
+
+The whole grid is written into a single pre-filled encoder buffer (one row per grid point),
+derived columns are refreshed once, and the surface is scored with one predict_proba call.
+"""
+
+from typing import Any, Dict, NamedTuple, Sequence
+
+import numpy as np
+
+from feature_schema import FEATURE_ENCODER, FeatureEncoder
+
+MAX_AXIS_STEPS = 200
+MAX_GRID_POINTS = 10000
+
+
+class SweepAxis(NamedTuple):
+    feature: str
+    start: float
+    stop: float
+    steps: int
+
+    @property
+    def values(self) -> np.ndarray:
+        return np.linspace(self.start, self.stop, self.steps)
+
+
+def validate_axes(axes: Sequence[SweepAxis], encoder: FeatureEncoder = FEATURE_ENCODER):
+    """Raise ValueError for sweeps the endpoint should reject"""
+    if not 1 <= len(axes) <= 2:
+        raise ValueError("A sweep takes one or two axes")
+    if len({axis.feature for axis in axes}) != len(axes):
+        raise ValueError("Sweep axes must use different features")
+    for axis in axes:
+        if axis.feature not in encoder.input_names:
+            raise ValueError(f"Unknown input feature '{axis.feature}'")
+        if not 2 <= axis.steps <= MAX_AXIS_STEPS:
+            raise ValueError(f"steps must be within [2, {MAX_AXIS_STEPS}]")
+    if np.prod([axis.steps for axis in axes]) > MAX_GRID_POINTS:
+        raise ValueError(f"A sweep may have at most {MAX_GRID_POINTS} grid points")
+
+
+def build_grid(base: np.ndarray, axes: Sequence[SweepAxis], encoder: FeatureEncoder = FEATURE_ENCODER) -> np.ndarray:
+    """(grid points, n_features) buffer: the base row everywhere, swept columns varying (C order over axes)"""
+    shape = tuple(axis.steps for axis in axes)
+    grid = np.empty((int(np.prod(shape)), encoder.n_features), dtype=encoder.dtype)
+    grid[:] = base.reshape(1, -1)
+    for i, axis in enumerate(axes):
+        view = [1] * len(axes)
+        view[i] = axis.steps
+        grid[:, encoder.index[axis.feature]] = np.broadcast_to(axis.values.reshape(view), shape).ravel()
+    return encoder.fill_derived(grid)
+
+
+def sweep(model: Any, scaler: Any, classes: Sequence[str], base: np.ndarray, axes: Sequence[SweepAxis],
+          encoder: FeatureEncoder = FEATURE_ENCODER) -> Dict[str, Any]:
+    """Class probabilities and predicted class over the grid, nested one list level per axis"""
+    shape = tuple(axis.steps for axis in axes)
+    grid = build_grid(base, axes, encoder)
+    probabilities = model.predict_proba(scaler.transform(grid)).reshape(shape + (len(classes),))
+    labels = np.array([str(c) for c in classes], dtype=object)
+
+    return {
+        "axes": [{"feature": axis.feature, "values": axis.values.tolist()} for axis in axes],
+        "probabilities": {str(name): probabilities[..., i].tolist() for i, name in enumerate(classes)},
+        "prediction": labels[probabilities.argmax(axis=-1)].tolist()
+    }
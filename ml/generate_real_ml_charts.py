@@ -14,9 +14,13 @@ from sklearn.ensemble import RandomForestClassifier
 import xgboost as xgb
 import joblib
 import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from feature_schema import INPUT_FEATURES
+
 def load_and_preprocess_data():
     """Load and preprocess real NASA data"""
     print("📊 Loading real NASA Kepler data...")
@@ -26,12 +30,7 @@ def load_and_preprocess_data():
     print(f"✅ Loaded {len(df)} samples with {len(df.columns)} columns")
     
     # Select features
-    feature_columns = [
-        'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_teq',
-        'koi_insol', 'koi_model_snr', 'koi_steff', 'koi_slogg', 'koi_srad',
-        'koi_smass', 'koi_kepmag', 'koi_fpflag_nt', 'koi_fpflag_ss',
-        'koi_fpflag_co', 'koi_fpflag_ec', 'ra', 'dec', 'koi_score'
-    ]
+    feature_columns = list(INPUT_FEATURES)
     
     # Filter valid data
     valid_data = df[df['koi_disposition'].isin(['CONFIRMED', 'CANDIDATE', 'FALSE POSITIVE'])]
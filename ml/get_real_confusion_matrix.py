@@ -5,15 +5,20 @@ Get real confusion matrix from trained model
 
 import pandas as pd
 import numpy as np
+import os
+import sys
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import confusion_matrix
 import xgboost as xgb
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from feature_schema import INPUT_FEATURES
+
 def get_real_confusion_matrix():
     # Load data
     df = pd.read_csv('../data/cumulative_2025.09.16_22.42.55.csv')
-    feature_columns = ['koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_teq', 'koi_insol', 'koi_model_snr', 'koi_steff', 'koi_slogg', 'koi_srad', 'koi_smass', 'koi_kepmag', 'koi_fpflag_nt', 'koi_fpflag_ss', 'koi_fpflag_co', 'koi_fpflag_ec', 'ra', 'dec', 'koi_score']
+    feature_columns = list(INPUT_FEATURES)
     valid_data = df[df['koi_disposition'].isin(['CONFIRMED', 'CANDIDATE', 'FALSE POSITIVE'])]
     X = valid_data[feature_columns].fillna(0)
     y = valid_data['koi_disposition']
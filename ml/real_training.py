@@ -15,9 +15,13 @@ from sklearn.metrics import classification_report, confusion_matrix, accuracy_sc
 import xgboost as xgb
 import joblib
 import os
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from feature_schema import INPUT_FEATURES
+
 def load_real_data():
     """Load real NASA Kepler data"""
     print("📊 Loading real NASA Kepler data...")
@@ -42,12 +46,7 @@ def preprocess_data(df):
     print("🔧 Preprocessing data...")
     
     # Select features (based on actual data columns)
-    feature_columns = [
-        'koi_period', 'koi_duration', 'koi_depth', 'koi_prad', 'koi_teq',
-        'koi_insol', 'koi_model_snr', 'koi_steff', 'koi_slogg', 'koi_srad',
-        'koi_smass', 'koi_kepmag', 'koi_fpflag_nt', 'koi_fpflag_ss',
-        'koi_fpflag_co', 'koi_fpflag_ec', 'ra', 'dec', 'koi_score'
-    ]
+    feature_columns = list(INPUT_FEATURES)
     
     # Check which features exist
     available_features = [col for col in feature_columns if col in df.columns]